@@ -6,6 +6,7 @@ Contains functionality that helps visualise and analyse the tracks/chunks.
 """
 
 from .post_processor import PostProcessor
+from .live_post_processor import LivePostProcessor
 from .mapper import Mapper
 from .labelling import Labelling
 from .chunk_visualiser import ChunkVisualiser
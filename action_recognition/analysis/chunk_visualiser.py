@@ -2,7 +2,7 @@ import cv2
 import numpy as np
 from time import sleep
 
-from ..tracker import TrackVisualiser, Track, Person
+from ..tracker import TrackVisualiser, Track
 
 
 class ChunkVisualiser:
@@ -159,10 +159,7 @@ class ChunkVisualiser:
         return frames
 
     def _chunk_to_track(self, chunk, frames):
-        track = Track()
-        for i, p in enumerate(chunk):
-            track.add_person(Person(p), frames[i])
-
+        track = Track.from_np(chunk, frames)
         track.fill_missing_frames()
 
         return track
@@ -174,32 +174,37 @@ class Labelling:
         """
         keypoints = tracks[0][0].keypoints
         chunk_shape = (frames_per_chunk, *keypoints.shape)
-        chunks, frames, labels, track_indicies = self._init_arrays(chunk_shape, frames_per_chunk)
 
+        #  The accepted chunks are collected first, since their number is not
+        # known until they have been labelled, and then copied into the output once.
+        labelled_chunks = []
         for timestamp in timestamps:
             for i, track in enumerate(tracks):
-                track_arrays = self._pseudo_automatic_labelling(
-                    timestamp, track, i, frames_per_chunk, chunk_shape, video)
-                chunks = np.append(chunks, track_arrays[0], axis=0)
-                frames = np.append(frames, track_arrays[1], axis=0)
-                labels = np.append(labels, track_arrays[2], axis=0)
-                track_indicies = np.append(track_indicies, track_arrays[3], axis=0)
+                labelled_chunks.extend(self._pseudo_automatic_labelling(
+                    timestamp, track, i, frames_per_chunk, video))
+
+        chunks, frames, labels, track_indicies = self._init_arrays(
+            len(labelled_chunks), chunk_shape, frames_per_chunk)
+        for i, (chunk, chunk_frames, label, track_index) in enumerate(labelled_chunks):
+            chunks[i] = chunk
+            frames[i] = chunk_frames
+            labels[i] = label
+            track_indicies[i] = track_index
 
         return chunks, frames, labels, track_indicies
 
-    def _init_arrays(self, chunk_shape, frames_per_chunk):
-        chunks = np.zeros((0, *chunk_shape))
-        frames = np.zeros((0, frames_per_chunk), dtype=np.int)
-        labels = np.zeros(0, dtype=object)
-        track_indicies = np.zeros(0, dtype=np.int)
+    def _init_arrays(self, number_of_chunks, chunk_shape, frames_per_chunk):
+        chunks = np.zeros((number_of_chunks, *chunk_shape))
+        frames = np.zeros((number_of_chunks, frames_per_chunk), dtype=np.int)
+        labels = np.zeros(number_of_chunks, dtype=object)
+        track_indicies = np.zeros(number_of_chunks, dtype=np.int)
         return chunks, frames, labels, track_indicies
 
-    def _pseudo_automatic_labelling(self, timestamp, track, track_index, frames_per_chunk,
-                                    chunk_shape, video):
+    def _pseudo_automatic_labelling(self, timestamp, track, track_index, frames_per_chunk, video):
         capture = cv2.VideoCapture(video)
         fps = capture.get(cv2.CAP_PROP_FPS)
 
-        chunks, frames, labels, track_indicies = self._init_arrays(chunk_shape, frames_per_chunk)
+        labelled_chunks = []
 
         start_frame = int(timestamp['start_time'] * fps)
         end_frame = start_frame + frames_per_chunk
@@ -217,11 +222,7 @@ class Labelling:
             ok = input("Labelling as {}, ok? (yes/(n)o/(s)kip forward)".format(timestamp['label']))
             if ok == 'y' or ok == '':
                 chunk, chunk_frames = track.chunk_from_frame(start_frame, frames_per_chunk)
-
-                chunks = np.append(chunks, [chunk], axis=0)
-                frames = np.append(frames, [chunk_frames], axis=0)
-                labels = np.append(labels, [timestamp['label']], axis=0)
-                track_indicies = np.append(track_indicies, [track_index], axis=0)
+                labelled_chunks.append((chunk, chunk_frames, timestamp['label'], track_index))
 
                 start_frame += frames_per_chunk
             elif ok == 's':
@@ -231,7 +232,7 @@ class Labelling:
 
             end_frame = start_frame + frames_per_chunk
 
-        return chunks, frames, labels, track_indicies
+        return labelled_chunks
 
     def _fits_in_timestamp(self, track, start_frame, end_frame):
         track_start = track.frame_assigned[0]
@@ -0,0 +1,119 @@
+import numpy as np
+
+from ..tracker import Track
+
+
+class LivePostProcessor:
+    """Post processes tracks from the tracker incrementally, for live prediction.
+
+    Keeps the post processed end of every track between calls, so that
+    only the people added to a track since the last call are processed.
+    Only the fill steps of PostProcessor._fill_tracks(...) are done: the
+    original keypoints are filled with fill_type='diff', and missing frames
+    are interpolated, where the keypoints at the start of a window are
+    filled from the people before it.
+
+    The tracks are not combined with each other, so the result is not the
+    same as PostProcessor.post_process_tracks() when the tracker has split
+    a person into overlapping or consecutive tracks.  Each of those tracks
+    is processed, and predicted for, on its own.
+
+    Parameters
+    ----------
+    window : int, optional, default 50
+        The number of people at the end of each track that the processed
+        tracks are created from.
+    min_length : int, optional, default 15
+        Tracks with at most this many people are not processed, as in
+        PostProcessor.
+
+    """
+
+    def __init__(self, window=50, min_length=15):
+        self.window = window
+        self.min_length = min_length
+        self._states = {}
+
+    def process_tracks(self, tracks):
+        """Post processes the people added to the tracks since the last call.
+
+        The processed state of tracks that are not passed is dropped.
+
+        Parameters
+        ----------
+        tracks : list of Track
+            The tracks from the tracker, which only have people added to them
+            between calls.
+
+        Returns
+        -------
+        tracks : list of Track
+            The tracks that are long enough to be processed.
+        processed_tracks : list of Track
+            The processed window of each of the returned tracks.
+
+        """
+        states = {}
+        long_tracks = []
+        processed_tracks = []
+        for track in tracks:
+            if len(track) <= self.min_length:
+                continue
+
+            state = self._update_state(track, self._states.get(track))
+            states[track] = state
+
+            long_tracks.append(track)
+            processed_tracks.append(Track.from_np(state.keypoints, state.frames))
+
+        self._states = states
+        return long_tracks, processed_tracks
+
+    def _update_state(self, track, state):
+        start_index = max(0, len(track) - self.window)
+        if state is not None and state.number_processed < start_index:
+            # Too much has been added to continue from the processed people.
+            state = None
+        if state is not None:
+            start_index = state.number_processed
+            if start_index == len(track):
+                return state
+
+        new_people = track.copy(start_index)
+        new_people.reset_keypoints()
+        keypoints, frames = new_people.to_np()
+
+        #  Continue from the last processed person, which the first new person
+        # is filled and interpolated from.
+        if state is not None:
+            keypoints = np.concatenate((state.keypoints[-1:], keypoints))
+            frames = np.concatenate((state.frames[-1:], frames))
+
+        processed = Track.from_np(keypoints, frames)
+        processed.fill_missing_keypoints(fill_type='diff')
+        processed.fill_missing_frames()
+        keypoints, frames = processed.to_np()
+
+        if state is None:
+            state = _TrackState()
+        else:
+            keypoints = np.concatenate((state.keypoints, keypoints[1:]))
+            frames = np.concatenate((state.frames, frames[1:]))
+
+        # Only keep the frames from the first person in the window.
+        window_start = track.frame_assigned[max(0, len(track) - self.window)]
+        window_index = np.searchsorted(frames, window_start, 'left')
+
+        state.keypoints = keypoints[window_index:]
+        state.frames = frames[window_index:]
+        state.number_processed = len(track)
+
+        return state
+
+
+class _TrackState:
+
+    def __init__(self):
+        self.keypoints = None
+        self.frames = None
+        self.number_processed = 0
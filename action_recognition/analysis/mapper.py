@@ -1,4 +1,3 @@
-import kmapper as km
 import sklearn
 from sklearn import ensemble
 import numpy as np
@@ -64,6 +63,8 @@ class Mapper:
         """
         # Initialize
         logging.info("Applying the mapping algorithm.")
+        import kmapper as km
+
         mapper = km.KeplerMapper(verbose=2)
 
         # We create a custom 1-D lens with Isolation Forest
@@ -1,6 +1,6 @@
 import numpy as np
 
-from ..tracker import Person, Track
+from ..tracker import Track
 
 
 class PostProcessor:
@@ -57,13 +57,7 @@ class PostProcessor:
                        for i, (p, f) in enumerate(zip(tracks_np, frames_np))]
 
     def _create_track(self, saved_path, path_frames, path_index):
-        track = Track()
-        for i in range(len(saved_path)):
-            person = Person(saved_path[i])
-            person.track_index = path_index
-            track.add_person(person, path_frames[i])
-
-        return track
+        return Track.from_np(saved_path, path_frames, path_index)
 
     def post_process_tracks(self):
         """Combines, removes short tracks, and fills in missing parts of trakcs.
@@ -85,24 +79,40 @@ class PostProcessor:
             track.fill_missing_frames()
 
     def _combine_tracks(self, tracks):
-        # This looks ugly since there is some concurrent modification going on.
-        i = 0
-        while i < len(tracks):
-            have_removed = False
-            end_track = tracks[i]
-            j = i
-            while j < len(tracks):
-                start_track = tracks[j]
-                if i != j and (end_track.overlaps(start_track) or
-                               self._paths_nearby(end_track, start_track)):
-                    end_track.combine(start_track)
-                    end_track.fill_missing_keypoints()
-                    tracks.remove(start_track)
-                    have_removed = True
-                else:
-                    j += 1
-            if not have_removed:
-                i += 1
+        #  Each track is combined with the tracks after it that it overlaps
+        # with, or is continued by, until there are none left.  Only the
+        # tracks whose frame ranges make either possible are compared.
+        #  This gives the same merges as comparing every pair of tracks, in
+        # the same order: the tracks after i are compared with end_track in
+        # index order, and a pass is repeated for as long as it combines any.
+        # Only end_track changes while it is combined, and its current frame
+        # range is used for every look up, so a track that it grows into the
+        # range of (i.e. a chain of merges) is found later in the same pass,
+        # or in the next one if its index is lower, just as when every pair
+        # is compared.  The frame ranges in the index are only read for the
+        # tracks after i, which have not been combined with anything yet.
+        frame_ranges = _FrameRangeIndex(tracks)
+
+        for i, end_track in enumerate(tracks):
+            if frame_ranges.removed[i]:
+                continue
+
+            have_removed = True
+            while have_removed:
+                have_removed = False
+                j = frame_ranges.next_candidate(end_track, i)
+                while j is not None:
+                    start_track = tracks[j]
+                    if end_track.overlaps(start_track) or \
+                            self._paths_nearby(end_track, start_track):
+                        end_track.combine(start_track)
+                        end_track.fill_missing_keypoints()
+                        frame_ranges.removed[j] = True
+                        have_removed = True
+                    j = frame_ranges.next_candidate(end_track, j)
+
+        tracks[:] = [track for track, removed in zip(tracks, frame_ranges.removed)
+                     if not removed]
 
     def _paths_nearby(self, end_track, start_track):
         return ((end_track[-1].distance(start_track[0]) < 15 and
@@ -134,36 +144,36 @@ class PostProcessor:
         """
         number_of_keypoints = 18
         number_of_coordinates = 3
-        chunks = np.empty((0, target_frames_per_chunk, number_of_keypoints, number_of_coordinates))
-        chunk_frames = np.empty((0, target_frames_per_chunk), dtype=np.int)
-        track_indicies = np.empty((0,), dtype=np.int)
 
-        for i, track in enumerate(self.tracks):
-            chunked, frames = track.divide_into_chunks(frames_per_chunk, overlap)
-            if chunked.shape[0] > 0:
-                chunked, frames = self._decrease_frames_per_chunk(
-                    chunked, frames, target_frames_per_chunk)
+        #  The chunks are views into the tracks, so they can be counted before
+        # the output is allocated, and every chunk is copied once.
+        divided_tracks = [track.divide_into_chunks(frames_per_chunk, overlap)
+                          for track in self.tracks]
+        number_of_chunks = sum(chunked.shape[0] for chunked, _ in divided_tracks)
+
+        chunks = np.empty((number_of_chunks, target_frames_per_chunk,
+                           number_of_keypoints, number_of_coordinates))
+        chunk_frames = np.empty((number_of_chunks, target_frames_per_chunk), dtype=np.int)
+        track_indicies = np.empty((number_of_chunks,), dtype=np.int)
 
-                chunks = np.append(chunks, chunked, axis=0)
-                chunk_frames = np.append(chunk_frames, frames, axis=0)
-                indicies = np.array([i] * len(chunked))
-                track_indicies = np.append(track_indicies, indicies, axis=0)
+        start = 0
+        for i, (chunked, frames) in enumerate(divided_tracks):
+            if chunked.shape[0] > 0:
+                end = start + chunked.shape[0]
+                self._decrease_frames_per_chunk(chunked, frames, chunks[start:end],
+                                                chunk_frames[start:end])
+                track_indicies[start:end] = i
+                start = end
 
         return chunks, chunk_frames, track_indicies
 
-    def _decrease_frames_per_chunk(self, chunked, chunk_frames, target_frames_per_chunk):
+    def _decrease_frames_per_chunk(self, chunked, chunk_frames, target_chunked, target_frames):
         indicies = np.arange(0,
                              chunked.shape[1],
-                             chunked.shape[1] / target_frames_per_chunk).astype(np.int)
-
-        target_chunked = np.empty((chunked.shape[0], target_frames_per_chunk, *chunked.shape[2:]))
-        target_frames = np.empty((chunk_frames.shape[0], target_frames_per_chunk), dtype=np.int)
-
-        for i, chunk in enumerate(chunked):
-            target_chunked[i] = chunk[indicies]
-            target_frames[i] = chunk_frames[i, indicies]
+                             chunked.shape[1] / target_chunked.shape[1]).astype(np.int)
 
-        return target_chunked, target_frames
+        target_chunked[...] = chunked[:, indicies]
+        target_frames[...] = chunk_frames[:, indicies]
 
     def filter_moving_chunks(self, chunks, chunk_frames):
         """Filters out chunks that are close to a specific position.
@@ -195,3 +205,64 @@ class PostProcessor:
                 filtered_frames = np.append(filtered_frames, [chunk_frames[i]], axis=0)
 
         return filtered_chunks, filtered_frames
+
+
+class _FrameRangeIndex:
+    """Finds the tracks that can be combined with a track from their frame ranges.
+
+    The tracks are sorted by their first frame, so that the tracks that
+    start close enough to a track to overlap with it, or continue it,
+    are found with a binary search.
+
+    Parameters
+    ----------
+    tracks : list of Track
+        The tracks to look up, which may not change while the index is used.
+
+    """
+
+    def __init__(self, tracks):
+        self.first_frames = np.array([track.frame_assigned[0] for track in tracks], dtype=np.int)
+        self.last_frames = np.array([track.frame_assigned[-1] for track in tracks], dtype=np.int)
+        self.removed = np.zeros(len(tracks), dtype=bool)
+
+        self._by_first_frame = np.argsort(self.first_frames, kind='mergesort')
+        self._sorted_first_frames = self.first_frames[self._by_first_frame]
+        if len(tracks) > 0:
+            self._max_frame_span = np.max(self.last_frames - self.first_frames)
+        else:
+            self._max_frame_span = 0
+
+    def next_candidate(self, end_track, after_index):
+        """Gives the first track after after_index that may be combined with end_track.
+
+        Parameters
+        ----------
+        end_track : Track
+        after_index : int
+
+        Returns
+        -------
+        index : int, or None if there is no such track that is not removed.
+
+        """
+        end_first = end_track.frame_assigned[0]
+        end_last = end_track.frame_assigned[-1]
+
+        #  A track that ends after end_track starts can't start more than
+        # the longest frame span before it.
+        start = np.searchsorted(self._sorted_first_frames,
+                                min(end_first - self._max_frame_span, end_last - 14), 'left')
+        end = np.searchsorted(self._sorted_first_frames, end_last + 14, 'right')
+
+        indicies = self._by_first_frame[start:end]
+        first = self.first_frames[indicies]
+        last = self.last_frames[indicies]
+        #  Necessary for Track.overlaps(...) and PostProcessor._paths_nearby(...)
+        # respectively to be True.
+        possible = ((first <= end_last) & (last >= end_first)) | (np.abs(first - end_last) < 15)
+        possible &= (indicies > after_index) & ~self.removed[indicies]
+
+        if not possible.any():
+            return None
+        return indicies[possible].min()
@@ -18,15 +18,31 @@ class EnsembleClassifier(BaseEstimator, ClassifierMixin):
     *Note*: Can only use one thread, since some parts of sklearn_tda vectorisations
     are not pickable.
 
+    The classifiers do not share any results through
+    transforms.SharedResults, not even with use_tda_vectorisations.  The
+    tda vectorisations of FeatureEngineeringClassifier translate the
+    chunks before extracting keypoints, while TDAClassifier extracts them
+    first, so none of their steps get the same data.  The persistence is
+    not shared either, as it is calculated from different point clouds,
+    with max_alpha_square 1 and 2 respectively.
+
     Parameters
     ----------
     use_tda_vecorisations : boolean, optional, default=False
         Specifies if the vectorisations from sklearn_tda should be
         part of the feature_engineering pipeline.
+    n_jobs : int, optional, default = 1
+        The number of processes used to calculate persistence in the
+        TDAClassifier, where -1 uses every core.
+    cache_dir : str, optional
+        Path to a directory where the persistence diagrams of the
+        TDAClassifier are cached.
     """
 
-    def __init__(self, use_tda_vectorisations=False):
+    def __init__(self, use_tda_vectorisations=False, n_jobs=1, cache_dir=None):
         self.use_tda_vectorisations = use_tda_vectorisations
+        self.n_jobs = n_jobs
+        self.cache_dir = cache_dir
 
     def fit(self, X, y, **fit_params):
         """Fit the model.
@@ -45,7 +61,8 @@ class EnsembleClassifier(BaseEstimator, ClassifierMixin):
         self
 
         """
-        sliced_wasserstein_classifier = TDAClassifier(cross_validate=False)
+        sliced_wasserstein_classifier = TDAClassifier(cross_validate=False, n_jobs=self.n_jobs,
+                                                      cache_dir=self.cache_dir)
 
         feature_union_classifier = FeatureEngineeringClassifier(
             use_tda_vectorisations=self.use_tda_vectorisations)
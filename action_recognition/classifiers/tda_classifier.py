@@ -6,6 +6,7 @@ import sklearn
 from sklearn.base import BaseEstimator, ClassifierMixin
 from sklearn.pipeline import Pipeline
 from sklearn.svm import SVC
+from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import GridSearchCV
 from sklearn.preprocessing import RobustScaler, StandardScaler
 
@@ -24,8 +25,11 @@ class TDAClassifier(BaseEstimator, ClassifierMixin):
     Uses a pipeline where the input chunks are transformed into
     3D-point clouds (with time as the 3rd dimension) upon which
     persistence diagrams are calculated.  The persistence diagrams
-    are then passed into the kernel sklearn_tda.SlicedWasserstein,
-    and finally a sklearn.SVC is fitted to the data.
+    are then passed into the kernel transforms.SlicedWasserstein,
+    and finally a sklearn.SVC is fitted to the data.  With
+    approximate_kernel, the diagrams are instead embedded with
+    transforms.SlicedWassersteinFeatures and a linear model is fitted,
+    which scales linearly with the number of chunks.
 
     Parameters
     ----------
@@ -33,10 +37,35 @@ class TDAClassifier(BaseEstimator, ClassifierMixin):
         Specifies if the model should be cross validated in order to find the
         best parameters for the input data, or if a previously determined
         best model should be used.
+    n_jobs : int, optional, default = 1
+        The number of processes used to calculate persistence, and the
+        tiles of gram_file, where -1 uses every core.
+    cache_dir : str, optional
+        Path to a directory where the persistence diagrams are cached,
+        see transforms.Persistence.
+    approximate_kernel : boolean, optional, default = False
+        Specifies if the kernel should be approximated with random features
+        and a logistic regression, instead of a SVC on the exact kernel.
+    gram_file : str, optional
+        Path to a file where the kernel between the training chunks is
+        calculated in tiles, instead of in memory, see
+        transforms.SlicedWasserstein.  Ignored with approximate_kernel.
+        With cross_validate, every fold starts the file over.
+    shared_results : transforms.SharedResults, optional
+        Shares the results of the transforms up to and including the
+        persistence with other classifiers that have the same steps,
+        e.g. another TDAClassifier in an ensemble.  Ignored with
+        cross_validate.
     """
 
-    def __init__(self, cross_validate=False):
+    def __init__(self, cross_validate=False, n_jobs=1, cache_dir=None, approximate_kernel=False,
+                 gram_file=None, shared_results=None):
         self.cross_validate = cross_validate
+        self.n_jobs = n_jobs
+        self.cache_dir = cache_dir
+        self.approximate_kernel = approximate_kernel
+        self.gram_file = gram_file
+        self.shared_results = shared_results
         self.selected_keypoints = [k.value for k in [
             COCOKeypoints.Neck,
             COCOKeypoints.RWrist,
@@ -70,14 +99,27 @@ class TDAClassifier(BaseEstimator, ClassifierMixin):
             model = self._cross_validate_pipeline()
             self.model = model.fit(X, y)
             print(self.model.best_params_)
+            pipeline = self.model.best_estimator_
         else:
             logging.debug("Using pre-validated pipeline.")
             model = self._pre_validated_pipeline()
             self.model = model.fit(X, y)
+            pipeline = self.model
+
+        if not self.approximate_kernel:
+            self._keep_support_vectors(pipeline)
 
         self.classes_ = self.model.classes_
         return self
 
+    def _keep_support_vectors(self, pipeline):
+        #  The SVC only uses the kernel against its support vectors, so the
+        # kernel is only calculated against those when predicting.
+        support = pipeline.named_steps["Estimator"].support_
+        pipeline.named_steps["TDA"].keep_fitted_diagrams(support)
+        logging.debug("Keeping {} of {} training diagrams as support vectors.".format(
+            len(support), pipeline.named_steps["TDA"].n_fitted_))
+
     def predict(self, X):
         """Predicts using the pipeline.
 
@@ -111,20 +153,42 @@ class TDAClassifier(BaseEstimator, ClassifierMixin):
         return self.model.predict_proba(X)
 
     def _pre_validated_pipeline(self):
+        if self.approximate_kernel:
+            kernel = [
+                ("TDA", transforms.SlicedWassersteinFeatures(bandwidth=0.6, num_directions=20,
+                                                             n_components=2000, random_state=0)),
+                ("Estimator", LogisticRegression())
+            ]
+        else:
+            kernel = [
+                ("TDA", transforms.SlicedWasserstein(bandwidth=0.6, num_directions=20,
+                                                     gram_file=self.gram_file,
+                                                     n_jobs=self.n_jobs)),
+                ("Estimator", SVC(kernel='precomputed', probability=True))
+            ]
+
         pipe = Pipeline([
-            ("Extract", transforms.ExtractKeypoints(self.selected_keypoints)),
-            ("Smoothing", transforms.SmoothChunks()),
-            ("Translate", transforms.TranslateChunks()),
-            ("PositionCloud", transforms.FlattenTo3D()),
-            ("Persistence", transforms.Persistence(max_alpha_square=2, complex_='alpha')),
+            ("Extract", self._shared(transforms.ExtractKeypoints(self.selected_keypoints))),
+            ("Smoothing", self._shared(transforms.SmoothChunks())),
+            ("Translate", self._shared(transforms.TranslateChunks())),
+            ("PositionCloud", self._shared(transforms.FlattenTo3D())),
+            ("Persistence", self._shared(transforms.Persistence(max_alpha_square=2,
+                                                                complex_='alpha',
+                                                                n_jobs=self.n_jobs,
+                                                                cache_dir=self.cache_dir))),
             ("Separator", tda.DiagramSelector(limit=np.inf, point_type="finite")),
-            ("Prominent", tda.ProminentPoints()),
-            ("TDA", tda.SlicedWasserstein(bandwidth=0.6, num_directions=20)),
-            ("Estimator", SVC(kernel='precomputed', probability=True))
-        ])
+            ("Prominent", tda.ProminentPoints())
+        ] + kernel)
 
         return pipe
 
+    def _shared(self, transformer):
+        #  Not shared when cross-validating, as the parameters of the
+        # grid refer to the transforms themselves.
+        if self.shared_results is None or self.cross_validate:
+            return transformer
+        return transforms.Shared(transformer, self.shared_results)
+
     def _cross_validate_pipeline(self):
         # Definition of pipeline
         pipe = self._pre_validated_pipeline()
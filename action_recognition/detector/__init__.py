@@ -2,7 +2,9 @@
 Detector
 ========
 
-Contains pose detectors based on OpenPose, for the tracking procedure.
+Contains pose detectors based on OpenPose, for the tracking procedure,
+and a cache which records detections so that they can be replayed.
 """
 from .caffe_openpose import CaffeOpenpose
 from .tf_openpose import TFOpenpose
+from .detection_cache import DetectionCache, RecordingDetector, ReplayDetector
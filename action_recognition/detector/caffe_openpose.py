@@ -1,5 +1,8 @@
 # Install openpose globally where all other python packages are installed.
-from openpose import openpose as op
+try:
+    from openpose import openpose as op
+except ImportError:
+    print("Caffe openpose not available.")
 
 
 class CaffeOpenpose:
@@ -59,3 +62,31 @@ class CaffeOpenpose:
         """
         keypoints, image_with_keypoints = self.openpose.forward(original_image, True)
         return keypoints, image_with_keypoints
+
+    def detect_batch(self, images, render=False):
+        """Detects the pose of every person in each of the given images.
+
+        Parameters
+        ----------
+        images : list of images, to predict people of.
+        render : boolean, optional, default False
+            Specifies if the images overlayed with the identified keypoints
+            should be produced, which takes extra time.
+
+        Returns
+        -------
+        keypoints : list of array-like
+            The keypoints of every identified person in each image,
+            each of shape = [n_people, n_keypoints, 3]
+        images_with_keypoints : list of images, or None if not render.
+
+        """
+        if render:
+            results = [self.openpose.forward(image, True) for image in images]
+            keypoints = [k for k, _ in results]
+            images_with_keypoints = [image for _, image in results]
+        else:
+            keypoints = [self.openpose.forward(image, False) for image in images]
+            images_with_keypoints = None
+
+        return keypoints, images_with_keypoints
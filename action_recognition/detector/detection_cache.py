@@ -0,0 +1,291 @@
+import numpy as np
+import os
+import struct
+import logging
+
+
+class DetectionCache:
+    """An append-only file of detected keypoints, by video and frame number.
+
+    Lets the keypoints from a slow detector be stored once, and replayed
+    with ReplayDetector when e.g. the tracking is tuned.  The keypoints are
+    stored as float32 in records appended to the file, so a cache that was
+    interrupted while writing keeps every complete record.
+
+    Parameters
+    ----------
+    file : str
+        Path to the cache file.  Created if it does not exist, and appended
+        to if it does.
+
+    """
+
+    _video_record = b'V'
+    _keypoints_record = b'K'
+
+    def __init__(self, file):
+        self.file = file
+        self._video_ids = {}
+        self._offsets = {}
+
+        if os.path.isfile(file):
+            self._read_index()
+
+        self._writer = open(file, 'ab')
+        self._reader = open(file, 'rb')
+
+    def _read_index(self):
+        with open(self.file, 'rb') as f:
+            data = f.read()
+
+        position = 0
+        complete_position = 0
+        try:
+            while position < len(data):
+                record_type = data[position:position + 1]
+                position += 1
+                if record_type == self._video_record:
+                    length, = struct.unpack_from('<I', data, position)
+                    position += 4
+                    if position + length > len(data):
+                        break
+                    video = data[position:position + length].decode('utf-8')
+                    position += length
+                    self._video_ids[video] = len(self._video_ids)
+                elif record_type == self._keypoints_record:
+                    record_position = position
+                    video_id, frame, shape, position = self._read_header(data, position)
+                    position += 4 * int(np.prod(shape))
+                    if position > len(data):
+                        break
+                    self._offsets[video_id, frame] = record_position
+                else:
+                    break
+                complete_position = position
+        except struct.error:
+            pass
+
+        #  Remove anything after the last complete record, so that new records
+        # are not appended after a partially written one.
+        if complete_position < len(data):
+            logging.warning("Removing an incomplete record at the end of {}".format(self.file))
+            with open(self.file, 'r+b') as f:
+                f.truncate(complete_position)
+
+    def _read_header(self, data, position):
+        video_id, frame, ndim = struct.unpack_from('<IIB', data, position)
+        position += struct.calcsize('<IIB')
+        shape = struct.unpack_from('<{}I'.format(ndim), data, position)
+        position += 4 * ndim
+
+        return video_id, frame, shape, position
+
+    def _video_key(self, video):
+        return os.path.normpath(video)
+
+    def add(self, video, frame, keypoints):
+        """Appends the keypoints detected at a frame of a video.
+
+        Parameters
+        ----------
+        video : str
+            Path to the video.
+        frame : int
+            The frame number the keypoints were detected at.
+        keypoints : array-like
+            shape = [n_people, n_keypoints, 3]
+
+        """
+        video = self._video_key(video)
+        if video not in self._video_ids:
+            encoded_video = video.encode('utf-8')
+            self._writer.write(self._video_record)
+            self._writer.write(struct.pack('<I', len(encoded_video)))
+            self._writer.write(encoded_video)
+            self._video_ids[video] = len(self._video_ids)
+
+        keypoints = np.asarray(keypoints, dtype=np.float32)
+        video_id = self._video_ids[video]
+
+        self._writer.write(self._keypoints_record)
+        self._offsets[video_id, frame] = self._writer.tell()
+        self._writer.write(struct.pack('<IIB', video_id, frame, keypoints.ndim))
+        self._writer.write(struct.pack('<{}I'.format(keypoints.ndim), *keypoints.shape))
+        self._writer.write(keypoints.tobytes())
+        self._writer.flush()
+
+    def get(self, video, frame):
+        """Gets the keypoints detected at a frame of a video.
+
+        Parameters
+        ----------
+        video : str
+            Path to the video.
+        frame : int
+            The frame number to get the keypoints for.
+
+        Returns
+        -------
+        keypoints : array-like
+            shape = [n_people, n_keypoints, 3]
+
+        Raises
+        ------
+        KeyError
+            If the frame of the video is not in the cache.
+
+        """
+        video_id = self._video_ids[self._video_key(video)]
+        offset = self._offsets[video_id, frame]
+
+        self._reader.seek(offset)
+        header = self._reader.read(struct.calcsize('<IIB'))
+        _, _, ndim = struct.unpack('<IIB', header)
+        shape = struct.unpack('<{}I'.format(ndim), self._reader.read(4 * ndim))
+        data = self._reader.read(4 * int(np.prod(shape)))
+
+        return np.frombuffer(data, dtype=np.float32).reshape(shape).copy()
+
+    def __contains__(self, key):
+        video, frame = key
+        video = self._video_key(video)
+        return video in self._video_ids and (self._video_ids[video], frame) in self._offsets
+
+    def number_of_frames(self, video):
+        """Gives the number of frames of a video in the cache.
+
+        Parameters
+        ----------
+        video : str
+            Path to the video.
+
+        Returns
+        -------
+        number_of_frames : int
+
+        """
+        video_id = self._video_ids.get(self._video_key(video))
+        return sum(1 for v, _ in self._offsets if v == video_id)
+
+    def close(self):
+        """Closes the cache file.
+
+        """
+        self._writer.close()
+        self._reader.close()
+
+
+class RecordingDetector:
+    """Wraps a detector and records what it detects in a video to a DetectionCache.
+
+    The frame number is counted from the calls to detect, so a new
+    RecordingDetector is needed for every video, which has to be processed
+    from the first frame.
+
+    Parameters
+    ----------
+    detector : any object implementing detect, as the detectors in this module.
+    cache : DetectionCache
+    video : str
+        Path to the video that the detector is used on.
+
+    """
+
+    def __init__(self, detector, cache, video):
+        self.detector = detector
+        self.cache = cache
+        self.video = video
+        self.current_frame = 0
+
+    def detect(self, original_image):
+        """Detects the pose of every person in the image, and records the keypoints.
+
+        Parameters
+        ----------
+        original_image : image, to predict people of.
+
+        Returns
+        -------
+        keypoints : array-like
+            shape = [n_people, n_keypoints, 3]
+        image_with_keypoins : image, the original image overlayed with the
+            identified keypoints.
+
+        """
+        keypoints, image_with_keypoints = self.detector.detect(original_image)
+        self._record(keypoints)
+
+        return keypoints, image_with_keypoints
+
+    def detect_batch(self, images, render=False):
+        """Detects the pose of every person in the images, and records the keypoints.
+
+        Uses detect_batch of the wrapped detector if available.
+
+        Parameters
+        ----------
+        images : list of images, to predict people of.
+        render : boolean, optional, default False
+
+        Returns
+        -------
+        keypoints : list of array-like
+        images_with_keypoints : list of images, or None if not render.
+
+        """
+        if hasattr(self.detector, 'detect_batch'):
+            keypoints, images_with_keypoints = self.detector.detect_batch(images, render)
+        else:
+            results = [self.detector.detect(image) for image in images]
+            keypoints = [k for k, _ in results]
+            images_with_keypoints = [image for _, image in results] if render else None
+
+        for k in keypoints:
+            self._record(k)
+
+        return keypoints, images_with_keypoints
+
+    def _record(self, keypoints):
+        self.cache.add(self.video, self.current_frame, keypoints)
+        self.current_frame += 1
+
+
+class ReplayDetector:
+    """Serves keypoints recorded in a DetectionCache, in place of a detector.
+
+    The frame number is counted from the calls to detect, so a new
+    ReplayDetector is needed for every video, which has to be processed
+    from the first frame.  The returned images are the original images,
+    as the keypoints are not rendered.
+
+    Parameters
+    ----------
+    cache : DetectionCache
+    video : str
+        Path to the video that the keypoints were recorded for.
+
+    """
+
+    def __init__(self, cache, video):
+        self.cache = cache
+        self.video = video
+        self.current_frame = 0
+
+    def detect(self, original_image):
+        """Gives the recorded keypoints of the next frame.
+
+        Parameters
+        ----------
+        original_image : image, the next frame of the video.
+
+        Returns
+        -------
+        keypoints : array-like
+            shape = [n_people, n_keypoints, 3]
+        image_with_keypoins : image, a copy of original_image.
+
+        """
+        keypoints = self.cache.get(self.video, self.current_frame)
+        self.current_frame += 1
+
+        return keypoints, np.copy(original_image)
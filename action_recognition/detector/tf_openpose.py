@@ -40,15 +40,49 @@ class TFOpenpose:
             identified keypoints.
 
         """
+        people, humans = self._detect_people(original_image)
+        image_with_keypoints = TfPoseEstimator.draw_humans(
+            original_image, humans, imgcopy=True)
+        return people, image_with_keypoints
+
+    def detect_batch(self, images, render=False):
+        """Detects the pose of every person in each of the given images.
+
+        Parameters
+        ----------
+        images : list of images, to predict people of.
+        render : boolean, optional, default False
+            Specifies if the images overlayed with the identified keypoints
+            should be produced, which takes extra time.
+
+        Returns
+        -------
+        keypoints : list of array-like
+            The keypoints of every identified person in each image,
+            each of shape = [n_people, n_keypoints, 3]
+        images_with_keypoints : list of images, or None if not render.
+
+        """
+        keypoints = []
+        images_with_keypoints = [] if render else None
+        for image in images:
+            people, humans = self._detect_people(image)
+            keypoints.append(people)
+            if render:
+                images_with_keypoints.append(
+                    TfPoseEstimator.draw_humans(image, humans, imgcopy=True))
+
+        return keypoints, images_with_keypoints
+
+    def _detect_people(self, original_image):
         image_height, image_width = original_image.shape[:2]
 
         humans = self.tf_openpose.inference(original_image, resize_to_default=True)
-        image_with_keypoints = TfPoseEstimator.draw_humans(
-            original_image, humans, imgcopy=True)
         people = np.array([self._tf_openpose_human_to_np(human, image_width, image_height)
                            for human in humans])
-        return people, image_with_keypoints
+        return people, humans
 
+    @staticmethod
     def _tf_openpose_human_to_np(human, image_width, image_height):
         # The same transformation that the authors are doing for their plotting:
         # https://github.com/ildoonet/tf-pose-estimation/blob/4c28832d112060ec9944eafee745b403881e1daa/tf_pose/estimator.py#L388
@@ -53,13 +53,15 @@ class FeatureVisualiser:
         chunks = pipe.fit_transform(chunks)
         transforms.Persistence().visualise_point_clouds(chunks, 10)
 
-    def save_persistence_graphs(self, chunks, labels, out_dir):
+    def save_persistence_graphs(self, chunks, labels, out_dir, cache_dir=None):
         """Saves the persistence graphs corresponding to the chunks to out_dir.
 
         Parameters
         ----------
         chunks : array-like, shape = [n_chunks, frames_per_chunk, n_keypoints, 3]
             The training data for classification.
+        cache_dir : str, optional
+            Path to a directory where the persistence diagrams are cached.
         """
         selected_keypoints = [k.value for k in [
             COCOKeypoints.Neck,
@@ -75,7 +77,7 @@ class FeatureVisualiser:
             ("4", transforms.FlattenTo3D()),
         ])
         chunks = pipe.fit_transform(chunks)
-        persistence = transforms.Persistence()
+        persistence = transforms.Persistence(cache_dir=cache_dir)
         _ = persistence.fit_transform(chunks)
         persistence.save_persistences(labels, out_dir)
         persistence.save_betti_curves(labels, out_dir)
@@ -1,2 +1,9 @@
 from .test_tracker import TestTracker
 from .test_track import TestTrack
+from .test_live_post_processor import TestLivePostProcessor
+from .test_post_processor import TestPostProcessor
+from .test_persistence_cache import TestPersistenceCache
+from .test_sliced_wasserstein import TestSlicedWasserstein
+from .test_sliced_wasserstein_features import TestSlicedWassersteinFeatures
+from .test_gram_matrix_file import TestGramMatrixFile
+from .test_shared_results import TestSharedResults
@@ -0,0 +1,100 @@
+import cv2
+import numpy as np
+
+
+def write_video(file, number_of_frames, size=(64, 48)):
+    """Writes a video where the brightness of each frame encodes its frame number.
+
+    Parameters
+    ----------
+    file : str
+        Path to the .avi file to write.
+    number_of_frames : int
+        At most 120, so that the brightness fits in an image.
+    size : tuple of int, optional
+        The (width, height) of the video.
+
+    """
+    writer = cv2.VideoWriter(file, cv2.VideoWriter_fourcc(*'MJPG'), 10, size)
+    for frame in range(number_of_frames):
+        writer.write(np.full((size[1], size[0], 3), 2 * frame, dtype=np.uint8))
+    writer.release()
+
+
+class FakeDetector:
+    """Detects people walking in straight lines in videos from write_video.
+
+    Used in place of OpenPose, where the keypoints only depend on the
+    frame number read from the brightness of the image.  Implements both
+    detect and detect_batch, and counts the calls to each.
+
+    Parameters
+    ----------
+    number_of_people : int, optional, default 3
+
+    """
+
+    def __init__(self, number_of_people=3):
+        random = np.random.RandomState(0)
+        self.starts = random.uniform(0, 1000, size=(number_of_people, 1, 2))
+        self.velocities = random.uniform(-3, 3, size=(number_of_people, 1, 2))
+        self.shapes = random.uniform(-40, 40, size=(number_of_people, 18, 2))
+
+        self.detect_calls = 0
+        self.detect_batch_calls = 0
+
+    def frame_number(self, image):
+        return int(round(image.mean() / 2))
+
+    def detect_batch(self, images, render=False):
+        """Detects the made up people in every image at once.
+
+        Parameters
+        ----------
+        images : list of images from a video created by write_video.
+        render : boolean, optional, default False
+            Specifies if copies of the images should be returned.
+
+        Returns
+        -------
+        keypoints : list of array-like
+            Each of shape = [n_people, n_keypoints, 3]
+        images_with_keypoints : list of images, or None if not render.
+
+        """
+        self.detect_batch_calls += 1
+
+        frames = np.array([self.frame_number(image) for image in images])
+        keypoints = np.ones((len(frames), len(self.starts), 18, 3), dtype=np.float32)
+        keypoints[..., :2] = self.starts + self.shapes + \
+            self.velocities * frames[:, np.newaxis, np.newaxis, np.newaxis]
+        # Every third frame, the last person is not detected
+        keypoints = [k[:-1] if frame % 3 == 0 else k for k, frame in zip(keypoints, frames)]
+
+        images_with_keypoints = [np.copy(image) for image in images] if render else None
+        return keypoints, images_with_keypoints
+
+    def detect(self, original_image):
+        """Detects the made up people in the image.
+
+        Parameters
+        ----------
+        original_image : image from a video created by write_video.
+
+        Returns
+        -------
+        keypoints : array-like
+            shape = [n_people, n_keypoints, 3]
+        image_with_keypoints : image, a copy of the original image.
+
+        """
+        self.detect_calls += 1
+
+        frame = self.frame_number(original_image)
+        keypoints = np.ones((len(self.starts), 18, 3), dtype=np.float32)
+        keypoints[:, :, :2] = self.starts + self.shapes + self.velocities * frame
+        # Every third frame, the last person is not detected
+        if frame % 3 == 0:
+            keypoints = keypoints[:-1]
+
+        return keypoints, np.copy(original_image)
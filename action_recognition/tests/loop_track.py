@@ -0,0 +1,293 @@
+import numpy as np
+
+from ..util import coco_connections
+
+
+class LoopPerson:
+    """The keypoints of a person in a LoopTrack.
+
+    Parameters
+    ----------
+    keypoints : array-like
+        shape = [n_keypoints, 3]
+
+    """
+
+    def __init__(self, keypoints):
+        self.keypoints = keypoints
+
+    def __getitem__(self, idx):
+        return self.keypoints[idx]
+
+    def distance(self, other_person):
+        xy_person = self.keypoints[:, :2]
+        xy_other = other_person.keypoints[:, :2]
+
+        xy_person, xy_other = self._filter_nonzero(xy_person, xy_other)
+
+        if xy_person.size == 0:
+            return 10000000
+
+        distance = np.linalg.norm(xy_person - xy_other)
+        distance = distance / xy_person.size
+
+        return distance
+
+    def _filter_nonzero(self, first, second):
+        first, second = first[np.nonzero(first)], second[np.nonzero(first)]
+        first, second = first[np.nonzero(second)], second[np.nonzero(second)]
+        return first, second
+
+    def interpolate(self, other, steps=1):
+        diff = self.keypoints - other.keypoints
+        step_diff = diff / steps
+        return [LoopPerson(other.keypoints + step_diff * i) for i in range(1, steps)]
+
+    def fill_missing_keypoints(self, other, fill_type='copy'):
+        # If type is diff, we have to try to fill in both directions.
+        if fill_type == 'diff':
+            self._fill_diff_loop(enumerate(self.keypoints), other)
+            self._fill_diff_loop(reversed(list(enumerate(self.keypoints))), other)
+
+        # Always fill with copy in case we did not find any possible
+        # connections.
+        for i, k in enumerate(self.keypoints):
+            if not np.any(k):
+                self.keypoints[i] = np.copy(other.keypoints[i])
+
+    def _fill_diff_loop(self, enumerator, other):
+        for i, k in enumerator:
+            if not np.any(k):
+                new_keypoint = self._diff_fill_keypoint(i, other)
+                if new_keypoint is not None:
+                    self.keypoints[i] = new_keypoint
+
+    def _diff_fill_keypoint(self, keypoint_index, other):
+        connect_downwards = next((from_ for from_, to in coco_connections
+                                  if to == keypoint_index and
+                                  np.any(other.keypoints[from_]) and
+                                  np.any(other.keypoints[to]) and
+                                  np.any(self.keypoints[from_])
+                                  ), -1)
+        connect_upwards = next((to for from_, to in coco_connections
+                                if from_ == keypoint_index and
+                                np.any(other.keypoints[to]) and
+                                np.any(other.keypoints[from_]) and
+                                np.any(self.keypoints[to])
+                                ), -1)
+        if connect_downwards == -1 and connect_upwards == -1:
+            return None
+
+        connect_i = [i for i in [connect_downwards, connect_upwards] if i != -1][0]
+
+        diff = other.keypoints[connect_i] - other.keypoints[keypoint_index]
+        return self.keypoints[connect_i] - diff
+
+
+class LoopTrack:
+    """The original list based Track, which loops over the people in the track.
+
+    Used as a reference for the vectorised methods of Track, so that the
+    tests can check that they give the same results on random tracks.
+
+    """
+
+    def __init__(self):
+        self.track = []
+        self.frame_assigned = []
+        self.predictions = {}
+
+    @classmethod
+    def from_np(cls, keypoints, frames):
+        """Creates a track from arrays of keypoints and frame numbers.
+
+        Parameters
+        ----------
+        keypoints : array-like
+            shape = [n_frames, n_keypoints, 3]
+        frames : array-like
+            shape = [n_frames]
+
+        Returns
+        -------
+        track : LoopTrack
+
+        """
+        track = cls()
+        track.track = [LoopPerson(np.copy(k)) for k in keypoints]
+        track.frame_assigned = [int(f) for f in frames]
+        return track
+
+    def to_np(self):
+        np_path = np.array([p.keypoints for p in self.track])
+        np_frames = np.array(self.frame_assigned)
+
+        return np_path, np_frames
+
+    def get_keypoints_at(self, frame):
+        path = [k[:, :2] for k, f in zip(self.track, self.frame_assigned)
+                if f <= frame and
+                np.any(k[:, :2])]
+
+        if len(path) > 0:
+            return path[-1]
+        else:
+            return None
+
+    def divide_into_chunks(self, frames_per_chunk, overlap=-1):
+        if overlap == -1:
+            overlap = int(frames_per_chunk / 2)
+
+        number_of_chunks = int((len(self.track) - frames_per_chunk - 1) /
+                               (frames_per_chunk - overlap) + 1)
+
+        if number_of_chunks <= 0:
+            return np.array([]), np.array([])
+
+        keypoint_shape = self.track[0].keypoints.shape
+        chunks = np.zeros((number_of_chunks, frames_per_chunk, *keypoint_shape))
+        frames = np.zeros((number_of_chunks, frames_per_chunk), dtype=np.int)
+        start_index = 0
+        index = 0
+        while start_index + frames_per_chunk < len(self.track):
+            chunk, chunk_frames = self._chunk_from_index(start_index, frames_per_chunk)
+
+            chunks[index] = chunk
+            frames[index] = chunk_frames
+            start_index += frames_per_chunk - overlap
+            index += 1
+
+        return chunks, frames
+
+    def chunk_from_frame(self, start_frame, frames_per_chunk):
+        start_index = 0
+        while start_index < len(self.frame_assigned) and \
+                self.frame_assigned[start_index] < start_frame:
+            start_index += 1
+
+        return self._chunk_from_index(start_index, frames_per_chunk)
+
+    def _chunk_from_index(self, start_index, frames_per_chunk):
+        end_index = start_index + frames_per_chunk
+        chunk = np.array([p.keypoints for p in self.track[start_index:end_index]])
+        frames = np.array(self.frame_assigned[start_index:end_index])
+        return chunk, frames
+
+    def remove_frame_duplicates(self):
+        i = 0
+        while i < len(self.frame_assigned) - 1:
+            if self.frame_assigned[i] == self.frame_assigned[i + 1]:
+                self.frame_assigned.pop(i + 1)
+                self.track.pop(i + 1)
+            else:
+                i += 1
+
+    def fill_missing_frames(self):
+        new_track = []
+        new_frame_assigned = []
+
+        new_track.append(self.track[0])
+        new_frame_assigned.append(self.frame_assigned[0])
+
+        for i in range(1, len(self.track)):
+            frame_diff = self.frame_assigned[i] - self.frame_assigned[i - 1]
+            if frame_diff == 1:
+                new_track.append(self.track[i])
+                new_frame_assigned.append(self.frame_assigned[i])
+            else:
+                interpolated_people = self.track[i].interpolate(self.track[i - 1], frame_diff)
+                for j, person in enumerate(interpolated_people):
+                    new_track.append(person)
+                    new_frame_assigned.append(self.frame_assigned[i - 1] + j + 1)
+
+                new_track.append(self.track[i])
+                new_frame_assigned.append(self.frame_assigned[i])
+
+        self.track = new_track
+        self.frame_assigned = new_frame_assigned
+
+    def combine(self, other):
+        new_track = []
+        new_frame_assigned = []
+        self_index = 0
+        other_index = 0
+
+        while self_index < len(self.track) and other_index < len(other.track):
+            if self.frame_assigned[self_index] < other.frame_assigned[other_index]:
+                new_track.append(self.track[self_index])
+                new_frame_assigned.append(self.frame_assigned[self_index])
+                self_index += 1
+            else:
+                new_track.append(other.track[other_index])
+                new_frame_assigned.append(other.frame_assigned[other_index])
+                other_index += 1
+
+        if self_index >= len(self.track):
+            new_track.extend(other.track[other_index:])
+            new_frame_assigned.extend(other.frame_assigned[other_index:])
+        elif other_index >= len(other.track):
+            new_track.extend(self.track[self_index:])
+            new_frame_assigned.extend(self.frame_assigned[self_index:])
+
+        self.track = new_track
+        self.frame_assigned = new_frame_assigned
+        self.remove_frame_duplicates()
+        self.predictions = {**other.predictions, **self.predictions}
+
+    def overlaps(self, other):
+        if self.frame_assigned[-1] < other.frame_assigned[0] or \
+                self.frame_assigned[0] > other.frame_assigned[-1]:
+            return False
+
+        start_frame = max(self.frame_assigned[0], other.frame_assigned[0])
+
+        self_index = self._find_start_index(start_frame, self.frame_assigned)
+        other_index = self._find_start_index(start_frame, other.frame_assigned)
+
+        while self_index < len(self.track) and other_index < len(other.track):
+            if self.frame_assigned[self_index] < other.frame_assigned[other_index]:
+                if self._check_frame_distance(self.frame_assigned, self.track, self_index,
+                                              other.frame_assigned, other.track, other_index):
+                    self_index += 1
+                else:
+                    return False
+            else:
+                if self._check_frame_distance(other.frame_assigned, other.track, other_index,
+                                              self.frame_assigned, self.track, self_index):
+                    other_index += 1
+                else:
+                    return False
+
+        return True
+
+    def _check_frame_distance(self, frame_assigned, track, index, other_frame_assigned,
+                              other_track, other_index):
+        distance_threshold = 16
+
+        frame_diff = frame_assigned[index] - other_frame_assigned[other_index]
+        if index + 1 < len(frame_assigned):
+            next_frame_diff = frame_assigned[index + 1] - other_frame_assigned[other_index]
+        else:
+            next_frame_diff = frame_diff - 1
+
+        distance = track[index].distance(other_track[other_index])
+
+        if next_frame_diff > frame_diff and next_frame_diff <= 0:
+            return True
+        else:
+            return distance < distance_threshold
+
+    def _find_start_index(self, start_frame, frame_assigned):
+        index = 0
+        while frame_assigned[index] < start_frame:
+            index += 1
+        index -= 1
+
+        return max(0, index)
+
+    def fill_missing_keypoints(self, fill_type='copy'):
+        if len(self.track) < 2:
+            return
+
+        for i in range(1, len(self.track)):
+            self.track[i].fill_missing_keypoints(self.track[i - 1], fill_type)
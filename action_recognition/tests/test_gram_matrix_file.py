@@ -0,0 +1,56 @@
+import unittest
+import tempfile
+import os
+import numpy as np
+from ..transforms import GramMatrixFile
+
+
+class TestGramMatrixFile(unittest.TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        values = random_state.uniform(size=(10, 10))
+        self.values = (values + values.T).astype(np.float32)
+
+    def _write(self, gram, tiles):
+        for row, column in tiles:
+            row_start, row_stop = gram.tile_range(row)
+            column_start, column_stop = gram.tile_range(column)
+            gram.write_tile(row, column, self.values[row_start:row_stop, column_start:column_stop])
+
+    def test_write_tiles(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            gram = GramMatrixFile(os.path.join(out_dir, 'gram'), 10, 'key', tile_size=4)
+            self.assertEqual(gram.number_of_tiles, 3)
+            self.assertEqual(gram.tile_range(2), (8, 10))
+            tiles = gram.missing_tiles()
+            self.assertEqual(tiles, [(0, 0), (0, 1), (0, 2), (1, 1), (1, 2), (2, 2)])
+
+            self._write(gram, tiles)
+            self.assertEqual(gram.missing_tiles(), [])
+            matrix = gram.matrix()
+            np.testing.assert_array_equal(matrix, self.values)
+            np.testing.assert_array_equal(matrix, matrix.T)
+
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            file = os.path.join(out_dir, 'gram')
+            gram = GramMatrixFile(file, 10, 'key', tile_size=4)
+            self._write(gram, [(0, 0), (1, 2)])
+
+            gram = GramMatrixFile(file, 10, 'key', tile_size=4)
+            self.assertEqual(gram.missing_tiles(), [(0, 1), (0, 2), (1, 1), (2, 2)])
+            np.testing.assert_array_equal(gram.matrix()[4:8, 8:], self.values[4:8, 8:])
+
+    def test_start_over(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            file = os.path.join(out_dir, 'gram')
+            gram = GramMatrixFile(file, 10, 'key', tile_size=4)
+            self._write(gram, gram.missing_tiles())
+
+            for size, key, tile_size in [(10, 'other key', 4), (9, 'key', 4), (10, 'key', 5)]:
+                gram = GramMatrixFile(file, size, key, tile_size=tile_size)
+                self.assertEqual(len(gram.missing_tiles()),
+                                 gram.number_of_tiles * (gram.number_of_tiles + 1) // 2)
+                np.testing.assert_array_equal(gram.matrix(), 0)
+                self._write(gram, gram.missing_tiles()[:1])
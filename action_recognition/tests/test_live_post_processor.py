@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+from ..analysis import PostProcessor, LivePostProcessor
+from ..tracker import Track, Person
+
+
+class TestLivePostProcessor(unittest.TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.keypoints = random_state.uniform(1, 100, size=(40, 18, 3))
+        # Keypoints that the detector missed, which are filled in.
+        self.keypoints[random_state.uniform(size=(40, 18)) < 0.2] = 0
+        # Frames that the person was missed in, which are interpolated.
+        self.frames = np.delete(np.arange(45), [5, 12, 13, 30, 31])
+
+    def _track(self, keypoints, frames):
+        track = Track()
+        for k, frame in zip(keypoints, frames):
+            track.add_person(Person(k), frame)
+        return track
+
+    def _filled(self, track):
+        # The fill steps of PostProcessor, on their own.
+        filled_track = Track.from_np(*track.to_np())
+        PostProcessor()._fill_tracks([filled_track])
+        return filled_track
+
+    def test_process_tracks_incrementally(self):
+        processor = LivePostProcessor(window=len(self.frames))
+        track = Track()
+        for i, (keypoints, frame) in enumerate(zip(self.keypoints, self.frames)):
+            track.add_person(Person(keypoints), frame)
+            if i % 3 == 0:
+                processor.process_tracks([track])
+
+        tracks, processed_tracks = processor.process_tracks([track])
+        expected = self._filled(track)
+
+        self.assertEqual(tracks, [track])
+        self.assertEqual(len(processed_tracks), 1)
+        keypoints, frames = processed_tracks[0].to_np()
+        expected_keypoints, expected_frames = expected.to_np()
+        np.testing.assert_array_equal(frames, expected_frames)
+        np.testing.assert_allclose(keypoints, expected_keypoints, rtol=1e-5)
+
+    def test_process_tracks_window(self):
+        # When a track is first processed, only its window is processed.
+        processor = LivePostProcessor(window=20)
+        track = self._track(self.keypoints, self.frames)
+
+        tracks, processed_tracks = processor.process_tracks([track])
+        keypoints, frames = processed_tracks[0].to_np()
+        expected_keypoints, expected_frames = self._filled(track.copy(-20)).to_np()
+
+        np.testing.assert_array_equal(frames, expected_frames)
+        np.testing.assert_allclose(keypoints, expected_keypoints, rtol=1e-5)
+
+        #  When it is continued, the start of the window is filled from the
+        # people before it, as if the whole track was processed.
+        processor = LivePostProcessor(window=20)
+        track = Track()
+        for keypoints, frame in zip(self.keypoints, self.frames):
+            track.add_person(Person(keypoints), frame)
+            processor.process_tracks([track])
+
+        tracks, processed_tracks = processor.process_tracks([track])
+        keypoints, frames = processed_tracks[0].to_np()
+        expected_keypoints, expected_frames = self._filled(track).to_np()
+
+        start = np.searchsorted(expected_frames, self.frames[-20])
+        np.testing.assert_array_equal(frames, expected_frames[start:])
+        np.testing.assert_allclose(keypoints, expected_keypoints[start:], rtol=1e-5)
+
+    def test_process_tracks_not_combined(self):
+        #  Unlike PostProcessor.post_process_tracks(), overlapping tracks are
+        # not combined, so that the processed tracks stay aligned with the
+        # tracks passed, and differ from the combined track.
+        processor = LivePostProcessor()
+        first_track = self._track(self.keypoints[:25], self.frames[:25])
+        second_track = self._track(self.keypoints[20:], self.frames[20:])
+        short_track = self._track(self.keypoints[:10], self.frames[:10])
+
+        post_processor = PostProcessor()
+        post_processor.tracks = [Track.from_np(*track.to_np())
+                                   for track in [first_track, second_track]]
+        post_processor.post_process_tracks()
+        self.assertEqual(len(post_processor.tracks), 1)
+
+        tracks, processed_tracks = processor.process_tracks(
+            [first_track, short_track, second_track])
+        self.assertEqual(tracks, [first_track, second_track])
+        for track, processed_track in zip(tracks, processed_tracks):
+            expected_keypoints, expected_frames = self._filled(track).to_np()
+            keypoints, frames = processed_track.to_np()
+            np.testing.assert_array_equal(frames, expected_frames)
+            np.testing.assert_allclose(keypoints, expected_keypoints, rtol=1e-5)
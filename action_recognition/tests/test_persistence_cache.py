@@ -0,0 +1,83 @@
+import unittest
+import tempfile
+import pickle
+import shutil
+import os
+import numpy as np
+from ..transforms import PersistenceCache, Persistence
+
+
+class TestPersistenceCache(unittest.TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.point_clouds = [random_state.uniform(size=(10, 3)) for _ in range(3)]
+        self.parameters = {'complex_': 'alpha', 'max_alpha_square': 2}
+        self.diags = [[(0, (0.0, float('inf'))), (0, (0.0, 0.5 + i)), (1, (0.25, 0.75))]
+                      for i in range(3)]
+
+    def test_get_and_add(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = PersistenceCache(cache_dir)
+            keys = [cache.key(points, self.parameters) for points in self.point_clouds]
+            self.assertEqual(len(set(keys)), 3)
+            self.assertNotEqual(cache.key(self.point_clouds[0], {'complex_': 'rips'}), keys[0])
+
+            self.assertIsNone(cache.get(keys[0]))
+            cache.add(keys[0], self.diags[0])
+            self.assertEqual(cache.get(keys[0]), self.diags[0])
+            self.assertIsNone(cache.get(keys[1]))
+            self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+            # The diagrams persist between runs.
+            cache = PersistenceCache(cache_dir)
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(cache.get(keys[0]), self.diags[0])
+
+    def test_remove_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = PersistenceCache(cache_dir)
+            keys = [cache.key(points, self.parameters) for points in self.point_clouds]
+            cache.add(keys[0], self.diags[0])
+            size = os.path.getsize(os.path.join(cache_dir, keys[0] + '.npy'))
+
+            # Room for two diagrams, all of which have the same size.
+            cache = PersistenceCache(cache_dir, max_size=2 * size)
+            cache.add(keys[1], self.diags[1])
+            cache.get(keys[0])
+            cache.add(keys[2], self.diags[2])
+
+            self.assertEqual(len(cache), 2)
+            self.assertIsNone(cache.get(keys[1]))
+            self.assertFalse(os.path.exists(os.path.join(cache_dir, keys[1] + '.npy')))
+            self.assertEqual(cache.get(keys[0]), self.diags[0])
+            self.assertEqual(cache.get(keys[2]), self.diags[2])
+
+    def test_pickle(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            cache_dir = os.path.join(out_dir, 'cache')
+            cache = PersistenceCache(cache_dir)
+            key = cache.key(self.point_clouds[0], self.parameters)
+            cache.add(key, self.diags[0])
+            persistence = Persistence(cache_dir=cache_dir).fit(self.point_clouds)
+
+            pickled_cache = pickle.dumps(cache)
+            pickled_persistence = pickle.dumps(persistence)
+            #  As if unpickled on another machine, where the directory
+            # does not exist.
+            shutil.rmtree(cache_dir)
+
+            cache = pickle.loads(pickled_cache)
+            self.assertEqual(len(cache), 0)
+            self.assertIsNone(cache.get(key))
+            cache.add(key, self.diags[0])
+            self.assertEqual(cache.get(key), self.diags[0])
+
+            shutil.rmtree(cache_dir)
+            persistence = pickle.loads(pickled_persistence)
+            self.assertIsNone(persistence.cache_)
+            cache = persistence._open_cache()
+            self.assertIs(persistence._open_cache(), cache)
+            self.assertEqual(len(cache), 0)
+            cache.add(key, self.diags[0])
+            self.assertEqual(cache.get(key), self.diags[0])
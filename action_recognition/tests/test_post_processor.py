@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+from ..analysis import PostProcessor
+from ..tracker import Track
+
+
+def _loop_combine_tracks(processor, tracks):
+    # The original _combine_tracks, which compares every pair of tracks.
+    i = 0
+    while i < len(tracks):
+        have_removed = False
+        end_track = tracks[i]
+        j = i
+        while j < len(tracks):
+            start_track = tracks[j]
+            if i != j and (end_track.overlaps(start_track) or
+                           processor._paths_nearby(end_track, start_track)):
+                end_track.combine(start_track)
+                end_track.fill_missing_keypoints()
+                tracks.remove(start_track)
+                have_removed = True
+            else:
+                j += 1
+        if not have_removed:
+            i += 1
+
+
+class TestPostProcessor(unittest.TestCase):
+
+    def _fragments(self, random_state):
+        #   The tracks of a few people walking slowly, broken into fragments
+        # that follow each other with gaps around 15 frames, so that some of
+        # them nearly touch, and that sometimes overlap.  Some people are
+        # close enough to each other to be combined as well.
+        fragments = []
+        for _ in range(random_state.randint(1, 5)):
+            position = random_state.uniform(0, 100 if random_state.rand() < 0.5 else 1000,
+                                            size=(18, 2))
+            velocity = random_state.uniform(-1, 1, size=(18, 2))
+            frame = random_state.randint(0, 50)
+            for _ in range(random_state.randint(1, 8)):
+                length = random_state.randint(1, 20)
+                frames = frame + np.cumsum(random_state.randint(1, 3, size=length))
+                keypoints = np.zeros((length, 18, 3))
+                keypoints[:, :, :2] = position + velocity * frames[:, np.newaxis, np.newaxis]
+                keypoints[:, :, :2] += random_state.normal(scale=3, size=(length, 18, 2))
+                keypoints[:, :, 2] = random_state.uniform(size=(length, 18))
+                keypoints[random_state.rand(length, 18) < 0.2] = 0
+                fragments.append((keypoints, frames))
+
+                frame = frames[-1] + random_state.randint(-10, 25)
+
+        order = random_state.permutation(len(fragments))
+        return [fragments[i] for i in order]
+
+    def test_combine_tracks_like_loop(self):
+        random_state = np.random.RandomState(0)
+        processor = PostProcessor()
+        number_combined = 0
+        for _ in range(200):
+            fragments = self._fragments(random_state)
+            tracks = [Track.from_np(keypoints, frames) for keypoints, frames in fragments]
+            loop_tracks = [Track.from_np(keypoints, frames) for keypoints, frames in fragments]
+
+            processor._combine_tracks(tracks)
+            _loop_combine_tracks(processor, loop_tracks)
+
+            self.assertEqual(len(tracks), len(loop_tracks))
+            for track, loop_track in zip(tracks, loop_tracks):
+                keypoints, frames = track.to_np()
+                loop_keypoints, loop_frames = loop_track.to_np()
+                np.testing.assert_array_equal(frames, loop_frames)
+                np.testing.assert_array_equal(keypoints, loop_keypoints)
+
+            number_combined += len(fragments) - len(tracks)
+
+        # Make sure that the fragments are combined often enough to matter.
+        self.assertGreater(number_combined, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import pickle
+import numpy as np
+from sklearn.base import clone
+from sklearn.pipeline import Pipeline
+from ..transforms import SharedResults, Shared, ExtractKeypoints, SmoothChunks, \
+    TranslateChunks, SlicedWasserstein
+
+
+class TestSharedResults(unittest.TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.chunks = random_state.uniform(size=(4, 20, 18, 3))
+        self.other_chunks = random_state.uniform(size=(2, 20, 18, 3))
+        self.results = SharedResults()
+
+    def _pipeline(self, selected_keypoints=[1, 4, 7]):
+        return Pipeline([
+            ("Extract", Shared(ExtractKeypoints(selected_keypoints), self.results)),
+            ("Smoothing", Shared(SmoothChunks(), self.results)),
+            ("Translate", Shared(TranslateChunks(), self.results))
+        ])
+
+    def test_same_data(self):
+        pipeline = self._pipeline()
+        other_pipeline = self._pipeline()
+        result = pipeline.fit_transform(self.chunks)
+        self.assertIs(other_pipeline.fit_transform(self.chunks), result)
+        self.assertEqual(len(self.results), 3)
+
+        self.results.clear()
+        result = pipeline.transform(self.other_chunks)
+        self.assertEqual((self.results.hits, self.results.misses), (0, 3))
+        other_result = other_pipeline.transform(self.other_chunks)
+        self.assertEqual((self.results.hits, self.results.misses), (3, 3))
+
+        self.assertIs(other_result, result)
+        expected = TranslateChunks().transform(SmoothChunks().transform(
+            ExtractKeypoints([1, 4, 7]).transform(self.other_chunks)))
+        np.testing.assert_array_equal(result, expected)
+
+    def test_different_data(self):
+        pipeline = self._pipeline()
+        other_pipeline = self._pipeline([1, 4, 8])
+        pipeline.fit_transform(self.chunks)
+        other_pipeline.fit_transform(self.chunks)
+        # Only the extraction is different, which changes the data of the others.
+        self.assertEqual(len(self.results), 6)
+        self.assertEqual(self.results.hits, 0)
+
+        pipeline.transform(self.other_chunks)
+        pipeline.transform(np.copy(self.other_chunks))
+        self.assertEqual(self.results.hits, 0)
+
+        # Fitted to other data.
+        other_pipeline.set_params(Extract__transformer__selected_keypoints=[1, 4, 7])
+        other_pipeline.fit(np.copy(self.chunks))
+        other_pipeline.transform(self.other_chunks)
+        self.assertEqual(self.results.hits, 0)
+
+    def test_ignored_parameters(self):
+        sliced_wasserstein = SlicedWasserstein(n_jobs=1)
+        other_sliced_wasserstein = SlicedWasserstein(n_jobs=4)
+        self.assertEqual(self.results.key(sliced_wasserstein, 'key', self.chunks),
+                         self.results.key(other_sliced_wasserstein, 'key', self.chunks))
+        self.assertNotEqual(self.results.key(sliced_wasserstein, 'key', self.chunks),
+                            self.results.key(SlicedWasserstein(bandwidth=0.5), 'key', self.chunks))
+
+    def test_clone(self):
+        shared = Shared(SmoothChunks(), self.results)
+        self.assertIs(clone(shared).results, self.results)
+        self.assertIs(clone(self._pipeline()).steps[0][1].results, self.results)
+
+    def test_pickle(self):
+        pipeline = self._pipeline().fit(self.chunks)
+        pipeline.transform(self.chunks)
+
+        pipeline = pickle.loads(pickle.dumps(pipeline))
+        results = pipeline.steps[0][1].results
+        self.assertIsNot(results, self.results)
+        self.assertEqual(len(results), 0)
+        self.assertEqual((results.hits, results.misses), (0, 0))
+        np.testing.assert_array_equal(pipeline.transform(self.chunks),
+                                      self._pipeline().fit(self.chunks).transform(self.chunks))
@@ -0,0 +1,136 @@
+import unittest
+import tempfile
+import os
+import numpy as np
+from sklearn.svm import SVC
+from ..transforms import SlicedWasserstein, GramMatrixFile
+
+
+def naive_sliced_wasserstein(diagrams, other_diagrams, num_directions, bandwidth):
+    # The kernel as sklearn_tda calculates it, one pair of diagrams at a time.
+    angles = np.linspace(-np.pi / 2, np.pi / 2, num=num_directions + 1)[:-1]
+    lines = np.array([np.cos(angles), np.sin(angles)])
+    diagonal = 0.5 * np.ones((2, 2))
+
+    kernel = np.empty((len(diagrams), len(other_diagrams)))
+    for i, diagram in enumerate(diagrams):
+        for j, other_diagram in enumerate(other_diagrams):
+            diagram = np.reshape(diagram, (-1, 2))
+            other_diagram = np.reshape(other_diagram, (-1, 2))
+            points = np.concatenate((diagram, np.dot(other_diagram, diagonal)))
+            other_points = np.concatenate((other_diagram, np.dot(diagram, diagonal)))
+            projection = np.sort(np.dot(points, lines), axis=0)
+            other_projection = np.sort(np.dot(other_points, lines), axis=0)
+            distance = np.sum(np.abs(projection - other_projection), axis=0).mean()
+            kernel[i, j] = np.exp(-distance / (2 * bandwidth * bandwidth))
+
+    return kernel
+
+
+class TestSlicedWasserstein(unittest.TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.diagrams = []
+        for n_points in [5, 1, 0, 12, 3, 7, 0, 2]:
+            births = random_state.uniform(0, 1, size=n_points)
+            deaths = births + random_state.uniform(0, 1, size=n_points)
+            self.diagrams.append(np.column_stack((births, deaths)))
+
+        self.other_diagrams = [self.diagrams[3], np.empty((0, 2)), np.array([[0.1, 0.9]])]
+
+    def test_fit_transform(self):
+        sliced_wasserstein = SlicedWasserstein(num_directions=7, bandwidth=0.6)
+        kernel = sliced_wasserstein.fit_transform(self.diagrams)
+
+        expected = naive_sliced_wasserstein(self.diagrams, self.diagrams, 7, 0.6)
+        np.testing.assert_allclose(kernel, expected, rtol=1e-12)
+        np.testing.assert_array_equal(kernel, kernel.T)
+        np.testing.assert_array_equal(np.diag(kernel), 1)
+
+    def test_transform(self):
+        sliced_wasserstein = SlicedWasserstein(num_directions=7, bandwidth=0.6)
+        kernel = sliced_wasserstein.fit(self.diagrams).transform(self.other_diagrams)
+
+        expected = naive_sliced_wasserstein(self.other_diagrams, self.diagrams, 7, 0.6)
+        self.assertEqual(kernel.shape, (3, len(self.diagrams)))
+        np.testing.assert_allclose(kernel, expected, rtol=1e-12)
+
+    def test_transform_in_blocks(self):
+        sliced_wasserstein = SlicedWasserstein(num_directions=7, bandwidth=0.6)
+        # Only a few diagrams are compared at a time.
+        sliced_wasserstein._block_elements = 200
+        kernel = sliced_wasserstein.fit(self.diagrams).transform(self.other_diagrams)
+
+        expected = naive_sliced_wasserstein(self.other_diagrams, self.diagrams, 7, 0.6)
+        np.testing.assert_allclose(kernel, expected, rtol=1e-12)
+
+    def test_fit_transform_in_tiles(self):
+        expected = SlicedWasserstein(num_directions=7, bandwidth=0.6).fit_transform(self.diagrams)
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            gram_file = os.path.join(out_dir, 'gram')
+            for n_jobs in [1, 2]:
+                sliced_wasserstein = SlicedWasserstein(num_directions=7, bandwidth=0.6,
+                                                       gram_file=gram_file, tile_size=3,
+                                                       n_jobs=n_jobs)
+                kernel = sliced_wasserstein.fit_transform(self.diagrams[::-1])
+                kernel = sliced_wasserstein.fit_transform(self.diagrams)
+
+                self.assertEqual(kernel.dtype, np.float32)
+                np.testing.assert_allclose(kernel, expected, rtol=1e-6)
+                np.testing.assert_array_equal(kernel, kernel.T)
+
+    def test_resume_tiles(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            gram_file = os.path.join(out_dir, 'gram')
+            sliced_wasserstein = SlicedWasserstein(num_directions=7, bandwidth=0.6,
+                                                   gram_file=gram_file, tile_size=3)
+            expected = np.array(sliced_wasserstein.fit_transform(self.diagrams))
+
+            #  Overwrite two of the tiles, one of which is marked as not
+            # complete, as if it was interrupted.
+            gram = GramMatrixFile(gram_file, len(self.diagrams), sliced_wasserstein._key(),
+                                  tile_size=3)
+            gram.write_tile(0, 1, np.full((3, 3), -1))
+            gram.write_tile(1, 2, np.full((3, 2), -1))
+            done = gram._done('r+')
+            done[1, 2] = 0
+            done.flush()
+            del done
+
+            kernel = sliced_wasserstein.fit_transform(self.diagrams)
+            # Only the tile that is not complete is calculated again.
+            np.testing.assert_array_equal(kernel[0:3, 3:6], -1)
+            np.testing.assert_array_equal(kernel[3:6, 6:], expected[3:6, 6:])
+            np.testing.assert_array_equal(kernel[6:, 3:6], expected[6:, 3:6])
+            self.assertEqual(gram.missing_tiles(), [])
+
+    def test_empty(self):
+        sliced_wasserstein = SlicedWasserstein()
+        self.assertEqual(sliced_wasserstein.fit_transform([]).shape, (0, 0))
+        self.assertEqual(sliced_wasserstein.transform(self.other_diagrams).shape, (3, 0))
+
+    def test_keep_fitted_diagrams(self):
+        random_state = np.random.RandomState(1)
+        diagrams = []
+        labels = np.arange(60) % 3
+        for label in labels:
+            births = random_state.uniform(0, 1, size=4)
+            deaths = births + random_state.uniform(0, 0.2, size=4) + 0.3 * label
+            diagrams.append(np.column_stack((births, deaths)))
+
+        sliced_wasserstein = SlicedWasserstein(num_directions=7, bandwidth=0.6)
+        svc = SVC(kernel='precomputed', probability=True, random_state=0)
+        svc.fit(sliced_wasserstein.fit_transform(diagrams[:45]), labels[:45])
+        probabilities = svc.predict_proba(sliced_wasserstein.transform(diagrams[45:]))
+        self.assertLess(len(svc.support_), 45)
+
+        sliced_wasserstein.keep_fitted_diagrams(svc.support_)
+        kernel = sliced_wasserstein.transform(diagrams[45:])
+        self.assertEqual(kernel.shape, (15, 45))
+        np.testing.assert_array_equal(svc.predict_proba(kernel), probabilities)
+
+        removed = np.setdiff1d(np.arange(45), svc.support_)[:1]
+        with self.assertRaises(ValueError):
+            sliced_wasserstein.keep_fitted_diagrams(np.concatenate((svc.support_, removed)))
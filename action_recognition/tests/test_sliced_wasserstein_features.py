@@ -0,0 +1,32 @@
+import unittest
+import numpy as np
+from ..transforms import SlicedWasserstein, SlicedWassersteinFeatures
+
+
+class TestSlicedWassersteinFeatures(unittest.TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.diagrams = []
+        for n_points in [5, 1, 0, 12, 3, 7, 0, 2]:
+            births = random_state.uniform(0, 1, size=n_points)
+            deaths = births + random_state.uniform(0, 1, size=n_points)
+            self.diagrams.append(np.column_stack((births, deaths)))
+
+    def test_approximates_kernel(self):
+        kernel = SlicedWasserstein(num_directions=10, bandwidth=0.6).fit_transform(self.diagrams)
+        features = SlicedWassersteinFeatures(num_directions=10, bandwidth=0.6,
+                                             n_components=2000, random_state=0)
+        features = features.fit_transform(self.diagrams)
+
+        self.assertEqual(features.shape, (len(self.diagrams), 2000))
+        error = np.abs(np.dot(features, features.T) - kernel)
+        self.assertLess(error.mean(), 0.05)
+        self.assertLess(error.max(), 0.15)
+
+    def test_random_state(self):
+        features = SlicedWassersteinFeatures(n_components=100, random_state=0)
+        other_features = SlicedWassersteinFeatures(n_components=100, random_state=0)
+
+        np.testing.assert_array_equal(features.fit_transform(self.diagrams),
+                                      other_features.fit_transform(self.diagrams))
@@ -2,6 +2,7 @@ import unittest
 import numpy as np
 from ..tracker import Track, Person
 from ..util import COCOKeypoints
+from .loop_track import LoopTrack
 
 
 class TestTrack(unittest.TestCase):
@@ -69,6 +70,86 @@ class TestTrack(unittest.TestCase):
         ]
         np.testing.assert_array_equal(keypoint_path, manual_path)
 
+    def test_array_storage(self):
+        track = Track()
+        for i in range(20):
+            track.add_person(self.people[i % len(self.people)], i)
+
+        keypoints, frames = track.to_np()
+        manual_keypoints = [self.people[i % len(self.people)].keypoints for i in range(20)]
+        np.testing.assert_array_equal(keypoints, manual_keypoints)
+        np.testing.assert_array_equal(frames, np.arange(20))
+
+        # People from the track refer to the keypoints stored in the track
+        track[3].fill_missing_keypoints(track[2])
+        np.testing.assert_array_equal(track[3].keypoints, track[2].keypoints)
+        track.reset_keypoints()
+        np.testing.assert_array_equal(track[3].keypoints, self.people[3].keypoints)
+
+        copied_track = Track.from_np(keypoints, frames)
+        np.testing.assert_array_equal(copied_track.to_np()[0], keypoints)
+        self.assertEqual(copied_track.last_frame_update, 19)
+
+    def test_divide_into_chunks(self):
+        keypoints = np.random.RandomState(0).rand(23, 18, 3)
+        track = Track.from_np(keypoints, np.arange(23))
+
+        chunks, frames = track.divide_into_chunks(10, 4)
+        self.assertEqual(chunks.shape, (3, 10, 18, 3))
+        for i, start in enumerate([0, 6, 12]):
+            np.testing.assert_array_equal(chunks[i], keypoints[start:start + 10])
+            np.testing.assert_array_equal(frames[i], np.arange(start, start + 10))
+
+        last_chunk, last_frames = track.last_chunk(10, 4)
+        np.testing.assert_array_equal(last_chunk, chunks[-1])
+        np.testing.assert_array_equal(last_frames, frames[-1])
+
+        chunks, frames = track.divide_into_chunks(23)
+        self.assertEqual(len(chunks), 0)
+        self.assertEqual(len(track.last_chunk(23)[0]), 0)
+
+    def test_divide_into_chunks_like_loop(self):
+        random_state = np.random.RandomState(0)
+        for _ in range(200):
+            keypoints, frames = self._random_track(random_state)
+            frames_per_chunk = random_state.randint(1, 12)
+            overlap = random_state.choice([-1, random_state.randint(0, frames_per_chunk)])
+
+            track = Track.from_np(keypoints, frames)
+            loop_track = LoopTrack.from_np(keypoints, frames)
+
+            chunks, chunk_frames = track.divide_into_chunks(frames_per_chunk, overlap)
+            loop_chunks, loop_frames = loop_track.divide_into_chunks(frames_per_chunk, overlap)
+            np.testing.assert_array_equal(chunks, loop_chunks)
+            np.testing.assert_array_equal(chunk_frames, loop_frames)
+
+            last_chunk, last_frames = track.last_chunk(frames_per_chunk, overlap)
+            if len(loop_chunks) > 0:
+                np.testing.assert_array_equal(last_chunk, loop_chunks[-1])
+                np.testing.assert_array_equal(last_frames, loop_frames[-1])
+            else:
+                self.assertEqual(len(last_chunk), 0)
+
+    def test_look_up_frames_like_loop(self):
+        random_state = np.random.RandomState(4)
+        for _ in range(100):
+            keypoints, frames = self._random_track(random_state)
+            track = Track.from_np(keypoints, frames)
+            loop_track = LoopTrack.from_np(keypoints, frames)
+
+            for frame in range(frames[0] - 3, frames[-1] + 3):
+                frames_per_chunk = random_state.randint(1, 12)
+                chunk, chunk_frames = track.chunk_from_frame(frame, frames_per_chunk)
+                loop_chunk, loop_frames = loop_track.chunk_from_frame(frame, frames_per_chunk)
+                np.testing.assert_array_equal(chunk, loop_chunk)
+                np.testing.assert_array_equal(chunk_frames, loop_frames)
+
+                loop_keypoints = loop_track.get_keypoints_at(frame)
+                if loop_keypoints is None:
+                    self.assertIsNone(track.get_keypoints_at(frame))
+                else:
+                    np.testing.assert_array_equal(track.get_keypoints_at(frame), loop_keypoints)
+
     def test_fill_missing_frames(self):
         track = Track()
         track.add_person(self.people[0], 0)
@@ -92,5 +173,106 @@ class TestTrack(unittest.TestCase):
         np.testing.assert_array_equal(keypoint_track, manual_track)
         np.testing.assert_array_equal(track.frame_assigned, [0, 1, 2, 3, 4])
 
+    def test_fill_missing_frames_like_loop(self):
+        random_state = np.random.RandomState(1)
+        for _ in range(200):
+            keypoints, frames = self._random_track(random_state)
+            track = Track.from_np(keypoints, frames)
+            loop_track = LoopTrack.from_np(keypoints, frames)
+
+            track.fill_missing_frames()
+            loop_track.fill_missing_frames()
+            self._assert_same_track(track, loop_track)
+
+    def test_fill_missing_keypoints_like_loop(self):
+        random_state = np.random.RandomState(2)
+        for fill_type in ['copy', 'diff']:
+            for _ in range(200):
+                keypoints, frames = self._random_track(random_state)
+                track = Track.from_np(keypoints, frames)
+                loop_track = LoopTrack.from_np(keypoints, frames)
+
+                track.fill_missing_keypoints(fill_type)
+                loop_track.fill_missing_keypoints(fill_type)
+                self._assert_same_track(track, loop_track)
+
+    def test_combine_like_loop(self):
+        random_state = np.random.RandomState(5)
+        for _ in range(200):
+            #  Tracks that share some frames, where the person of other is
+            # kept, and with predictions at some of the same frames.
+            tracks = [self._random_track(random_state) for _ in range(2)]
+            predictions = [{frame: {'label': i} for frame in random_state.randint(0, 30, size=3)}
+                           for i in range(2)]
+
+            track, other = [Track.from_np(*arrays) for arrays in tracks]
+            loop_track, loop_other = [LoopTrack.from_np(*arrays) for arrays in tracks]
+            for t, loop_t, prediction in zip([track, other], [loop_track, loop_other],
+                                             predictions):
+                t.predictions = dict(prediction)
+                loop_t.predictions = dict(prediction)
+
+            track.combine(other)
+            loop_track.combine(loop_other)
+            self._assert_same_track(track, loop_track)
+            self.assertEqual(track.predictions, loop_track.predictions)
+            self.assertEqual(track.last_frame_update, loop_track.frame_assigned[-1])
+
+    def test_remove_frame_duplicates_like_loop(self):
+        random_state = np.random.RandomState(6)
+        for _ in range(200):
+            keypoints, frames = self._random_track(random_state)
+            frames = np.sort(random_state.randint(0, 20, size=len(frames)))
+            track = Track.from_np(keypoints, frames)
+            loop_track = LoopTrack.from_np(keypoints, frames)
+
+            track.remove_frame_duplicates()
+            loop_track.remove_frame_duplicates()
+            self._assert_same_track(track, loop_track)
+
+    def test_overlaps_like_loop(self):
+        random_state = np.random.RandomState(3)
+        number_overlapping = 0
+        for _ in range(500):
+            #  Two tracks of the same person, with frames that interleave, and
+            # noise that sometimes takes them apart.
+            position = random_state.uniform(1, 100, size=(18, 3))
+            tracks = []
+            for _ in range(2):
+                keypoints, frames = self._random_track(random_state)
+                noise = random_state.choice([1, 10, 30])
+                keypoints = np.where(keypoints != 0, position, 0)
+                keypoints += (keypoints != 0) * random_state.normal(scale=noise,
+                                                                    size=keypoints.shape)
+                tracks.append((keypoints, frames))
+
+            track, other = [Track.from_np(*arrays) for arrays in tracks]
+            loop_track, loop_other = [LoopTrack.from_np(*arrays) for arrays in tracks]
+
+            overlaps = track.overlaps(other)
+            self.assertEqual(overlaps, loop_track.overlaps(loop_other))
+            self.assertEqual(other.overlaps(track), loop_other.overlaps(loop_track))
+            number_overlapping += overlaps
+
+        # Make sure that both results are tested.
+        self.assertGreater(number_overlapping, 50)
+        self.assertLess(number_overlapping, 450)
+
+    def _random_track(self, random_state, max_length=40):
+        #   Random keypoints where some keypoints and some people are
+        # unidentified, at increasing frames with random gaps between them.
+        length = random_state.randint(1, max_length)
+        keypoints = random_state.randint(1, 100, size=(length, 18, 3)).astype(np.float64)
+        keypoints[random_state.rand(length, 18) < 0.3] = 0
+        keypoints[random_state.rand(length) < 0.1] = 0
+        frames = np.cumsum(random_state.randint(1, 5, size=length)) + random_state.randint(0, 20)
+        return keypoints, frames
+
+    def _assert_same_track(self, track, loop_track):
+        keypoints, frames = track.to_np()
+        loop_keypoints, loop_frames = loop_track.to_np()
+        np.testing.assert_array_equal(keypoints, loop_keypoints)
+        np.testing.assert_array_equal(frames, loop_frames)
+
 if __name__ == '__main__':
     unittest.main()
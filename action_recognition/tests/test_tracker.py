@@ -1,6 +1,11 @@
 import unittest
+import tempfile
+import os
 import numpy as np
-from ..tracker import Tracker, Person, TrackVisualiser, Track
+from ..tracker import Tracker, Person, TrackVisualiser, Track, RetiredTracks
+from ..detector import DetectionCache, RecordingDetector, ReplayDetector
+from ..util import load_tracks
+from .fake_detector import FakeDetector, write_video
 
 
 class TestTracker(unittest.TestCase):
@@ -34,6 +39,28 @@ class TestTracker(unittest.TestCase):
         assignments, _, _ = self.tracker._find_assignments(self.people, self.people, 0)
         self.assertListEqual(list(assignments[0]), list(assignments[1]))
 
+    def test_distance_matrix(self):
+        people = self.people + [self.mostly_zero_person] + self.far_away_people
+        prev_people = list(reversed(people))
+
+        distances = self.tracker._distance_matrix(people, prev_people)
+
+        manual_distances = [[self._norm_distance(person, prev_person) for person in people]
+                            for prev_person in prev_people]
+        np.testing.assert_allclose(distances, manual_distances, rtol=1e-12)
+        # The person without any identified keypoints gets the sentinel distance
+        self.assertTrue(np.all(distances[:, 3] == 10000000))
+        self.assertEqual(self.tracker._distance_matrix(people, []).shape, (0, len(people)))
+
+    def _norm_distance(self, person, other_person):
+        # The distance as Person.distance originally calculated it, with np.linalg.norm.
+        first, second = person.keypoints[:, :2], other_person.keypoints[:, :2]
+        first, second = first[np.nonzero(first)], second[np.nonzero(first)]
+        first, second = first[np.nonzero(second)], second[np.nonzero(second)]
+        if first.size == 0:
+            return 10000000
+        return np.linalg.norm(first - second) / first.size
+
     def test_update_tracks(self):
         other_people_order = [self.people[2], self.people[1],
                               self.people[3], self.people[0], self.far_away_person]
@@ -66,5 +93,175 @@ class TestTracker(unittest.TestCase):
                                 for person in track)
                             for track in self.tracker.tracks))
 
+    def test_gated_assignment(self):
+        for seed in range(5):
+            sequence = self._walking_people(seed)
+
+            iterative_tracks = self._track_sequence(Tracker(detector=None), sequence)
+            gated_tracks = self._track_sequence(
+                Tracker(detector=None, gated_assignment=True), sequence)
+
+            self.assertListEqual(iterative_tracks, gated_tracks)
+
+    def test_gated_assignment_rejects_far_movement(self):
+        tracker = Tracker(detector=None, gated_assignment=True)
+        tracks = self._track_sequence(tracker, [self.people, [self.far_away_person]])
+
+        self.assertEqual(tracks[1], [len(self.people)])
+        self.assertEqual(len(tracker.tracks), len(self.people) + 1)
+
+    def test_retire_tracks(self):
+        sequence = self._walking_people(0)
+        #  Move everyone far away halfway through, so that the first tracks
+        # are no longer updated.
+        sequence = sequence[:30] + [[Person(np.where(p.keypoints != 0, p.keypoints + 5000, 0))
+                                     for p in people]
+                                    for people in sequence[30:]]
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            tracker = Tracker(detector=None, out_dir=os.path.join(out_dir, 'all'))
+            self._track_sequence(tracker, sequence)
+            tracker._save_tracks('video.avi')
+
+            retiring_tracker = Tracker(detector=None, out_dir=os.path.join(out_dir, 'retired'),
+                                       retire_after=10)
+            retiring_tracker.retired_tracks = RetiredTracks(
+                retiring_tracker._tracks_file('video.avi'), spill_after=2)
+            self._track_sequence(retiring_tracker, sequence)
+
+            self.assertEqual(len(retiring_tracker.tracks), len(tracker.tracks))
+            self.assertLess(len(retiring_tracker.active_tracks), len(tracker.tracks))
+            self.assertGreater(len(retiring_tracker.retired_tracks.part_files), 0)
+
+            retiring_tracker._save_tracks('video.avi')
+            part_files = retiring_tracker.retired_tracks.part_files
+            self.assertListEqual(sorted(os.listdir(retiring_tracker.out_dir)),
+                                 sorted(['video-tracks.npz'] +
+                                        [os.path.basename(f) for f in part_files]))
+
+            # The spilled tracks are only in the parts.
+            retired_file = os.path.join(retiring_tracker.out_dir, 'video-tracks.npz')
+            self.assertEqual(len(np.load(retired_file, allow_pickle=True)['tracks']),
+                             len(tracker.tracks) - 2 * len(part_files))
+
+            tracks, frames = load_tracks(os.path.join(tracker.out_dir, 'video-tracks.npz'))
+            retired_tracks, retired_frames = load_tracks(retired_file)
+            self.assertEqual(len(tracks), len(retired_tracks))
+            for track, retired_track in zip(tracks, retired_tracks):
+                np.testing.assert_array_equal(track, retired_track)
+            for track_frames, track_retired_frames in zip(frames, retired_frames):
+                np.testing.assert_array_equal(track_frames, track_retired_frames)
+
+    def test_pipelined_video(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            video = os.path.join(out_dir, 'video.avi')
+            write_video(video, 40)
+
+            results = []
+            for pipelined in [False, True]:
+                tracker = Tracker(FakeDetector(), out_dir=os.path.join(out_dir, str(pipelined)),
+                                  pipelined=pipelined, queue_size=2)
+                yielded_frames = [(current_frame, tracker.detector.frame_number(img), len(tracks))
+                                  for tracks, img, current_frame
+                                  in tracker.video_generator(video, False)]
+                results.append((yielded_frames, [t.to_np() for t in tracker.tracks]))
+
+            (frames, tracks), (pipelined_frames, pipelined_tracks) = results
+            self.assertListEqual(frames, pipelined_frames)
+            self.assertListEqual([f for f, _, _ in frames], list(range(11, 40)))
+            self.assertEqual(len(tracks), len(pipelined_tracks))
+            for (path, path_frames), (pipelined_path, pipelined_path_frames) in \
+                    zip(tracks, pipelined_tracks):
+                np.testing.assert_array_equal(path, pipelined_path)
+                np.testing.assert_array_equal(path_frames, pipelined_path_frames)
+
+            statistics = tracker.pipeline.statistics()
+            self.assertListEqual(sorted(statistics), ['decoded', 'detected', 'tracked'])
+            self.assertTrue(all(s['max_depth'] <= 2 for s in statistics.values()))
+
+    def test_batched_detection(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            video = os.path.join(out_dir, 'video.avi')
+            write_video(video, 30)
+
+            tracker = Tracker(FakeDetector(), out_dir=os.path.join(out_dir, 'single'))
+            tracker.video(video, False)
+            batched_tracker = Tracker(FakeDetector(), out_dir=os.path.join(out_dir, 'batched'),
+                                      batch_size=4)
+            batched_tracker.video(video, False)
+
+            self.assertEqual(batched_tracker.detector.detect_batch_calls, 8)
+            self.assertEqual(batched_tracker.detector.detect_calls, 0)
+            self.assertEqual(len(tracker.tracks), len(batched_tracker.tracks))
+            for track, batched_track in zip(tracker.tracks, batched_tracker.tracks):
+                np.testing.assert_array_equal(track.to_np()[0], batched_track.to_np()[0])
+                np.testing.assert_array_equal(track.to_np()[1], batched_track.to_np()[1])
+
+    def test_replay_detections(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            video = os.path.join(out_dir, 'video.avi')
+            write_video(video, 30)
+            cache_file = os.path.join(out_dir, 'detections.bin')
+
+            cache = DetectionCache(cache_file)
+            tracker = Tracker(RecordingDetector(FakeDetector(), cache, video),
+                              out_dir=os.path.join(out_dir, 'recorded'), batch_size=4)
+            tracker.video(video, False)
+            cache.close()
+
+            #  Write part of a record, as if the recording was interrupted,
+            # which should be ignored.
+            with open(cache_file, 'ab') as f:
+                f.write(b'K1234')
+
+            cache = DetectionCache(cache_file)
+            self.assertEqual(cache.number_of_frames(video), 30)
+            self.assertNotIn((video, 30), cache)
+            replay_tracker = Tracker(ReplayDetector(cache, video),
+                                     out_dir=os.path.join(out_dir, 'replayed'))
+            replay_tracker.video(video, False)
+            cache.close()
+
+            self.assertEqual(len(tracker.tracks), len(replay_tracker.tracks))
+            for track, replayed_track in zip(tracker.tracks, replay_tracker.tracks):
+                np.testing.assert_array_equal(track.to_np()[0], replayed_track.to_np()[0])
+                np.testing.assert_array_equal(track.to_np()[1], replayed_track.to_np()[1])
+
+    def _walking_people(self, seed, n_frames=60, n_people=4):
+        # People walking in straight lines, who are sometimes not detected
+        # and are missing some keypoints
+        random = np.random.RandomState(seed)
+        starts = random.uniform(0, 1000, size=(n_people, 1, 2))
+        velocities = random.uniform(-3, 3, size=(n_people, 1, 2))
+        shapes = random.uniform(-40, 40, size=(n_people, 18, 2))
+
+        sequence = []
+        for frame in range(n_frames):
+            people = []
+            for i in range(n_people):
+                if random.rand() < 0.1:
+                    continue
+                keypoints = np.zeros((18, 3))
+                keypoints[:, :2] = starts[i] + velocities[i] * frame + shapes[i] + \
+                    random.normal(0, 1, size=(18, 2))
+                keypoints[:, 2] = random.uniform(0.3, 1, size=18)
+                keypoints[random.rand(18) < 0.2] = 0
+                people.append(Person(keypoints))
+            random.shuffle(people)
+            sequence.append(people)
+
+        return sequence
+
+    def _track_sequence(self, tracker, sequence):
+        track_indicies = []
+        for frame, people in enumerate(sequence):
+            people = [Person(p.keypoints) for p in people]
+            tracker._retire_tracks(frame)
+            track_endpoints = tracker._track_endpoints(frame)
+            people = tracker._track_people(people, track_endpoints, frame)
+            track_indicies.append(sorted(p.track_index for p in people))
+
+        return track_indicies
+
 if __name__ == '__main__':
     unittest.main()
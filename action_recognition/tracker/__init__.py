@@ -12,3 +12,4 @@ from .tracker import Tracker
 from .person import Person
 from .track_visualiser import TrackVisualiser
 from .track import Track
+from .retired_tracks import RetiredTracks
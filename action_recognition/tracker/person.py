@@ -3,6 +3,107 @@ import numpy as np
 from ..util import COCOKeypoints, coco_connections
 
 
+def keypoint_distances(keypoints, other_keypoints):
+    """Calculates the distances between people represented by their keypoints.
+
+    Works on stacked keypoints and broadcasts over every dimension but the
+    last two, e.g. keypoints of shape [n_people, 1, n_keypoints, 3] and
+    [1, n_other_people, n_keypoints, 3] gives every pairwise distance at once.
+    Person.distance() uses the same calculation, so the distances are
+    identical to calling it for every pair.
+
+    Disregards keypoints that are zero (i.e. not identified by the detector)
+    in any of the persons.  If there are no keypoints that are not
+    zero for both of the persons, a distance of 10000000 is returned.
+
+    Parameters
+    ----------
+    keypoints : array-like
+        shape = [..., n_keypoints, 3]
+    other_keypoints : array-like
+        shape = [..., n_keypoints, 3], must be broadcastable with keypoints.
+
+    Returns
+    -------
+    distances : array-like
+        shape = the broadcasted shape of [...]
+
+    """
+    # Disregard the confidence for now.
+    xy_person = np.asarray(keypoints)[..., :2]
+    xy_other = np.asarray(other_keypoints)[..., :2]
+
+    #   Don't include the keypoints we didn't identify
+    # as this can give large frame-to-frame errors.
+    identified = (xy_person != 0) & (xy_other != 0)
+    diff = np.where(identified, xy_person - xy_other, 0)
+
+    # Flatten the keypoints so every distance is summed in the same order.
+    flat_shape = diff.shape[:-2] + (diff.shape[-2] * diff.shape[-1],)
+    squared_distance = np.square(diff).reshape(flat_shape).sum(axis=-1)
+    number_identified = identified.reshape(flat_shape).sum(axis=-1)
+
+    # Calculate average distance between the people
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distances = np.sqrt(squared_distance) / number_identified
+
+    # np.inf, but np.inf doesn't play nice with scipy.optimize
+    distances = np.where(number_identified > 0, distances, 10000000)
+    return distances[()]
+
+
+# The keypoints that a missing keypoint can be filled from, for every keypoint.
+# Keypoints in the downwards direction (e.g. shoulder - elbow) are tried
+# before keypoints in the upwards direction (e.g. elbow - shoulder).
+fill_connections = [[from_ for from_, to in coco_connections if to == i] +
+                    [to for from_, to in coco_connections if from_ == i]
+                    for i in range(COCOKeypoints.Background.value)]
+
+
+def fill_keypoints(keypoints, identified, other_keypoints, other_identified, fill_type='copy'):
+    """Fills missing keypoints of a person in place, from the keypoints of another.
+
+    Gives the same result as Person.fill_missing_keypoints, see it for the
+    fill types.  Works on the keypoint arrays together with masks of the
+    keypoints that are identified (i.e. not zero), so that the masks of
+    a whole track can be calculated at once.
+
+    Parameters
+    ----------
+    keypoints : array-like
+        shape = [n_keypoints, 3], filled in place.
+    identified : array-like of bool
+        shape = [n_keypoints], updated in place with the filled keypoints.
+    other_keypoints : array-like
+        shape = [n_keypoints, 3]
+    other_identified : array-like of bool
+        shape = [n_keypoints]
+    fill_type : str, optional, default = 'copy'
+        Either 'copy' or 'diff'.
+
+    """
+    if fill_type == 'diff':
+        # Only keypoints that are identified for the other person can be filled.
+        fillable = np.flatnonzero(~identified & other_identified)
+        # If type is diff, we have to try to fill in both directions.
+        for i in np.concatenate((fillable, fillable[::-1])):
+            if identified[i]:
+                continue
+
+            connect_i = next((c for c in fill_connections[i]
+                              if other_identified[c] and identified[c]), -1)
+            if connect_i != -1:
+                diff = other_keypoints[connect_i] - other_keypoints[i]
+                keypoints[i] = keypoints[connect_i] - diff
+                identified[i] = np.any(keypoints[i])
+
+    # Always fill with copy in case we did not find any possible
+    # connections.
+    missing = ~identified
+    keypoints[missing] = other_keypoints[missing]
+    identified |= other_identified
+
+
 class Person:
     """Represents a person by their keypoints.
 
@@ -23,6 +124,34 @@ class Person:
         self.track_index = track_index
         self.og_keypoints = np.copy(keypoints)
 
+    @classmethod
+    def view(cls, keypoints, og_keypoints, track_index=-1):
+        """Creates a person from existing keypoint arrays without copying them.
+
+        Used by Track to give out people that refer to the keypoints stored
+        in the track, so that changes to the person change the track.
+
+        Parameters
+        ----------
+        keypoints : array-like
+            shape = [n_keypoints, 3]
+        og_keypoints : array-like
+            shape = [n_keypoints, 3], the original keypoints of the person.
+        track_index : int, optional
+            The index of the track that the person belongs to, if any.
+
+        Returns
+        -------
+        person : Person
+
+        """
+        person = cls.__new__(cls)
+        person.keypoints = keypoints
+        person.track_index = track_index
+        person.og_keypoints = og_keypoints
+
+        return person
+
     def __eq__(self, other_person):
         return np.array_equal(self.keypoints, other_person.keypoints)
 
@@ -40,22 +169,7 @@ class Person:
             The other person to calculate distance to.
 
         """
-        # Disregard the confidence for now.
-        xy_person = self.keypoints[:, :2]
-        xy_other = other_person.keypoints[:, :2]
-
-        #   Don't include the keypoints we didn't identify
-        # as this can give large frame-to-frame errors.
-        xy_person, xy_other = self._filter_nonzero(xy_person, xy_other)
-
-        if xy_person.size == 0:
-            return 10000000  # np.inf, but np.inf doesn't play nice with scipy.optimize
-
-        # Calculate average distance between the two people
-        distance = np.linalg.norm(xy_person - xy_other)
-        distance = distance / xy_person.size
-
-        return distance
+        return keypoint_distances(self.keypoints, other_person.keypoints)
 
     def _filter_nonzero(self, first, second):
         first, second = first[np.nonzero(first)], second[np.nonzero(first)]
@@ -112,49 +226,8 @@ class Person:
             Either 'copy' or 'diff', as explained above.
 
         """
-        # If type is diff, we have to try to fill in both directions.
-        if fill_type is 'diff':
-            self._fill_diff_loop(enumerate(self.keypoints), other)
-            self._fill_diff_loop(reversed(list(enumerate(self.keypoints))), other)
-
-        # Always fill with copy in case we did not find any possible
-        # connections.
-        for i, k in enumerate(self.keypoints):
-            if not np.any(k):
-                self.keypoints[i] = np.copy(other.keypoints[i])
-
-    def _fill_diff_loop(self, enumerator, other):
-        for i, k in enumerator:
-            if not np.any(k):
-                new_keypoint = self._diff_fill_keypoint(i, other)
-                if new_keypoint is not None:
-                    self.keypoints[i] = new_keypoint
-
-    def _diff_fill_keypoint(self, keypoint_index, other):
-        # Try finding a keypoint in the downwards direction (e.g. shoulder - elbow)
-        connect_downwards = next((from_ for from_, to in coco_connections
-                                  if to == keypoint_index and
-                                  np.any(other.keypoints[from_]) and
-                                  np.any(other.keypoints[to]) and
-                                  np.any(self.keypoints[from_])
-                                  ), -1)
-        # If none found, try the other direction. (e.g. elbow - shoulder)
-        # This may require a reversed iteration through the keypoints as well,
-        # to fill every keypoint.
-        connect_upwards = next((to for from_, to in coco_connections
-                                if from_ == keypoint_index and
-                                np.any(other.keypoints[to]) and
-                                np.any(other.keypoints[from_]) and
-                                np.any(self.keypoints[to])
-                                ), -1)
-        if connect_downwards == -1 and connect_upwards == -1:
-            return None
-
-        # Take the first index which isn't -1.
-        connect_i = [i for i in [connect_downwards, connect_upwards] if i != -1][0]
-
-        diff = other.keypoints[connect_i] - other.keypoints[keypoint_index]
-        return self.keypoints[connect_i] - diff
+        fill_keypoints(self.keypoints, np.any(self.keypoints, axis=1),
+                       other.keypoints, np.any(other.keypoints, axis=1), fill_type)
 
     def interpolate(self, other, steps=1):
         """Returns possible interpolated points between the self and other.
@@ -178,4 +251,4 @@ class Person:
     def reset_keypoints(self):
         """Resets keypoints to the original copy saved at creation.
         """
-        self.keypoints = np.copy(self.og_keypoints)
+        self.keypoints[...] = self.og_keypoints
@@ -0,0 +1,278 @@
+import threading
+import queue
+import logging
+from time import time
+
+
+class StageQueue:
+    """A bounded queue between two stages of a Pipeline.
+
+    Keeps statistics of how many items that wait in the queue, and how long
+    the stages wait on each other.  A stage that waits to put items
+    is faster than the stage after it, and a stage that waits to get items
+    is faster than the stage before it.
+
+    Parameters
+    ----------
+    name : str
+        The name of the queue, e.g. after the items it holds.
+    maxsize : int
+        The number of items the queue can hold before put blocks.
+    stop_event : threading.Event
+        Makes put and get stop waiting when set.
+
+    """
+
+    END = object()
+
+    def __init__(self, name, maxsize, stop_event):
+        self.name = name
+        self.maxsize = maxsize
+        self._queue = queue.Queue(maxsize)
+        self._stop_event = stop_event
+
+        self.number_of_items = 0
+        self.total_depth = 0
+        self.max_depth = 0
+        self.put_wait_time = 0
+        self.get_wait_time = 0
+
+    def put(self, item):
+        """Puts an item in the queue, waiting while the queue is full.
+
+        Parameters
+        ----------
+        item : any object, StageQueue.END marks the end of the stream.
+
+        """
+        start_time = time()
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self.put_wait_time += time() - start_time
+
+    def get(self):
+        """Gets the next item in the queue, waiting while the queue is empty.
+
+        Returns
+        -------
+        item : any object
+            StageQueue.END if the stream has ended or the pipeline was stopped.
+
+        """
+        start_time = time()
+        item = StageQueue.END
+        while not self._stop_event.is_set():
+            try:
+                depth = self._queue.qsize()
+                item = self._queue.get(timeout=0.1)
+                break
+            except queue.Empty:
+                continue
+        self.get_wait_time += time() - start_time
+
+        if item is not StageQueue.END:
+            self.number_of_items += 1
+            self.total_depth += depth
+            self.max_depth = max(self.max_depth, depth)
+
+        return item
+
+    def close(self):
+        """Marks the end of the stream.
+
+        """
+        self.put(StageQueue.END)
+
+    def statistics(self):
+        """Gives the statistics of the queue.
+
+        Returns
+        -------
+        statistics : dict
+            With the current 'depth', the 'average_depth' and 'max_depth'
+            seen by get, and the total 'put_wait_time' and 'get_wait_time'
+            in seconds.
+
+        """
+        average_depth = self.total_depth / max(1, self.number_of_items)
+        return {'depth': self._queue.qsize(),
+                'average_depth': average_depth,
+                'max_depth': self.max_depth,
+                'put_wait_time': self.put_wait_time,
+                'get_wait_time': self.get_wait_time}
+
+
+class Pipeline:
+    """Runs the stages of a stream in separate threads.
+
+    The stages are connected by bounded StageQueues, so that a fast stage
+    can work ahead of a slow stage without using unbounded memory.  Every
+    stage runs in a single thread, which keeps the order of the stream.
+
+    Parameters
+    ----------
+    queue_size : int, optional, default 8
+        The number of items each queue can hold.
+
+    """
+
+    def __init__(self, queue_size=8):
+        self.queue_size = queue_size
+        self.queues = []
+
+        self._threads = []
+        self._errors = []
+        self._stop_event = threading.Event()
+
+    def source(self, name, items):
+        """Adds a stage that puts every item from an iterable in a queue.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage and its output queue.
+        items : iterable
+
+        Returns
+        -------
+        out_queue : StageQueue
+
+        """
+        out_queue = self._create_queue(name)
+
+        def run():
+            for item in items:
+                if self._stop_event.is_set():
+                    break
+                out_queue.put(item)
+            out_queue.close()
+
+        self._start(name, run)
+        return out_queue
+
+    def stage(self, name, function, in_queue):
+        """Adds a stage that applies function to every item in in_queue.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage and its output queue.
+        function : callable, taking an item and returning the transformed item.
+        in_queue : StageQueue
+
+        Returns
+        -------
+        out_queue : StageQueue
+
+        """
+        out_queue = self._create_queue(name)
+
+        def run():
+            item = in_queue.get()
+            while item is not StageQueue.END:
+                out_queue.put(function(item))
+                item = in_queue.get()
+            out_queue.close()
+
+        self._start(name, run)
+        return out_queue
+
+    def sink(self, name, function):
+        """Adds a stage that calls function on every item put in the returned queue.
+
+        The stream of the sink is ended by calling close() on the queue.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage and its input queue.
+        function : callable, taking an item.
+
+        Returns
+        -------
+        in_queue : StageQueue
+
+        """
+        in_queue = self._create_queue(name)
+
+        def run():
+            item = in_queue.get()
+            while item is not StageQueue.END:
+                function(item)
+                item = in_queue.get()
+
+        self._start(name, run)
+        return in_queue
+
+    def results(self, in_queue):
+        """Yields the items of a queue in the calling thread.
+
+        Parameters
+        ----------
+        in_queue : StageQueue
+
+        """
+        item = in_queue.get()
+        while item is not StageQueue.END:
+            yield item
+            item = in_queue.get()
+
+        self._raise_errors()
+
+    def stop(self):
+        """Stops every stage and waits for their threads to finish.
+
+        Does not raise the errors of the stages, as opposed to join().
+
+        """
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join()
+
+    def join(self):
+        """Waits for the threads of every stage to finish.
+
+        """
+        for thread in self._threads:
+            thread.join()
+
+        self._raise_errors()
+
+    def statistics(self):
+        """Gives the statistics of every queue in the pipeline.
+
+        Returns
+        -------
+        statistics : dict
+            The StageQueue.statistics() of each queue, by the name of the queue.
+
+        """
+        return {q.name: q.statistics() for q in self.queues}
+
+    def _create_queue(self, name):
+        stage_queue = StageQueue(name, self.queue_size, self._stop_event)
+        self.queues.append(stage_queue)
+
+        return stage_queue
+
+    def _start(self, name, run):
+        def run_safely():
+            try:
+                run()
+            except Exception as e:
+                logging.error("Stage {} failed: {}".format(name, e))
+                self._errors.append(e)
+                # Make every other stage stop waiting for this one.
+                self._stop_event.set()
+
+        thread = threading.Thread(target=run_safely, name=name, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _raise_errors(self):
+        if self._errors:
+            raise self._errors[0]
@@ -0,0 +1,111 @@
+import numpy as np
+import logging
+
+
+class RetiredTracks:
+    """Stores the tracks that the tracker no longer updates.
+
+    The tracks are stored in their numpy format together with their track
+    index, and can be spilled to disk in parts to keep the memory bounded
+    for long videos.  Each part is a .npz file with the same 'tracks' and
+    'frames' layout as the file produced by Tracker, with an additional
+    'track_indicies' array.
+
+    Parameters
+    ----------
+    spill_file : str, optional
+        Path, without extension, that the parts are saved to, as
+        spill_file + '-part-k.npz'.  If not specified, every track is kept
+        in memory.
+    spill_after : int, optional, default 100
+        The number of tracks kept in memory before they are spilled to disk.
+
+    """
+
+    def __init__(self, spill_file=None, spill_after=100):
+        self.spill_file = spill_file
+        self.spill_after = spill_after
+
+        self.part_files = []
+        self._track_indicies = []
+        self._tracks = []
+        self._frames = []
+        self._number_of_spilled = 0
+
+    def __len__(self):
+        return self._number_of_spilled + len(self._tracks)
+
+    def add(self, track_index, track):
+        """Retires a track.
+
+        Parameters
+        ----------
+        track_index : int
+            The index of the track in the tracker.
+        track : Track
+            The track to retire.
+
+        """
+        keypoints, frames = track.to_np()
+
+        self._track_indicies.append(track_index)
+        self._tracks.append(np.copy(keypoints))
+        self._frames.append(np.copy(frames))
+
+        if self.spill_file is not None and len(self._tracks) >= self.spill_after:
+            self._spill()
+
+    def _spill(self):
+        part_file = '{}-part-{}.npz'.format(self.spill_file, len(self.part_files))
+        logging.debug("Spilling {} retired tracks to {}".format(len(self._tracks), part_file))
+
+        np.savez(part_file, tracks=self._object_array(self._tracks),
+                 frames=self._object_array(self._frames),
+                 track_indicies=np.array(self._track_indicies, dtype=np.int))
+
+        self.part_files.append(part_file)
+        self._number_of_spilled += len(self._tracks)
+        self._track_indicies = []
+        self._tracks = []
+        self._frames = []
+
+    def _object_array(self, arrays):
+        # np.array would create a multidimensional array if the lengths are equal.
+        object_array = np.empty(len(arrays), dtype=object)
+        for i, array in enumerate(arrays):
+            object_array[i] = array
+
+        return object_array
+
+    def to_np(self, include_parts=True):
+        """Gives every retired track, including the ones spilled to disk.
+
+        Parameters
+        ----------
+        include_parts : boolean, optional, default True
+            Specifies if the tracks spilled to disk should be loaded, or
+            only the tracks in memory should be given.
+
+        Returns
+        -------
+        track_indicies : list of int
+        tracks : list of array-like
+            Each of shape = [n_frames, n_keypoints, 3]
+        frames : list of array-like
+            Each of shape = [n_frames]
+
+        """
+        track_indicies = []
+        tracks = []
+        frames = []
+        for part_file in (self.part_files if include_parts else []):
+            part = np.load(part_file, allow_pickle=True)
+            track_indicies.extend(part['track_indicies'])
+            tracks.extend(part['tracks'])
+            frames.extend(part['frames'])
+
+        track_indicies.extend(self._track_indicies)
+        tracks.extend(self._tracks)
+        frames.extend(self._frames)
+
+        return track_indicies, tracks, frames
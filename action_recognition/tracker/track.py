@@ -2,6 +2,8 @@ import numpy as np
 import copy
 import logging
 
+from .person import Person, keypoint_distances, fill_keypoints
+
 
 class Track:
     """The track of a person through a video.
@@ -10,31 +12,135 @@ class Track:
     person was identified at. Also contains a lot of functions that operate on
     the Track for post processing.
 
+    The keypoints are stored in contiguous arrays which grow by doubling their
+    capacity, and the Person objects given out by the track are views into
+    these arrays.  A view is only guaranteed to refer to the track until
+    the track is modified again.
+
     """
 
     def __init__(self):
-        self.track = []
-        self.frame_assigned = []
+        self._keypoints = np.empty((0,), dtype=np.float32)
+        self._og_keypoints = np.empty((0,), dtype=np.float32)
+        self._frames = np.empty((0,), dtype=np.int)
+        self._track_indicies = np.empty((0,), dtype=np.int)
+        self._length = 0
+
         self.last_frame_update = -1
         self.predictions = {}
 
+    @classmethod
+    def from_np(cls, keypoints, frames, track_index=-1):
+        """Creates a track from the numpy format of tracks, as outputted from to_np().
+
+        Parameters
+        ----------
+        keypoints : array-like
+            shape = [n_frames, n_keypoints, 3]
+        frames : array-like
+            shape = [n_frames]
+            The frame number each of the keypoints were identified at.
+        track_index : int, optional
+            The index of the track, given to every Person in the track.
+
+        Returns
+        -------
+        track : Track
+
+        """
+        track = cls()
+        keypoints = np.asarray(keypoints)
+        track._set_arrays(keypoints, np.copy(keypoints), frames,
+                          np.full(len(frames), track_index, dtype=np.int))
+
+        return track
+
+    @property
+    def track(self):
+        """The people of the track, as a list of Person views."""
+        return [self._person_at(i) for i in range(self._length)]
+
+    @property
+    def frame_assigned(self):
+        """The frame numbers the people in the track were identified at."""
+        return self._frames[:self._length]
+
     def __len__(self):
-        return len(self.track)
+        return self._length
 
     def __getitem__(self, item):
-        return self.track[item]
+        if isinstance(item, slice):
+            return [self._person_at(i) for i in range(*item.indices(self._length))]
+
+        if item < 0:
+            item += self._length
+        if item < 0 or item >= self._length:
+            raise IndexError("Track index out of range")
+
+        return self._person_at(item)
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self._person_at(i)
+
+    def _person_at(self, index):
+        return Person.view(self._keypoints[index], self._og_keypoints[index],
+                           self._track_indicies[index])
+
+    def _reserve(self, size, keypoints):
+        #   Keep the precision of floating point keypoints, but store
+        # integer keypoints as floats since they may get interpolated.
+        dtype = np.promote_types(self._keypoints.dtype, keypoints.dtype)
+        if self._length == 0:
+            dtype = np.promote_types(keypoints.dtype, np.float32)
+
+        if len(self._keypoints) >= size and \
+                self._keypoints.dtype == dtype and \
+                self._keypoints.shape[1:] == keypoints.shape:
+            return
+
+        # Double the capacity to get amortized constant time appends.
+        capacity = max(size, 2 * len(self._keypoints), 8)
+        self._keypoints = self._grow(self._keypoints, capacity, keypoints.shape, dtype)
+        self._og_keypoints = self._grow(self._og_keypoints, capacity, keypoints.shape, dtype)
+        self._frames = self._grow(self._frames, capacity, (), np.int)
+        self._track_indicies = self._grow(self._track_indicies, capacity, (), np.int)
+
+    def _grow(self, array, capacity, shape, dtype):
+        new_array = np.zeros((capacity, *shape), dtype=dtype)
+        if self._length > 0:
+            new_array[:self._length] = array[:self._length]
+        return new_array
+
+    def _set_arrays(self, keypoints, og_keypoints, frames, track_indicies):
+        self._length = 0
+        length = len(frames)
+        if length == 0:
+            return
+
+        self._reserve(length, keypoints[0])
+        self._keypoints[:length] = keypoints
+        self._og_keypoints[:length] = og_keypoints
+        self._frames[:length] = frames
+        self._track_indicies[:length] = track_indicies
+        self._length = length
+        self.last_frame_update = self._frames[length - 1]
+
+    def _arrays(self):
+        return (self._keypoints[:self._length], self._og_keypoints[:self._length],
+                self._frames[:self._length], self._track_indicies[:self._length])
 
     def copy(self, number_of_frames):
         new_track = Track()
-        new_track.track = self.track[number_of_frames:]
-        new_track.frame_assigned = self.frame_assigned[number_of_frames:]
-        new_track.last_frame_update = new_track.frame_assigned[-1]
+        new_track._set_arrays(*[np.copy(array[number_of_frames:]) for array in self._arrays()])
 
         return new_track
 
     def add_person(self, person, current_frame):
         """Adds a Person to the track.
 
+        The keypoints of the person are copied into the track.
+
         Parameters
         ----------
         person : Person object
@@ -43,9 +149,16 @@ class Track:
             The frame number the person was identified at.
 
         """
+        keypoints = np.asarray(person.keypoints)
+        self._reserve(self._length + 1, keypoints)
+
+        self._keypoints[self._length] = keypoints
+        self._og_keypoints[self._length] = person.og_keypoints
+        self._frames[self._length] = current_frame
+        self._track_indicies[self._length] = person.track_index
+        self._length += 1
+
         self.last_frame_update = current_frame
-        self.frame_assigned.append(current_frame)
-        self.track.append(person)
 
     def get_last_person(self):
         """Retrieves the last person in the track
@@ -54,7 +167,7 @@ class Track:
         person : Person object
 
         """
-        return self.track[-1]
+        return self[-1]
 
     def get_average_speed_in_window(self, window_size=-1):
         """Gives average distance moved over a window of size window_size.
@@ -71,17 +184,16 @@ class Track:
             The average speed calculated.
         """
         if window_size == -1:
-            window_size = len(self.track)
+            window_size = len(self)
 
-        if len(self.track) < 2:
+        if len(self) < 2:
             return 10
 
-        distance = 0
-        start_index = max(1, len(self.track) - window_size + 1)
-        for i in range(start_index, len(self.track)):
-            distance += self.track[i - 1].distance(self.track[i])
+        start_index = max(1, len(self) - window_size + 1)
+        keypoints = self._keypoints[start_index - 1:self._length]
+        distance = keypoint_distances(keypoints[:-1], keypoints[1:]).sum()
 
-        speed = distance / (len(self.track) - start_index)
+        speed = distance / (len(self) - start_index)
         return speed
 
     def recently_updated(self, current_frame):
@@ -116,9 +228,8 @@ class Track:
         if current_frame == -1:
             current_frame = self.last_frame_update
 
-        return [p[idx][:2] for f, p in zip(self.frame_assigned, self.track)
-                if np.any(p[idx][:2]) and
-                f <= current_frame]
+        path = self._keypoints[:self._length, idx, :2]
+        return path[np.any(path, axis=1) & (self.frame_assigned <= current_frame)]
 
     def get_keypoints_at(self, frame):
         """Returns all keypoints at time frame.
@@ -134,19 +245,25 @@ class Track:
             shape = [n_keypoints, 2]
 
         """
+        keypoints = self._keypoints[:self._length, :, :2]
 
-        path = [k[:, :2] for k, f in zip(self.track, self.frame_assigned)
-                if f <= frame and
-                np.any(k[:, :2])]
+        # Search backwards from the last person at or before the frame.
+        index = np.searchsorted(self.frame_assigned, frame, 'right') - 1
+        while index >= 0 and not np.any(keypoints[index]):
+            index -= 1
 
-        if len(path) > 0:
-            return path[-1]
+        if index >= 0:
+            return keypoints[index]
         else:
             return None
 
     def divide_into_chunks(self, frames_per_chunk, overlap=-1):
         """Divides the track into chunks with overlaps, used for action recognition.
 
+        The chunks are read-only strided views into the keypoints of the
+        track, so no keypoints are copied.  They have to be copied if they
+        are to be modified, or kept while the track is modified.
+
         Parameters
         ----------
         frames_per_chunks : int
@@ -164,29 +281,64 @@ class Track:
             The Frame number of each part of each chunk
 
         """
-        if overlap == -1:
-            overlap = int(frames_per_chunk / 2)
+        number_of_chunks, step = self._number_of_chunks(frames_per_chunk, overlap)
+        if number_of_chunks <= 0:
+            return np.array([]), np.array([])
+
+        keypoints, _, frames, _ = self._arrays()
+        chunks = self._strided_chunks(keypoints, number_of_chunks, frames_per_chunk, step)
+        chunk_frames = self._strided_chunks(frames, number_of_chunks, frames_per_chunk, step)
+
+        return chunks, chunk_frames
+
+    def last_chunk(self, frames_per_chunk, overlap=-1):
+        """Gets the last chunk of divide_into_chunks, without dividing the whole track.
+
+        Parameters
+        ----------
+        frames_per_chunks : int
+            The number of frames each chunk should contain.
+        overlap : int, optional
+            The number of frames the chunks should overlap with.
+            If not specified, half of frames_per_chunk is used.
 
-        number_of_chunks = int((len(self.track) - frames_per_chunk - 1) /
-                               (frames_per_chunk - overlap) + 1)
+        Returns
+        -------
+        chunk : array-like
+            shape = [frames_per_chunk, n_keypoints, 3], or empty if the track
+            is too short for a chunk.  A read-only view into the track.
+        frames : array-like
+            shape = [frames_per_chunk]
 
+        """
+        number_of_chunks, step = self._number_of_chunks(frames_per_chunk, overlap)
         if number_of_chunks <= 0:
             return np.array([]), np.array([])
 
-        keypoint_shape = self.track[0].keypoints.shape
-        chunks = np.zeros((number_of_chunks, frames_per_chunk, *keypoint_shape))
-        frames = np.zeros((number_of_chunks, frames_per_chunk), dtype=np.int)
-        start_index = 0
-        index = 0
-        while start_index + frames_per_chunk < len(self.track):
-            chunk, chunk_frames = self._chunk_from_index(start_index, frames_per_chunk)
+        start_index = (number_of_chunks - 1) * step
+        chunk, frames = self._chunk_from_index(start_index, frames_per_chunk)
+
+        return self._read_only(chunk), self._read_only(frames)
+
+    def _number_of_chunks(self, frames_per_chunk, overlap):
+        if overlap == -1:
+            overlap = int(frames_per_chunk / 2)
+        step = frames_per_chunk - overlap
+
+        # The last frame is never part of a chunk.
+        number_of_chunks = int((len(self) - frames_per_chunk - 1) / step + 1)
 
-            chunks[index] = chunk
-            frames[index] = chunk_frames
-            start_index += frames_per_chunk - overlap
-            index += 1
+        return number_of_chunks, step
 
-        return chunks, frames
+    def _strided_chunks(self, array, number_of_chunks, frames_per_chunk, step):
+        shape = (number_of_chunks, frames_per_chunk) + array.shape[1:]
+        strides = (array.strides[0] * step,) + array.strides
+        return np.lib.stride_tricks.as_strided(array, shape, strides, writeable=False)
+
+    def _read_only(self, array):
+        array = array.view()
+        array.flags.writeable = False
+        return array
 
     def chunk_from_frame(self, start_frame, frames_per_chunk):
         """Gets a chunk from the start_frame with length of frames_per_chunk.
@@ -204,24 +356,28 @@ class Track:
             Chunk of track. Shape = [frames_per_chunk, n_keypoints, 3]
 
         """
-        start_index = 0
-        # Iterate to where the chunk should start
-        while start_index < len(self.frame_assigned) and self.frame_assigned[start_index] < start_frame:
-            start_index += 1
+        # Find where the chunk should start
+        start_index = np.searchsorted(self.frame_assigned, start_frame, 'left')
+
+        chunk, frames = self._chunk_from_index(start_index, frames_per_chunk)
+        if len(frames) == 0:
+            # As the chunks were built from lists of people before.
+            return np.array([]), np.array([])
 
-        return self._chunk_from_index(start_index, frames_per_chunk)
+        return np.copy(chunk), np.copy(frames)
 
     def _chunk_from_index(self, start_index, frames_per_chunk):
-        end_index = start_index + frames_per_chunk
-        chunk = np.array([p.keypoints for p in self.track[start_index:end_index]])
-        frames = np.array(self.frame_assigned[start_index:end_index])
+        # Views into the track, which have to be copied if they are kept.
+        end_index = min(start_index + frames_per_chunk, self._length)
+        chunk = self._keypoints[start_index:end_index]
+        frames = self._frames[start_index:end_index]
         return chunk, frames
 
     def to_np(self):
         """Converts the track into pure numpy arrays.
 
         Needed for saving of the tracks to file in a format
-        that is easy to manage.
+        that is easy to manage.  The arrays share memory with the track.
 
         Returns
         -------
@@ -230,8 +386,8 @@ class Track:
         np_frames : array-like
             Shape = [len(track), 1]
         """
-        np_path = np.array([p.keypoints for p in self.track])
-        np_frames = np.array(self.frame_assigned)
+        np_path = self._keypoints[:self._length]
+        np_frames = self.frame_assigned
 
         return np_path, np_frames
 
@@ -247,36 +403,20 @@ class Track:
             The other track object to combine with this one.
 
         """
-        new_track = []
-        new_frame_assigned = []
-        self_index = 0
-        other_index = 0
-
-        # Join while it's still relevant to consider both lists
-        # Check the frame they were added for the ordering of the
-        # new track
-        while self_index < len(self.track) and other_index < len(other.track):
-            if self.frame_assigned[self_index] < other.frame_assigned[other_index]:
-                new_track.append(self.track[self_index])
-                new_frame_assigned.append(self.frame_assigned[self_index])
-                self_index += 1
-            else:
-                new_track.append(other.track[other_index])
-                new_frame_assigned.append(other.frame_assigned[other_index])
-                other_index += 1
-
-        # Add the entire rest of the lists
-        if self_index >= len(self.track):
-            new_track.extend(other.track[other_index:])
-            new_frame_assigned.extend(other.frame_assigned[other_index:])
-        elif other_index >= len(other.track):
-            new_track.extend(self.track[self_index:])
-            new_frame_assigned.extend(self.frame_assigned[self_index:])
-
-        self.last_frame_update = new_frame_assigned[-1]
-        self.track = new_track
-        self.frame_assigned = new_frame_assigned
-        self.remove_frame_duplicates()
+        #   The frames of both tracks are sorted, so a stable sort of the frames
+        # of other followed by self gives the same order as merging them, where
+        # a person of other comes before a person of self at the same frame.
+        frames = np.concatenate((other.frame_assigned, self.frame_assigned))
+        merged = np.argsort(frames, kind='mergesort')
+        frames = frames[merged]
+
+        # Keep the first person of every run of equal frame numbers
+        keep = np.ones(len(frames), dtype=bool)
+        keep[1:] = frames[1:] != frames[:-1]
+        merged = merged[keep]
+
+        self._set_arrays(*[np.concatenate((other_array, array))[merged]
+                           for array, other_array in zip(self._arrays(), other._arrays())])
         self.predictions = {**other.predictions, **self.predictions}
 
     def overlaps(self, other):
@@ -297,56 +437,74 @@ class Track:
             True if the two tracks are nearby each other.
 
         """
-        if self.frame_assigned[-1] < other.frame_assigned[0] or \
-                self.frame_assigned[0] > other.frame_assigned[-1]:
+        self_frames = self.frame_assigned
+        other_frames = other.frame_assigned
+        if self_frames[-1] < other_frames[0] or self_frames[0] > other_frames[-1]:
             return False
 
-        start_frame = max(self.frame_assigned[0], other.frame_assigned[0])
+        start_frame = max(self_frames[0], other_frames[0])
+
+        self_index = self._find_start_index(start_frame, self_frames)
+        other_index = self._find_start_index(start_frame, other_frames)
+
+        #   The two paths are walked through in order of frames, where a person
+        # of other is passed before a person of self at the same frame. Every
+        # person passed is compared to the current person of the other path.
+        self_indicies, self_other_indicies, self_steps = self._walk_comparisons(
+            self_frames, self_index, other_frames, other_index, 'right')
+        other_indicies, other_self_indicies, other_steps = self._walk_comparisons(
+            other_frames, other_index, self_frames, self_index, 'left')
 
-        self_index = self._find_start_index(start_frame, self.frame_assigned)
-        other_index = self._find_start_index(start_frame, other.frame_assigned)
+        walk_order = np.argsort(np.concatenate((self_steps, other_steps)), kind='mergesort')
+        self_indicies = np.concatenate((self_indicies, other_self_indicies))[walk_order]
+        other_indicies = np.concatenate((self_other_indicies, other_indicies))[walk_order]
 
         #  If any of the shifts between the two paths have a distance above a threshold
         # we don't consider the two paths to be overlapping.
-        while self_index < len(self.track) and other_index < len(other.track):
-            if self.frame_assigned[self_index] < other.frame_assigned[other_index]:
-                if self._check_frame_distance(self.frame_assigned, self.track, self_index,
-                                              other.frame_assigned, other.track, other_index):
-                    self_index += 1
-                else:
-                    return False
-            else:
-                if self._check_frame_distance(other.frame_assigned, other.track, other_index,
-                                              self.frame_assigned, self.track, self_index):
-                    other_index += 1
-                else:
-                    return False
+        # Compared in blocks of doubling size, as paths often differ from the start.
+        distance_threshold = 16
+        start = 0
+        block_size = 4
+        while start < len(walk_order):
+            block = slice(start, start + block_size)
+            distances = keypoint_distances(self._keypoints[self_indicies[block]],
+                                           other._keypoints[other_indicies[block]])
+            if not np.all(distances < distance_threshold):
+                return False
+
+            start += block_size
+            block_size *= 2
 
         return True
 
-    def _check_frame_distance(self, frame_assigned, track, index, other_frame_assigned,
-                              other_track, other_index):
-        distance_threshold = 16
+    def _walk_comparisons(self, frames, start_index, other_frames, other_start_index, side):
+        #  The index of the other path when each person of the path is passed,
+        # which is the number of people of the other path passed before it.
+        indicies = np.arange(start_index, len(frames))
+        other_indicies = np.maximum(
+            other_start_index, np.searchsorted(other_frames, frames[indicies], side))
 
-        frame_diff = frame_assigned[index] - other_frame_assigned[other_index]
-        if index + 1 < len(frame_assigned):
-            next_frame_diff = frame_assigned[index + 1] - other_frame_assigned[other_index]
-        else:
-            next_frame_diff = frame_diff - 1
+        # The walk ends when every person of the other path has been passed.
+        in_walk = other_indicies < len(other_frames)
+        indicies = indicies[in_walk]
+        other_indicies = other_indicies[in_walk]
 
-        distance = track[index].distance(other_track[other_index])
+        #  There is no need to compare a person if the next person of the path
+        # comes later, but not after, the current person of the other path.
+        has_next = indicies + 1 < len(frames)
+        next_frames = frames[np.minimum(indicies + 1, len(frames) - 1)]
+        skip = has_next & (next_frames > frames[indicies]) & \
+            (next_frames <= other_frames[other_indicies])
 
-        if next_frame_diff > frame_diff and next_frame_diff <= 0:
-            return True
-        else:
-            return distance < distance_threshold
+        indicies = indicies[~skip]
+        other_indicies = other_indicies[~skip]
+        steps = (indicies - start_index) + (other_indicies - other_start_index)
+
+        return indicies, other_indicies, steps
 
     def _find_start_index(self, start_frame, frame_assigned):
-        index = 0
         # Find the frame where the two paths start overlapping
-        while frame_assigned[index] < start_frame:
-            index += 1
-        index -= 1
+        index = np.searchsorted(frame_assigned, start_frame, 'left') - 1
 
         return max(0, index)
 
@@ -362,23 +520,34 @@ class Track:
             Either 'copy' or 'diff', as explained in Person.fill_missing_keypoints()
 
         """
-        if len(self.track) < 2:
+        if len(self) < 2:
             return
 
-        for i in range(1, len(self.track)):
-            self.track[i].fill_missing_keypoints(self.track[i - 1], fill_type)
+        keypoints = self._keypoints[:self._length]
+        identified = np.any(keypoints, axis=2)
+
+        if fill_type == 'diff':
+            #  Every frame is filled from the filled previous frame, but frames
+            # without missing keypoints are left as they are.
+            for i in np.flatnonzero(~np.all(identified[1:], axis=1)) + 1:
+                fill_keypoints(keypoints[i], identified[i],
+                               keypoints[i - 1], identified[i - 1], fill_type)
+        else:
+            # Copying forwards gives every keypoint the last identified position.
+            last_identified = np.where(identified, np.arange(len(self))[:, np.newaxis], 0)
+            np.maximum.accumulate(last_identified, axis=0, out=last_identified)
+            keypoints[...] = keypoints[last_identified, np.arange(keypoints.shape[1])]
 
     def remove_frame_duplicates(self):
         """Removes parts of the track where two parts were assigned to the same frame number.
 
         """
-        i = 0
-        while i < len(self.frame_assigned) - 1:
-            if self.frame_assigned[i] == self.frame_assigned[i + 1]:
-                self.frame_assigned.pop(i + 1)
-                self.track.pop(i + 1)
-            else:
-                i += 1
+        frames = self.frame_assigned
+        # Keep the first person of every run of equal frame numbers
+        keep = np.ones(len(frames), dtype=bool)
+        keep[1:] = frames[1:] != frames[:-1]
+
+        self._set_arrays(*[array[keep] for array in self._arrays()])
 
     def fill_missing_frames(self):
         """Fills frames that aren't assigned a value with interpolated points.
@@ -388,28 +557,43 @@ class Track:
         next identified frame and the previous identified frame.
 
         """
-        new_track = []
-        new_frame_assigned = []
-
-        new_track.append(self.track[0])
-        new_frame_assigned.append(self.frame_assigned[0])
-
-        for i in range(1, len(self.track)):
-            frame_diff = self.frame_assigned[i] - self.frame_assigned[i - 1]
-            if frame_diff == 1:
-                new_track.append(self.track[i])
-                new_frame_assigned.append(self.frame_assigned[i])
-            else:
-                interpolated_people = self.track[i].interpolate(self.track[i - 1], frame_diff)
-                for j, person in enumerate(interpolated_people):
-                    new_track.append(person)
-                    new_frame_assigned.append(self.frame_assigned[i - 1] + j + 1)
-
-                new_track.append(self.track[i])
-                new_frame_assigned.append(self.frame_assigned[i])
+        keypoints, og_keypoints, frames, track_indicies = self._arrays()
+        number_of_missing = np.maximum(np.diff(frames) - 1, 0)
+        if not number_of_missing.any():
+            return
 
-        self.track = new_track
-        self.frame_assigned = new_frame_assigned
+        #  Every missing frame is interpolated from the person before the gap,
+        # and the (number of missing + 1) steps to the person after the gap.
+        gaps = np.repeat(np.arange(len(number_of_missing)), number_of_missing)
+        gap_starts = np.cumsum(number_of_missing) - number_of_missing
+        steps_into_gap = np.arange(len(gaps)) - gap_starts[gaps] + 1
+
+        dtype = keypoints.dtype
+        diff = keypoints[gaps + 1] - keypoints[gaps]
+        steps = (number_of_missing[gaps] + 1).astype(dtype)[:, np.newaxis, np.newaxis]
+        step_diff = diff / steps
+        interpolated = keypoints[gaps] + \
+            step_diff * steps_into_gap.astype(dtype)[:, np.newaxis, np.newaxis]
+
+        length = len(self) + len(gaps)
+        is_original = np.zeros(length, dtype=bool)
+        is_original[np.arange(len(self)) + np.append(0, np.cumsum(number_of_missing))] = True
+
+        new_keypoints = np.empty((length, *keypoints.shape[1:]), dtype=dtype)
+        new_og_keypoints = np.empty_like(new_keypoints)
+        new_frames = np.empty(length, dtype=frames.dtype)
+        new_track_indicies = np.empty(length, dtype=track_indicies.dtype)
+
+        new_keypoints[is_original] = keypoints
+        new_keypoints[~is_original] = interpolated
+        new_og_keypoints[is_original] = og_keypoints
+        new_og_keypoints[~is_original] = interpolated
+        new_frames[is_original] = frames
+        new_frames[~is_original] = frames[gaps] + steps_into_gap
+        new_track_indicies[is_original] = track_indicies
+        new_track_indicies[~is_original] = track_indicies[gaps + 1]
+
+        self._set_arrays(new_keypoints, new_og_keypoints, new_frames, new_track_indicies)
 
     def reset_keypoints(self):
         """Resets the Keypoints in every Person in track to the original.
@@ -424,8 +608,7 @@ class Track:
         fill_type.
 
         """
-        for person in self.track:
-            person.reset_keypoints()
+        self._keypoints[:self._length] = self._og_keypoints[:self._length]
 
     def add_prediction(self, label, confidence, frame):
         """Adds a prediction to the track.
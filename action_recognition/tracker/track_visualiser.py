@@ -39,7 +39,8 @@ class TrackVisualiser:
             cv2.imshow("output", smaller_original)
             cv2.waitKey(10)
 
-    def draw_tracks(self, tracks, img, current_frame, keypoint_index=COCOKeypoints.Neck.value):
+    def draw_tracks(self, tracks, img, current_frame, keypoint_index=COCOKeypoints.Neck.value,
+                    track_indicies=None):
         """Overlays the tracks on the img.
 
         Parameters
@@ -51,13 +52,69 @@ class TrackVisualiser:
             The current frame to get the keypoints from tracks for.
         keypoint_index : int, optional, default 1
             Specifies which keypoint should be drawn to the image.
+        track_indicies : list of int, optional
+            The indicies of the tracks, which decide their colors and the
+            drawn index.  If not specified, the position in tracks is used.
 
         """
-        for i, track in enumerate(tracks):
+        paths = self.track_paths(tracks, current_frame, keypoint_index, track_indicies)
+        self.draw_track_paths(paths, img)
+
+    def track_paths(self, tracks, current_frame, keypoint_index=COCOKeypoints.Neck.value,
+                    track_indicies=None):
+        """Extracts the parts of the tracks that draw_tracks draws.
+
+        The paths are copies, so they can be drawn with draw_track_paths
+        while the tracks keep changing, e.g. in another thread.
+
+        Parameters
+        ----------
+        tracks : list of Track
+        current_frame : int
+            The current frame to get the keypoints from tracks for.
+        keypoint_index : int, optional, default 1
+            Specifies which keypoint should be drawn to the image.
+        track_indicies : list of int, optional
+            The indicies of the tracks, as in draw_tracks.
+
+        Returns
+        -------
+        paths : list of (int, array-like)
+            The index of each recently updated track and the last part of
+            its path, shape = [n_points, 2]
+
+        """
+        if track_indicies is None:
+            track_indicies = range(len(tracks))
+
+        paths = []
+        for i, track in zip(track_indicies, tracks):
+            # Don't draw old paths
+            if track.last_frame_update <= current_frame - 10:
+                continue
+
+            path = track.get_keypoint_path(keypoint_index, current_frame)
+            paths.append((i, np.copy(path[-11:])))
+
+        return paths
+
+    def draw_track_paths(self, paths, img):
+        """Overlays paths, as given by track_paths, on the img.
+
+        Parameters
+        ----------
+        paths : list of (int, array-like)
+        img : array-like
+            The image to overlay the paths on.
+
+        """
+        for i, path in paths:
             track_color = self.colors[i % len(self.colors)]
-            self._add_lines_from_track(img, track, track_color,
-                                       current_frame, keypoint_index)
-            self._add_index_of_track(img, i, track, track_color, current_frame, keypoint_index)
+            self._draw_path(img, path, track_color)
+
+            if len(path) > 0:
+                keypoint = path[-1].astype(np.int)
+                self.draw_text(img, str(i), position=tuple(keypoint), color=track_color)
 
     def draw_people(self, tracks, img, current_frame, offset_person=True):
         """Overlays the skeleton of people from tracks to image.
@@ -130,25 +187,6 @@ class TrackVisualiser:
         cv2.putText(img, text, position, font, 2, black, 4)
         cv2.putText(img, text, position, font, 2, color, 2)
 
-    def _add_index_of_track(self, img, track_index, track, color, current_frame, keypoint_index):
-        if track.last_frame_update <= current_frame - 10:
-            return
-
-        path = track.get_keypoint_path(keypoint_index, current_frame)
-
-        if len(path) > 0:
-            keypoint = path[-1].astype(np.int)
-            self.draw_text(img, str(track_index), position=tuple(keypoint), color=color)
-
-    def _add_lines_from_track(self, img, track, color, current_frame, keypoint_index):
-        # Don't draw old paths
-        if track.last_frame_update <= current_frame - 10:
-            return
-
-        path = track.get_keypoint_path(keypoint_index, current_frame)
-
-        self._draw_path(img, path, color)
-
     def _draw_path(self, img, path, color):
         start_index = max(1, len(path) - 10)
         for i in range(start_index, len(path)):
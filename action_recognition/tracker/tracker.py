@@ -1,13 +1,16 @@
 import numpy as np
 import scipy.optimize
+from itertools import chain
 from time import time
 import cv2
 import os
 import logging
 
 from .track_visualiser import TrackVisualiser
-from .person import Person
+from .person import Person, keypoint_distances
 from .track import Track
+from .retired_tracks import RetiredTracks
+from .pipeline import Pipeline
 
 
 class Tracker:
@@ -17,19 +20,64 @@ class Tracker:
     ----------
     detector : any object implementing detect in the same way as the openpose
         implementations in the detector module.  Used for detecting keypoints
-        of people from an image.
+        of people from an image.  If it also implements detect_batch, it is
+        used to detect batch_size frames at once.
     out_dir : str, optional, default 'output'
         path to directory where the resulting tracks and videos are saved.
         Creates this directory if it does not exist.
+    gated_assignment : boolean, optional, default False
+        Specifies if every pair of track and person should be checked for
+        too large movements before the assignment is solved, so that it is
+        only solved once per frame.  Otherwise, the assignment is solved
+        again every time an assigned person turns out to have moved too far.
+        The two give the same tracks except when a person that moved too far
+        distorts the first assignment, where the gated assignment can still
+        assign the other people to their own tracks.
+    retire_after : int, optional
+        The number of frames without updates after which a track is retired,
+        so that it is no longer considered every frame.  Retired tracks
+        keep their index, but their place in tracks is set to None.
+        Should be at least 10, as tracks are matched with people for
+        10 frames after their last update.  If not specified, tracks are
+        never retired.
+    spill_after : int, optional
+        The number of retired tracks to keep in memory before they are saved
+        to a part file next to the resulting tracks.  The part files are
+        kept, and listed in the tracks file, so that they are not loaded
+        into memory again, see util.load_tracks.  If not specified, every
+        retired track is kept in memory.
+    pipelined : boolean, optional, default False
+        Specifies if the video should be decoded, detected, and drawn and
+        encoded in separate threads, so that the detector doesn't wait for
+        the other stages.  The tracking itself is still done in order.
+    queue_size : int, optional, default 8
+        The number of batches of frames each stage of the pipelined mode
+        can work ahead.
+    batch_size : int, optional, default 1
+        The number of frames given to the detector at once, if the detector
+        implements detect_batch, as the detectors in the detector module.
 
     """
 
-    def __init__(self, detector, out_dir='output'):
+    def __init__(self, detector, out_dir='output', gated_assignment=False,
+                 retire_after=None, spill_after=None, pipelined=False, queue_size=8,
+                 batch_size=1):
         self.tracks = []
+        self.active_tracks = {}
+
+        self.retire_after = retire_after
+        self.spill_after = spill_after
+        self.retired_tracks = RetiredTracks()
 
         self.detector = detector
 
         self.speed_change_threshold = 10
+        self.gated_assignment = gated_assignment
+
+        self.pipelined = pipelined
+        self.queue_size = queue_size
+        self.pipeline = None
+        self.batch_size = batch_size
 
         self.visualiser = TrackVisualiser()
 
@@ -66,8 +114,12 @@ class Tracker:
     def video_generator(self, file, draw_frames):
         """Tracks people in the video in file, and yields ever frame.
 
-        After each frame, yields the current tracks.  The yielded tracks
-        can e.g. be post-processed and actions can be predicted on them.
+        After each frame, yields the current tracks that are not retired.
+        The yielded tracks can e.g. be post-processed and actions can be
+        predicted on them.  In the pipelined mode, the tracks are drawn on
+        the yielded image after the next frame is requested, and the
+        statistics of the queues between the stages are available through
+        self.pipeline.statistics().
 
         Parameters
         ----------
@@ -82,58 +134,135 @@ class Tracker:
         capture = cv2.VideoCapture(file)
         self.speed_change_threshold = 10
 
+        if self.spill_after is not None:
+            self.retired_tracks = RetiredTracks(self._tracks_file(file), self.spill_after)
+
         writer = self._create_writer(file, capture)
 
+        if self.pipelined:
+            yield from self._pipelined_video_generator(capture, writer, draw_frames)
+        else:
+            yield from self._serial_video_generator(capture, writer, draw_frames)
+
+        capture.release()
+        writer.release()
+
+    def _serial_video_generator(self, capture, writer, draw_frames):
         current_frame = 0
+        for images in self._read_batches(capture):
+            openpose_start_time = time()
+            detections = self._detect(images)
+            openpose_time = (time() - openpose_start_time) / len(images)
+
+            for keypoints, image_with_keypoints in detections:
+                self._retire_tracks(current_frame)
+                track_endpoints = self._track_endpoints(current_frame)
+                people = [p for p in self._convert_to_persons(keypoints)]
+
+                min_person_start_time = time()
+                self._track_people(people, track_endpoints, current_frame)
+                closest_person_time = time() - min_person_start_time
+
+                visualisation_start_time = time()
+                self.visualiser.draw_tracks(
+                    list(self.active_tracks.values()), image_with_keypoints, current_frame,
+                    track_indicies=list(self.active_tracks.keys()))
+                visualisation_time = time() - visualisation_start_time
+
+                if current_frame > 10:
+                    yield list(self.active_tracks.values()), image_with_keypoints, current_frame
+
+                self._write_frame(writer, image_with_keypoints, draw_frames)
+
+                logging.debug("OpenPose: {:.5f}, "
+                              "Closest person: {:.5f}, "
+                              "Draw tracks to img: {:.5f}".format(
+                                  openpose_time, closest_person_time, visualisation_time))
+
+                current_frame += 1
+
+    def _pipelined_video_generator(self, capture, writer, draw_frames):
+        #   Decoding, detection, and drawing and writing each run in their own
+        # thread, while the tracking is done in this thread in the order of
+        # the frames.
+        self.pipeline = Pipeline(self.queue_size)
+        images = self.pipeline.source('decoded', self._read_batches(capture))
+        detections = self.pipeline.stage('detected', self._detect, images)
+        tracked = self.pipeline.sink(
+            'tracked', lambda item: self._draw_and_write_frame(writer, draw_frames, *item))
+
+        finished = False
+        try:
+            for current_frame, (keypoints, image_with_keypoints) in \
+                    enumerate(chain.from_iterable(self.pipeline.results(detections))):
+                self._retire_tracks(current_frame)
+                track_endpoints = self._track_endpoints(current_frame)
+                people = self._convert_to_persons(keypoints)
+
+                min_person_start_time = time()
+                self._track_people(people, track_endpoints, current_frame)
+                closest_person_time = time() - min_person_start_time
+
+                #  The tracks keep changing, so give the writer a copy of
+                # the paths to draw.
+                paths = self.visualiser.track_paths(
+                    list(self.active_tracks.values()), current_frame,
+                    track_indicies=list(self.active_tracks.keys()))
+
+                if current_frame > 10:
+                    yield list(self.active_tracks.values()), image_with_keypoints, current_frame
+
+                tracked.put((image_with_keypoints, paths))
+
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.debug("Closest person: {:.5f}, Queues: {}".format(
+                        closest_person_time, self.pipeline.statistics()))
+
+            tracked.close()
+            finished = True
+        finally:
+            if finished:
+                self.pipeline.join()
+            else:
+                self.pipeline.stop()
+
+        logging.info("Pipeline statistics: {}".format(self.pipeline.statistics()))
+
+    def _read_batches(self, capture):
+        images = []
         success, original_image = capture.read()
         while success:
-            track_endpoints = [track.get_last_person()
-                               for track in self.tracks
-                               if track.recently_updated(current_frame)]
-
-            openpose_start_time = time()
-            keypoints, image_with_keypoints = self.detector.detect(original_image)
-            people = [p for p in self._convert_to_persons(keypoints)]
-            openpose_time = time() - openpose_start_time
+            images.append(original_image)
+            if len(images) == self.batch_size:
+                yield images
+                images = []
 
-            min_person_start_time = time()
-            # Find out which people are closest to each other
-            assignments, distances, removed_people = self._find_assignments(
-                people, track_endpoints, current_frame)
-
-            #  Add back the people we couldn't associate well during the assignment process
-            # to the back of the list
-            people = people + removed_people
-
-            self._update_tracks(distances, assignments, people, track_endpoints, current_frame)
-            closest_person_time = time() - min_person_start_time
-
-            visualisation_start_time = time()
-            self.visualiser.draw_tracks(
-                self.tracks, image_with_keypoints, current_frame)
-            visualisation_time = time() - visualisation_start_time
+            success, original_image = capture.read()
 
-            if current_frame > 10:
-                yield self.tracks, image_with_keypoints, current_frame
+        if images:
+            yield images
 
-            if draw_frames:
-                smaller_img = cv2.resize(image_with_keypoints, (0, 0), fx=0.5, fy=0.5)
-                cv2.imshow("output", smaller_img)
-                cv2.waitKey(1)
+    def _detect(self, images):
+        #  Let detectors that can detect several images at once do so,
+        # as that can be faster.
+        if hasattr(self.detector, 'detect_batch'):
+            keypoints, images_with_keypoints = self.detector.detect_batch(images, render=True)
+            return list(zip(keypoints, images_with_keypoints))
 
-            # Write the frame to a video
-            writer.write(image_with_keypoints)
+        return [self.detector.detect(image) for image in images]
 
-            logging.debug("OpenPose: {:.5f}, "
-                          "Closest person: {:.5f}, "
-                          "Draw tracks to img: {:.5f}".format(
-                              openpose_time, closest_person_time, visualisation_time))
+    def _draw_and_write_frame(self, writer, draw_frames, image_with_keypoints, paths):
+        self.visualiser.draw_track_paths(paths, image_with_keypoints)
+        self._write_frame(writer, image_with_keypoints, draw_frames)
 
-            success, original_image = capture.read()
-            current_frame += 1
+    def _write_frame(self, writer, image_with_keypoints, draw_frames):
+        if draw_frames:
+            smaller_img = cv2.resize(image_with_keypoints, (0, 0), fx=0.5, fy=0.5)
+            cv2.imshow("output", smaller_img)
+            cv2.waitKey(1)
 
-        capture.release()
-        writer.release()
+        # Write the frame to a video
+        writer.write(image_with_keypoints)
 
     def _create_writer(self, in_file, capture):
         frame_width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -149,15 +278,39 @@ class Tracker:
 
         return writer
 
+    def _retire_tracks(self, current_frame):
+        if self.retire_after is None:
+            return
+
+        stale_indicies = [i for i, track in self.active_tracks.items()
+                          if current_frame - track.last_frame_update > self.retire_after]
+        for i in stale_indicies:
+            self.retired_tracks.add(i, self.active_tracks.pop(i))
+            self.tracks[i] = None
+
+    def _track_endpoints(self, current_frame):
+        return [track.get_last_person()
+                for track in self.active_tracks.values()
+                if track.recently_updated(current_frame)]
+
+    def _track_people(self, people, track_endpoints, current_frame):
+        # Find out which people are closest to each other
+        assignments, distances, removed_people = self._find_assignments(
+            people, track_endpoints, current_frame)
+
+        #  Add back the people we couldn't associate well during the assignment process
+        # to the back of the list
+        people = people + removed_people
+
+        self._update_tracks(distances, assignments, people, track_endpoints, current_frame)
+
+        return people
+
     def _find_assignments(self, people, prev_people, current_frame):
-        # Pre-allocate the distance matrix
-        distances = np.empty((len(prev_people), len(people)))
+        distances = self._distance_matrix(people, prev_people)
 
-        # And calculate the distances...
-        for i, prev_frame_person in enumerate(prev_people):
-            for j, person in enumerate(people):
-                distance = person.distance(prev_frame_person)
-                distances[i, j] = distance
+        if self.gated_assignment:
+            return self._find_gated_assignments(people, prev_people, distances, current_frame)
 
         removed_people = []
         # Find the best assignments between people in the two frames
@@ -173,6 +326,16 @@ class Tracker:
 
         return assignments, distances, removed_people
 
+    def _distance_matrix(self, people, prev_people):
+        if len(people) == 0 or len(prev_people) == 0:
+            return np.empty((len(prev_people), len(people)))
+
+        #   Stack the keypoints as [1, n_people, ...] and [n_prev_people, 1, ...]
+        # so that every pairwise distance is calculated in one go.
+        keypoints = np.array([p.keypoints for p in people])
+        prev_keypoints = np.array([p.keypoints for p in prev_people])
+        return keypoint_distances(keypoints[np.newaxis], prev_keypoints[:, np.newaxis])
+
     def _is_assignment_valid(self, assignments, distances, people, prev_people, current_frame):
         for from_, to in zip(assignments[0], assignments[1]):
             track_index = prev_people[from_].track_index
@@ -197,6 +360,58 @@ class Tracker:
 
         return True, distances, None
 
+    def _find_gated_assignments(self, people, prev_people, distances, current_frame):
+        #   Check the movement of every pair at once, and make the pairs that
+        # move too far more expensive than every valid pair combined, so that
+        # they are only chosen if there is no other option.
+        max_distances = np.array([self._max_distance_since_last_seen(p, current_frame)
+                                  for p in prev_people])
+        valid_pairs = distances <= max_distances[:, np.newaxis]
+        costs = np.where(valid_pairs, distances, distances[valid_pairs].sum() + 1)
+
+        assignments = scipy.optimize.linear_sum_assignment(costs)
+
+        #  The people of invalid pairs are removed in the same way as in
+        # _is_assignment_valid, which forces them to get new tracks later.
+        invalid = ~valid_pairs[assignments]
+        removed_indicies = self._order_removed_people(
+            distances, assignments[0][~invalid], assignments[1][invalid])
+        for from_, to in zip(assignments[0][invalid], removed_indicies):
+            logging.debug("Invalid association! from: {}, to: {}, dist: {:.2f}".format(
+                from_, to, distances[from_, to]))
+
+        removed_people = [people[i] for i in removed_indicies]
+        for i in sorted(removed_indicies, reverse=True):
+            people.pop(i)
+        distances = np.delete(distances, removed_indicies, axis=1)
+
+        # Shift the remaining assignments to the people left in the list
+        kept = np.ones(len(people) + len(removed_people), dtype=bool)
+        kept[removed_indicies] = False
+        new_indicies = np.cumsum(kept) - 1
+        assignments = (assignments[0][~invalid], new_indicies[assignments[1][~invalid]])
+
+        return assignments, distances, removed_people
+
+    def _order_removed_people(self, distances, assigned_rows, removed_indicies):
+        #   The iterative assignment removes people in the order of the tracks
+        # they are closest to, which decides the order of the new tracks.
+        # Pair the removed people with the unassigned tracks to get the same order.
+        if len(removed_indicies) < 2:
+            return removed_indicies
+
+        free_rows = np.setdiff1d(np.arange(distances.shape[0]), assigned_rows)
+        rows, columns = scipy.optimize.linear_sum_assignment(
+            distances[np.ix_(free_rows, removed_indicies)])
+        return removed_indicies[columns[np.argsort(rows)]]
+
+    def _max_distance_since_last_seen(self, prev_person, current_frame):
+        track = self.tracks[prev_person.track_index]
+        avg_speed = track.get_average_speed_in_window(10)
+        frames_since_last_update = current_frame - track.last_frame_update
+
+        return avg_speed * frames_since_last_update + self.speed_change_threshold
+
     def _update_tracks(self, distances, assignments, people, prev_people, current_frame):
         for from_, to in zip(assignments[0], assignments[1]):
             logging.debug("From: {}, to: {}  people: {}  prev_people: {}".format(
@@ -215,31 +430,55 @@ class Tracker:
                 track = Track()
                 people[i].track_index = len(self.tracks)
                 track.add_person(people[i], current_frame)
-                self.tracks.append(track)
+                self._add_track(track)
 
     def _establish_index_of_track(self, from_, to, prev_people, distances):
         # Make sure we know to which track the requested index belongs to
         if from_ < len(prev_people):
             track_index = prev_people[from_].track_index
         else:
-            track_index = len(self.tracks)
-            self.tracks.append(Track())
+            track_index = self._add_track(Track())
+
+        return track_index
+
+    def _add_track(self, track):
+        track_index = len(self.tracks)
+        self.tracks.append(track)
+        self.active_tracks[track_index] = track
 
         return track_index
 
     def _convert_to_persons(self, keypoints):
         return [Person(k) for k in keypoints]
 
-    def _save_tracks(self, in_file):
+    def _tracks_file(self, in_file):
         basename = os.path.basename(in_file)
         filename, _ = os.path.splitext(basename)
-        file_path = os.path.join(self.out_dir, filename + '-tracks')
+        return os.path.join(self.out_dir, filename + '-tracks')
 
-        logging.debug("Creating output tracks.")
-        tracks_out = [track.to_np() for track in self.tracks]
+    def _save_tracks(self, in_file):
+        file_path = self._tracks_file(in_file)
 
-        tracks = np.array([p[0] for p in tracks_out], dtype=object)
-        frames = np.array([p[1] for p in tracks_out], dtype=object)
+        logging.debug("Creating output tracks.")
+        #  The tracks spilled to disk are not loaded again, but their parts
+        # are kept next to the tracks file, which lists them.
+        track_indicies, tracks_out, frames_out = self.retired_tracks.to_np(include_parts=False)
+        for track_index, track in self.active_tracks.items():
+            track_indicies.append(track_index)
+            track_out, track_frames = track.to_np()
+            tracks_out.append(track_out)
+            frames_out.append(track_frames)
+
+        # Save the tracks in the order of their indicies, as Person.track_index
+        order = np.argsort(track_indicies, kind='mergesort')
+        tracks = np.array([tracks_out[i] for i in order], dtype=object)
+        frames = np.array([frames_out[i] for i in order], dtype=object)
 
         logging.info("Saving tracks to {}".format(file_path))
-        np.savez(file_path, tracks=tracks, frames=frames)
+        part_files = [os.path.basename(f) for f in self.retired_tracks.part_files]
+        if part_files:
+            np.savez(file_path, tracks=tracks, frames=frames,
+                     track_indicies=np.array(track_indicies, dtype=np.int)[order],
+                     part_files=np.array(part_files))
+        else:
+            np.savez(file_path, tracks=tracks, frames=frames)
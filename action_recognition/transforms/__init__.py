@@ -11,6 +11,11 @@ from .flatten_to_3D import FlattenTo3D
 from .smooth_chunks import SmoothChunks
 from .translate_chunks import TranslateChunks
 from .persistence import Persistence
+from .persistence_cache import PersistenceCache
+from .shared_results import SharedResults, Shared
+from .gram_matrix_file import GramMatrixFile
+from .sliced_wasserstein import SlicedWasserstein
+from .sliced_wasserstein_features import SlicedWassersteinFeatures
 from .speed import Speed
 from .extract_keypoints import ExtractKeypoints
 from .interpolate_keypoints import InterpolateKeypoints
@@ -0,0 +1,135 @@
+import numpy as np
+import os
+import logging
+
+
+class GramMatrixFile:
+    """A symmetric float32 Gram matrix in a memory-mapped file, calculated in tiles.
+
+    The matrix is divided into square tiles, where only the tiles on and
+    above the diagonal are calculated, and written to both halves of the
+    matrix.  Which tiles are complete is kept in a second file, file + '.tiles',
+    together with a key of what the matrix is calculated from.  If the files
+    exist with the same key and size, the matrix is resumed from the complete
+    tiles, and otherwise it is started over.
+
+    The tiles are disjoint, so different processes can write different
+    tiles at the same time, each through its own GramMatrixFile.
+
+    Parameters
+    ----------
+    file : str
+        Path to the file of the matrix.
+    size : int
+        The number of rows and columns of the matrix.
+    key : str
+        Identifies what the matrix is calculated from, e.g. a hash of the
+        data and the parameters of the kernel.  At most 255 bytes.
+    tile_size : int, optional, default = 1024
+        The number of rows and columns of each tile.
+
+    """
+
+    def __init__(self, file, size, key, tile_size=1024):
+        self.file = file
+        self.size = size
+        self.key = key
+        self.tile_size = tile_size
+        self.number_of_tiles = max(1, -(-size // tile_size))
+
+        self._tiles_file = file + '.tiles'
+        header = self._header()
+        if not self._can_resume(header):
+            logging.debug("Starting a new Gram matrix in {}".format(file))
+            with open(self.file, 'wb') as f:
+                f.truncate(4 * size * size)
+            with open(self._tiles_file, 'wb') as f:
+                f.write(header)
+                f.write(bytes(self.number_of_tiles * self.number_of_tiles))
+
+    def _header(self):
+        header = "{} {} {}".format(self.size, self.tile_size, self.key).encode('utf-8')
+        return bytes([len(header)]) + header
+
+    def _can_resume(self, header):
+        if not os.path.isfile(self.file) or not os.path.isfile(self._tiles_file):
+            return False
+        if os.path.getsize(self.file) != 4 * self.size * self.size:
+            return False
+        with open(self._tiles_file, 'rb') as f:
+            return f.read(len(header)) == header and \
+                len(f.read()) == self.number_of_tiles * self.number_of_tiles
+
+    def _done(self, mode):
+        return np.memmap(self._tiles_file, dtype=np.uint8, mode=mode, offset=len(self._header()),
+                         shape=(self.number_of_tiles, self.number_of_tiles))
+
+    def missing_tiles(self):
+        """Gives the tiles on and above the diagonal that are not complete.
+
+        Returns
+        -------
+        tiles : list of (int, int)
+            The (row, column) of every missing tile, where row <= column.
+
+        """
+        done = self._done('r')
+        return [(row, column)
+                for row in range(self.number_of_tiles)
+                for column in range(row, self.number_of_tiles)
+                if not done[row, column]]
+
+    def tile_range(self, index):
+        """Gives the rows, or columns, of the matrix that a tile covers.
+
+        Parameters
+        ----------
+        index : int
+            The row, or column, of the tile.
+
+        Returns
+        -------
+        start, stop : int
+
+        """
+        return index * self.tile_size, min(self.size, (index + 1) * self.tile_size)
+
+    def write_tile(self, row, column, values):
+        """Writes a tile, and its transpose below the diagonal, and marks it as complete.
+
+        Parameters
+        ----------
+        row, column : int
+            The row and column of the tile, where row <= column.
+        values : array-like
+            The values of the tile, of shape [rows of the tile, columns of the tile].
+
+        """
+        row_start, row_stop = self.tile_range(row)
+        column_start, column_stop = self.tile_range(column)
+        if row == column:
+            # Only the upper triangle is used, so that the matrix is exactly symmetric.
+            values = np.triu(values) + np.triu(values, 1).T
+
+        matrix = np.memmap(self.file, dtype=np.float32, mode='r+', shape=(self.size, self.size))
+        matrix[row_start:row_stop, column_start:column_stop] = values
+        matrix[column_start:column_stop, row_start:row_stop] = np.transpose(values)
+        matrix.flush()
+        del matrix
+
+        #  Only marked as complete after the values are written, so that
+        # a tile interrupted while writing is calculated again.
+        done = self._done('r+')
+        done[row, column] = 1
+        done.flush()
+
+    def matrix(self):
+        """Gives the matrix, which should be complete.
+
+        Returns
+        -------
+        matrix : np.memmap
+            Read-only, of shape = [size, size]
+
+        """
+        return np.memmap(self.file, dtype=np.float32, mode='r', shape=(self.size, self.size))
@@ -1,14 +1,19 @@
-import gudhi as gd
-
 import numpy as np
-import pandas as pd
 import os
+import logging
 
 from sklearn.preprocessing import RobustScaler
 from sklearn.base import BaseEstimator, TransformerMixin
+try:
+    from sklearn.externals.joblib import Parallel, delayed, cpu_count
+except ImportError:
+    # Newer versions of scikit-learn no longer include joblib.
+    from joblib import Parallel, delayed, cpu_count
+
+from .persistence_cache import PersistenceCache
 
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+#   Gudhi, matplotlib and pandas are imported in the methods that use them,
+# so that the transforms can be imported, and unpickled, without them.
 
 
 class Persistence(BaseEstimator, TransformerMixin):
@@ -25,6 +30,16 @@ class Persistence(BaseEstimator, TransformerMixin):
     complex_ : str, optional, default = 'rips'
         Specifies which type of complex to use when calculating persistence.
         Possible values are 'rips', 'alpha', 'tangential', and 'cubical'
+    n_jobs : int, optional, default = 1
+        The number of processes that the point clouds are divided between
+        when calculating persistence, where -1 uses every core.  The
+        diagrams are the same, and in the same order, for any n_jobs.
+    cache_dir : str, optional
+        Path to a directory where the diagrams are cached, see PersistenceCache.
+        The diagrams are looked up by the scaled point clouds and the parameters
+        of the complex, so that they are only calculated once.
+    cache_size : int, optional, default = 2 ** 30
+        The maximum number of bytes of the cached diagrams.
 
     """
 
@@ -32,12 +47,18 @@ class Persistence(BaseEstimator, TransformerMixin):
                  max_edge_length=0.5,
                  max_alpha_square=2,
                  intrisic_dim=2,
-                 complex_='alpha'):
+                 complex_='alpha',
+                 n_jobs=1,
+                 cache_dir=None,
+                 cache_size=2 ** 30):
         self.persistences = []
         self.max_edge_length = max_edge_length
         self.intrisic_dim = intrisic_dim
         self.max_alpha_square = max_alpha_square
         self.complex = complex_
+        self.n_jobs = n_jobs
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
         self.possible_complex_values = ['rips', 'alpha', 'tangential', 'cubical']
 
     def fit(self, X, y=None, **fit_params):
@@ -59,6 +80,9 @@ class Persistence(BaseEstimator, TransformerMixin):
         # dataset since the scalers don't accept 3D data.
         self.scaler = scaler.fit(np.vstack(X))
 
+        self.cache_ = None
+        self._open_cache()
+
         return self
 
     def transform(self, data):
@@ -86,6 +110,9 @@ class Persistence(BaseEstimator, TransformerMixin):
         number_of_points : int, number of point-clouds to plot.
 
         """
+        import matplotlib.pyplot as plt
+        from mpl_toolkits.mplot3d import Axes3D  # noqa: F401, registers the 3d projection
+
         scaler = RobustScaler()
         scaler.fit(np.vstack(data))
         for i in range(number_of_points):
@@ -113,19 +140,34 @@ class Persistence(BaseEstimator, TransformerMixin):
 
         """
 
-        diags = np.zeros(data.shape[0], dtype=object)
-        for i, d in enumerate(data):
-            points = self.scaler.transform(d)
-
-            if self.complex == 'alpha':
-                diag = self._alpha_complex(points)
-            elif self.complex == 'tangential':
-                diag = self._tangential_complex(points)
-            elif self.complex == 'cubical':
-                diag = self._cubical_complex(points)
-            else:
-                diag = self._rips_complex(points)
+        point_clouds = [self.scaler.transform(d) for d in data]
+        cache = self._open_cache()
+
+        if cache is not None:
+            parameters = self._cache_parameters()
+            keys = [cache.key(points, parameters) for points in point_clouds]
+            all_diags = [cache.get(key) for key in keys]
+        else:
+            all_diags = [None] * len(point_clouds)
 
+        missing = [i for i, diag in enumerate(all_diags) if diag is None]
+        missing_point_clouds = [point_clouds[i] for i in missing]
+        if self.n_jobs == 1 or len(missing) == 0:
+            missing_diags = [self._diag(points) for points in missing_point_clouds]
+        else:
+            missing_diags = self._parallel_diags(missing_point_clouds)
+
+        for i, diag in zip(missing, missing_diags):
+            all_diags[i] = diag
+            if cache is not None:
+                cache.add(keys[i], diag)
+
+        if cache is not None:
+            logging.debug("Persistence cache: {} hits, {} misses".format(
+                cache.hits, cache.misses))
+
+        diags = np.zeros(data.shape[0], dtype=object)
+        for i, diag in enumerate(all_diags):
             # Removing the points who don't die
             clean_diag = [p for p in diag if p[1][1] < np.inf]
             self.persistences.append(clean_diag)
@@ -134,19 +176,83 @@ class Persistence(BaseEstimator, TransformerMixin):
 
         return np.array(diags)
 
+    def _open_cache(self):
+        #  The cache is opened again after unpickling, e.g. on another
+        # machine, where the directory may have been removed.
+        if self.cache_dir is not None and getattr(self, 'cache_', None) is None:
+            try:
+                self.cache_ = PersistenceCache(self.cache_dir, self.cache_size)
+            except OSError as e:
+                logging.warning("Not caching persistence diagrams in {}: {}".format(
+                    self.cache_dir, e))
+                self.cache_ = None
+
+        return getattr(self, 'cache_', None)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['cache_'] = None
+        return state
+
+    def _parallel_diags(self, point_clouds):
+        #  Each process gets a few tasks of many point clouds, as the
+        # persistence of a single point cloud is quick to calculate.
+        n_jobs = self.n_jobs if self.n_jobs > 0 else max(1, cpu_count() + 1 + self.n_jobs)
+        number_of_tasks = max(1, min(len(point_clouds), 4 * n_jobs))
+        tasks = np.array_split(np.arange(len(point_clouds)), number_of_tasks)
+
+        parameters = {
+            'max_edge_length': self.max_edge_length,
+            'max_alpha_square': self.max_alpha_square,
+            'intrisic_dim': self.intrisic_dim,
+            'complex_': self.complex
+        }
+        task_diags = Parallel(n_jobs=n_jobs)(
+            delayed(_diags)(parameters, [point_clouds[i] for i in task]) for task in tasks)
+
+        # Parallel keeps the order of the tasks.
+        return [diag for diags in task_diags for diag in diags]
+
+    def _cache_parameters(self):
+        import gudhi as gd
+
+        return {
+            'complex_': self.complex,
+            'max_alpha_square': self.max_alpha_square,
+            'max_edge_length': self.max_edge_length,
+            'intrisic_dim': self.intrisic_dim,
+            'gudhi': getattr(gd, '__version__', '')
+        }
+
+    def _diag(self, points):
+        if self.complex == 'alpha':
+            return self._alpha_complex(points)
+        elif self.complex == 'tangential':
+            return self._tangential_complex(points)
+        elif self.complex == 'cubical':
+            return self._cubical_complex(points)
+        else:
+            return self._rips_complex(points)
+
     def _rips_complex(self, points):
+        import gudhi as gd
+
         rips = gd.RipsComplex(max_edge_length=self.max_edge_length, points=points)
         simplex_tree = rips.create_simplex_tree(max_dimension=3)
         diag = simplex_tree.persistence()
         return diag
 
     def _alpha_complex(self, points):
+        import gudhi as gd
+
         alpha = gd.AlphaComplex(points=points)
         simplex_tree = alpha.create_simplex_tree(max_alpha_square=self.max_alpha_square)
         diag = simplex_tree.persistence()
         return diag
 
     def _cubical_complex(self, points):
+        import gudhi as gd
+
         shape = [points.shape[0]] * 2
         bitmap = np.zeros(shape)
         #  You can do other calculations for the bitmap values,
@@ -161,6 +267,8 @@ class Persistence(BaseEstimator, TransformerMixin):
         return diag
 
     def _tangential_complex(self, points):
+        import gudhi as gd
+
         tangential = gd.TangentialComplex(intrisic_dim=self.intrisic_dim, points=points)
         simplex_tree = tangential.create_simplex_tree()
         diag = simplex_tree.persistence()
@@ -176,6 +284,9 @@ class Persistence(BaseEstimator, TransformerMixin):
         out_dir : str, path to directory where the diagrams are saved.
 
         """
+        import gudhi as gd
+        import matplotlib.pyplot as plt
+
         for i, diag in enumerate(self.persistences):
             fig = gd.plot_persistence_diagram(diag)
 
@@ -195,6 +306,8 @@ class Persistence(BaseEstimator, TransformerMixin):
         out_dir : str, path to directory where the curves are saved.
 
         """
+        import matplotlib.pyplot as plt
+
         for i, diag in enumerate(self.persistences):
             tda_diag_df = self._construct_dataframe(diag)
 
@@ -207,6 +320,8 @@ class Persistence(BaseEstimator, TransformerMixin):
                 plt.close()
 
     def _construct_dataframe(self, clean_diag_alpha):
+        import pandas as pd
+
         tda_diag_df = pd.DataFrame()
 
         tda_diag_df['Dimension'] = [el[0] for el in clean_diag_alpha]
@@ -216,6 +331,8 @@ class Persistence(BaseEstimator, TransformerMixin):
         return tda_diag_df
 
     def _betti_curve(self, tda_diag_df, dim):
+        import matplotlib.pyplot as plt
+
         betti_points = 100
 
         betti_curve = []
@@ -228,3 +345,9 @@ class Persistence(BaseEstimator, TransformerMixin):
             betti_curve.append([death, nb_points_alive])
         betti_curve = np.array(betti_curve)
         plt.plot(betti_curve[:, 0], betti_curve[:, 1])
+
+
+def _diags(parameters, point_clouds):
+    # Creates a new Persistence, as the point clouds are calculated in another process.
+    persistence = Persistence(**parameters)
+    return [persistence._diag(points) for points in point_clouds]
@@ -0,0 +1,159 @@
+import numpy as np
+import hashlib
+import os
+from collections import OrderedDict
+
+
+class PersistenceCache:
+    """An on-disk cache of persistence diagrams, keyed by what they are calculated from.
+
+    Every diagram is stored as a float64 .npy file of (dimension, birth, death)
+    rows, named by a hash of the point cloud and the parameters of the
+    calculation.  When the files take up more than max_size bytes,
+    the least recently used diagrams are removed.  The order of use is
+    kept in the modification times of the files, so that it persists
+    between runs.  When unpickled, the directory is opened again, and
+    created if it has been removed.
+
+    Parameters
+    ----------
+    directory : str
+        Path to the directory of the cache, created if it does not exist.
+    max_size : int, optional, default = 2 ** 30
+        The maximum number of bytes of the stored diagrams.
+
+    """
+
+    def __init__(self, directory, max_size=2 ** 30):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+        # The size of every entry, from the least to the most recently used.
+        self._entries = OrderedDict()
+        self._size = 0
+        files = []
+        for file_name in os.listdir(directory):
+            key, extension = os.path.splitext(file_name)
+            if extension == '.npy':
+                stat = os.stat(os.path.join(directory, file_name))
+                files.append((stat.st_mtime, key, stat.st_size))
+
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._size += size
+
+    def key(self, points, parameters):
+        """Creates the key of the diagram of a point cloud.
+
+        Parameters
+        ----------
+        points : array-like
+            shape = [n_points, n_dimensions], the point cloud as it is passed
+            to the complex.
+        parameters : dict
+            Everything else that the diagram depends on, e.g. the type of
+            complex and its parameters.
+
+        Returns
+        -------
+        key : str
+
+        """
+        points = np.ascontiguousarray(points)
+        key_hash = hashlib.sha1()
+        key_hash.update(repr(sorted(parameters.items())).encode('utf-8'))
+        key_hash.update("{} {}".format(points.dtype.str, points.shape).encode('utf-8'))
+        key_hash.update(points.tobytes())
+
+        return key_hash.hexdigest()
+
+    def get(self, key):
+        """Gets a diagram from the cache.
+
+        Parameters
+        ----------
+        key : str
+
+        Returns
+        -------
+        diag : list of (dimension, (birth, death)), as returned by Gudhi,
+            or None if the diagram is not in the cache.
+
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return None
+
+        file_name = self._file_name(key)
+        try:
+            rows = np.load(file_name)
+            os.utime(file_name)
+        except (OSError, ValueError):
+            # Removed by another process sharing the cache, or not completely written.
+            self._remove_entry(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        return [(int(dimension), (float(birth), float(death)))
+                for dimension, birth, death in rows]
+
+    def add(self, key, diag):
+        """Adds a diagram to the cache, and removes the least recently used if needed.
+
+        Parameters
+        ----------
+        key : str
+        diag : list of (dimension, (birth, death)), as returned by Gudhi.
+
+        """
+        rows = np.array([(dimension, birth, death) for dimension, (birth, death) in diag],
+                        dtype=np.float64).reshape(-1, 3)
+
+        #  Write to a temporary file first, so that a diagram is never read
+        # while it is being written.
+        file_name = self._file_name(key)
+        temporary_file_name = "{}.{}.tmp".format(file_name, os.getpid())
+        with open(temporary_file_name, 'wb') as f:
+            np.save(f, rows)
+        os.replace(temporary_file_name, file_name)
+
+        self._remove_entry(key, remove_file=False)
+        size = os.path.getsize(file_name)
+        self._entries[key] = size
+        self._size += size
+
+        while self._size > self.max_size and len(self._entries) > 1:
+            least_recently_used = next(iter(self._entries))
+            self._remove_entry(least_recently_used)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        #  Only the location is pickled, and the entries are read from the
+        # directory again when unpickled, as it may have changed or been removed.
+        return {'directory': self.directory, 'max_size': self.max_size}
+
+    def __setstate__(self, state):
+        self.__init__(state['directory'], state['max_size'])
+
+    def _file_name(self, key):
+        return os.path.join(self.directory, key + '.npy')
+
+    def _remove_entry(self, key, remove_file=True):
+        if key not in self._entries:
+            return
+
+        self._size -= self._entries.pop(key)
+        if remove_file:
+            try:
+                os.remove(self._file_name(key))
+            except OSError:
+                pass
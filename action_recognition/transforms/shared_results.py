@@ -0,0 +1,187 @@
+import uuid
+import logging
+
+from sklearn.base import BaseEstimator, TransformerMixin
+
+
+class SharedResults:
+    """Results of transforms, shared between the pipelines of several classifiers.
+
+    The results are keyed by the type and parameters of the transform,
+    the data it was fitted to, and the data it transforms, so that a
+    transform in one pipeline reuses the result of the same transform
+    of the same data in another pipeline, see Shared.
+
+    The data is identified by the object that is passed, not by its
+    contents, so the results are only shared when the pipelines pass the
+    same objects, e.g. the chunks passed to both classifiers, and the
+    results of the shared transforms before them.  Every object that is
+    identified is kept until clear() is called, e.g. after every call to
+    fit or predict, so that its identity is not reused by other data.
+
+    Copies, as made by sklearn.base.clone, are the same object so that
+    the results stay shared, and the results are not pickled.
+
+    """
+
+    # Parameters that do not change the result of a transform.
+    ignored_parameters = ('n_jobs', 'cache_dir', 'cache_size')
+
+    def __init__(self):
+        self._results = {}
+        self._data_keys = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, transformer, fit_data_key, X):
+        """Creates the key of the result of a transform.
+
+        Parameters
+        ----------
+        transformer : BaseEstimator
+        fit_data_key : str
+            The key of the data that the transformer was fitted to, see data_key.
+        X : array-like
+            The data that is transformed.
+
+        Returns
+        -------
+        key : tuple
+
+        """
+        parameters = repr(sorted((name, value) for name, value in transformer.get_params().items()
+                                 if name not in self.ignored_parameters))
+        return type(transformer), parameters, fit_data_key, self.data_key(X)
+
+    def data_key(self, X):
+        """Gives the key of data, which is the same for the same object until clear().
+
+        Parameters
+        ----------
+        X : array-like
+            e.g. chunks, point clouds or persistence diagrams.
+
+        Returns
+        -------
+        key : str
+            Unique to the object, and never given to other data, even
+            after clear().
+
+        """
+        entry = self._data_keys.get(id(X))
+        if entry is None:
+            #  The data is kept with its key, so that the id is not given
+            # to other data until clear().
+            entry = (X, uuid.uuid4().hex)
+            self._data_keys[id(X)] = entry
+
+        return entry[1]
+
+    def get(self, key):
+        """Gets a result, or None if it is not stored.
+
+        Parameters
+        ----------
+        key : tuple
+
+        Returns
+        -------
+        result : array-like or None
+
+        """
+        result = self._results.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return result
+
+    def add(self, key, result):
+        """Stores a result.
+
+        Parameters
+        ----------
+        key : tuple
+        result : array-like
+
+        """
+        self._results[key] = result
+
+    def clear(self):
+        """Removes every result, and the data that has been identified.
+
+        """
+        if self.hits or self.misses:
+            logging.debug("Shared results: {} hits, {} misses".format(self.hits, self.misses))
+
+        self._results = {}
+        self._data_keys = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._results)
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __getstate__(self):
+        return {'_results': {}, '_data_keys': {}, 'hits': 0, 'misses': 0}
+
+
+class Shared(BaseEstimator, TransformerMixin):
+    """Wraps a transform so that its results are shared through SharedResults.
+
+    The results are returned as they are stored, and should not be
+    modified.
+
+    Parameters
+    ----------
+    transformer : BaseEstimator, TransformerMixin
+        The transform to share the results of.
+    results : SharedResults
+
+    """
+
+    def __init__(self, transformer, results):
+        self.transformer = transformer
+        self.results = results
+
+    def fit(self, X, y=None, **fit_params):
+        """Fits the transformer to the data.
+
+        Parameters
+        ----------
+        X : array-like
+        y : ignored
+        fit_params : passed to the fit of the transformer.
+
+        Returns
+        -------
+        self
+
+        """
+        self.transformer.fit(X, y, **fit_params)
+        self.fit_data_key_ = self.results.data_key(X)
+        return self
+
+    def transform(self, X):
+        """Transforms the data, or gives the shared result of the same transform.
+
+        Parameters
+        ----------
+        X : array-like
+
+        Returns
+        -------
+        result : array-like
+
+        """
+        key = self.results.key(self.transformer, self.fit_data_key_, X)
+        result = self.results.get(key)
+        if result is None:
+            result = self.transformer.transform(X)
+            self.results.add(key, result)
+
+        return result
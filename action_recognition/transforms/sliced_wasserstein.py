@@ -0,0 +1,279 @@
+import numpy as np
+import hashlib
+import logging
+
+from sklearn.base import BaseEstimator, TransformerMixin
+try:
+    from sklearn.externals.joblib import Parallel, delayed, cpu_count
+except ImportError:
+    # Newer versions of scikit-learn no longer include joblib.
+    from joblib import Parallel, delayed, cpu_count
+
+from .gram_matrix_file import GramMatrixFile
+
+
+def directions(num_directions):
+    """The directions that the diagrams are projected onto, as in sklearn_tda.
+
+    Parameters
+    ----------
+    num_directions : int
+
+    Returns
+    -------
+    lines : array-like
+        shape = [2, num_directions], unit vectors evenly spread over
+        a half circle.
+
+    """
+    angles = np.linspace(-np.pi / 2, np.pi / 2, num=num_directions + 1)[np.newaxis, :-1]
+    return np.concatenate([np.cos(angles), np.sin(angles)], axis=0)
+
+
+class SlicedWasserstein(BaseEstimator, TransformerMixin):
+    """Calculates the Sliced Wasserstein kernel between persistence diagrams.
+
+    Gives the same kernel as sklearn_tda.SlicedWasserstein, but the fitted
+    diagrams, and their projections onto the diagonal, are projected onto
+    every direction and sorted once in fit.  transform then calculates the
+    kernel between a diagram and every fitted diagram at once, instead of
+    projecting and sorting both diagrams for every pair.
+
+    Parameters
+    ----------
+    num_directions : int, optional, default = 10
+        The number of directions the diagrams are projected onto.
+    bandwidth : float, optional, default = 1.0
+        The bandwidth of the gaussian of the kernel.
+    gram_file : str, optional
+        Path to a file where fit_transform calculates the kernel between
+        the fitted diagrams in tiles, see GramMatrixFile.  The kernel is
+        then returned as a float32 memmap instead of in memory, and
+        resumed from the complete tiles if it was interrupted.  Every fit
+        to different diagrams starts the file over, e.g. for every fold
+        of a cross-validation.
+    tile_size : int, optional, default = 1024
+        The number of rows and columns of the tiles of gram_file.
+    n_jobs : int, optional, default = 1
+        The number of processes that the tiles of gram_file are divided
+        between, where -1 uses every core.
+
+    """
+
+    # The number of elements of the merged projections that are created at once.
+    _block_elements = 2 ** 22
+
+    def __init__(self, num_directions=10, bandwidth=1.0, gram_file=None, tile_size=1024,
+                 n_jobs=1):
+        self.num_directions = num_directions
+        self.bandwidth = bandwidth
+        self.gram_file = gram_file
+        self.tile_size = tile_size
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y=None):
+        """Projects and sorts the diagrams that the kernel is calculated against.
+
+        Parameters
+        ----------
+        X : list of array-like
+            The persistence diagrams, each of shape = [n_points, 2]
+        y : ignored
+
+        Returns
+        -------
+        self
+
+        """
+        self.lines_ = directions(self.num_directions)
+
+        projections = [self._sorted_projections(diagram) for diagram in X]
+        self.number_of_points_ = np.array([p.shape[1] for p, _ in projections], dtype=int)
+        self.n_fitted_ = len(projections)
+        self.fitted_indices_ = np.arange(len(projections))
+
+        #  The projections are packed into arrays of the same number of points,
+        # where the padding is larger than every projection.  As both sides of
+        # a comparison get the same amount of padding, it is sorted last
+        # on both sides and doesn't change the distance.
+        max_points = max(self.number_of_points_, default=0)
+        shape = (len(projections), self.num_directions, max_points)
+        self.projections_ = np.full(shape, np.finfo(np.float64).max)
+        self.diagonal_projections_ = np.full(shape, np.finfo(np.float64).max)
+        for i, (projection, diagonal_projection) in enumerate(projections):
+            self.projections_[i, :, :projection.shape[1]] = projection
+            self.diagonal_projections_[i, :, :projection.shape[1]] = diagonal_projection
+
+        return self
+
+    def transform(self, X):
+        """Calculates the kernel between the diagrams and the fitted diagrams.
+
+        Parameters
+        ----------
+        X : list of array-like
+            The persistence diagrams, each of shape = [n_points, 2]
+
+        Returns
+        -------
+        kernel : array-like
+            shape = [n_diagrams, n_fitted_diagrams]
+
+        """
+        distances = np.empty((len(X), len(self.projections_)))
+        for i, diagram in enumerate(X):
+            distances[i] = self._distances(*self._sorted_projections(diagram))
+
+        kernel = np.zeros((len(X), self.n_fitted_))
+        kernel[:, self.fitted_indices_] = self._kernel(distances)
+        return kernel
+
+    def fit_transform(self, X, y=None):
+        """Fits to the diagrams, and calculates the kernel between them.
+
+        As the kernel is symmetric, only half of it is calculated.
+
+        Parameters
+        ----------
+        X : list of array-like
+            The persistence diagrams, each of shape = [n_points, 2]
+        y : ignored
+
+        Returns
+        -------
+        kernel : array-like
+            shape = [n_diagrams, n_diagrams], a float32 memmap if gram_file
+            is given.
+
+        """
+        self.fit(X)
+
+        if self.gram_file is not None and len(X) > 0:
+            return self._tiled_kernel()
+
+        distances = np.zeros((len(X), len(X)))
+        for i in range(len(X) - 1):
+            distances[i, i + 1:] = self._fitted_distances(i, i + 1, len(X))
+            distances[i + 1:, i] = distances[i, i + 1:]
+
+        return self._kernel(distances)
+
+    def keep_fitted_diagrams(self, indices):
+        """Removes every fitted diagram except the ones at indices.
+
+        Used to only keep the support vectors of an SVC with a precomputed
+        kernel, which does not use the kernel against the other diagrams.
+        transform still returns a column for every diagram passed to fit,
+        where the columns of the removed diagrams are 0.
+
+        Parameters
+        ----------
+        indices : array-like of int
+            Indices of the diagrams to keep, into the diagrams passed to fit.
+
+        Returns
+        -------
+        self
+
+        """
+        indices = np.unique(indices)
+        if not np.all(np.isin(indices, self.fitted_indices_)):
+            raise ValueError("Can only keep diagrams that have not been removed.")
+        positions = np.searchsorted(self.fitted_indices_, indices)
+
+        self.fitted_indices_ = indices
+        self.number_of_points_ = self.number_of_points_[positions]
+        max_points = max(self.number_of_points_, default=0)
+        self.projections_ = self.projections_[positions, :, :max_points]
+        self.diagonal_projections_ = self.diagonal_projections_[positions, :, :max_points]
+
+        return self
+
+    def _tiled_kernel(self):
+        gram = GramMatrixFile(self.gram_file, len(self.projections_), self._key(),
+                              self.tile_size)
+        tiles = gram.missing_tiles()
+        logging.debug("Calculating {} of {} tiles of the Gram matrix in {}".format(
+            len(tiles), gram.number_of_tiles * (gram.number_of_tiles + 1) // 2, self.gram_file))
+
+        n_jobs = self.n_jobs if self.n_jobs > 0 else max(1, cpu_count() + 1 + self.n_jobs)
+        if n_jobs == 1 or len(tiles) <= 1:
+            _write_tiles(self, gram, tiles)
+        else:
+            #  Each process gets a single task, as the fitted projections
+            # are copied to the process with every task.
+            number_of_tasks = min(len(tiles), n_jobs)
+            tasks = [tiles[i::number_of_tasks] for i in range(number_of_tasks)]
+            Parallel(n_jobs=number_of_tasks)(
+                delayed(_write_tiles)(self, gram, task) for task in tasks)
+
+        return gram.matrix()
+
+    def _key(self):
+        key_hash = hashlib.sha1()
+        key_hash.update("{} {}".format(self.num_directions, self.bandwidth).encode('utf-8'))
+        for array in (self.number_of_points_, self.projections_, self.diagonal_projections_):
+            key_hash.update(np.ascontiguousarray(array).tobytes())
+
+        return key_hash.hexdigest()
+
+    def _tile(self, gram, row, column):
+        row_start, row_stop = gram.tile_range(row)
+        column_start, column_stop = gram.tile_range(column)
+
+        distances = np.empty((row_stop - row_start, column_stop - column_start))
+        for i in range(row_start, row_stop):
+            distances[i - row_start] = self._fitted_distances(i, column_start, column_stop)
+
+        return self._kernel(distances)
+
+    def _fitted_distances(self, i, start, stop):
+        number_of_points = self.number_of_points_[i]
+        projection = self.projections_[i, :, :number_of_points]
+        diagonal_projection = self.diagonal_projections_[i, :, :number_of_points]
+
+        return self._distances(projection, diagonal_projection, start, stop)
+
+    def _kernel(self, distances):
+        return np.exp(-distances / (2 * self.bandwidth * self.bandwidth))
+
+    def _sorted_projections(self, diagram):
+        diagram = np.asarray(diagram, dtype=np.float64).reshape(-1, 2)
+        diagonal = np.matmul(diagram, 0.5 * np.ones((2, 2)))
+
+        projection = np.sort(np.matmul(diagram, self.lines_).T, axis=1)
+        diagonal_projection = np.sort(np.matmul(diagonal, self.lines_).T, axis=1)
+        return projection, diagonal_projection
+
+    def _distances(self, projection, diagonal_projection, start=0, stop=None):
+        #  The points of each diagram are matched to the points of the other,
+        # or to the projections of the other's points onto the diagonal.
+        # The fitted diagrams are compared in blocks, to bound the memory of
+        # the merged projections.
+        length = projection.shape[1] + self.projections_.shape[2]
+        block_size = max(1, self._block_elements // max(1, self.num_directions * length))
+
+        stop = len(self.projections_) if stop is None else stop
+        distances = np.empty(stop - start)
+        for block_start in range(start, stop, block_size):
+            fitted = slice(block_start, min(stop, block_start + block_size))
+            points = self._merge(projection, self.diagonal_projections_[fitted])
+            other_points = self._merge(diagonal_projection, self.projections_[fitted])
+
+            # The mean over the directions of the L1 distances of the sorted projections.
+            distances[block_start - start:block_start - start + len(points)] = \
+                np.abs(points - other_points).sum(axis=2).mean(axis=1)
+
+        return distances
+
+    def _merge(self, projection, fitted_projections):
+        shape = (len(fitted_projections),) + projection.shape
+        merged = np.concatenate((np.broadcast_to(projection, shape), fitted_projections), axis=2)
+        # Faster than the default for the two sorted runs.
+        merged.sort(axis=2, kind='mergesort')
+        return merged
+
+
+def _write_tiles(kernel, gram, tiles):
+    for row, column in tiles:
+        gram.write_tile(row, column, kernel._tile(gram, row, column))
@@ -0,0 +1,129 @@
+import numpy as np
+
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils import check_random_state
+
+from .sliced_wasserstein import directions
+
+
+class SlicedWassersteinFeatures(BaseEstimator, TransformerMixin):
+    """Embeds persistence diagrams in features approximating the Sliced Wasserstein kernel.
+
+    In every direction, the Sliced Wasserstein distance between two diagrams
+    is the integral of |g_1(t) - g_2(t)|, where g(t) is the number of
+    projected points minus the number of projected diagonal points up to t.
+    Each diagram is embedded as the averages of g over a grid of every
+    direction, so that the L1 distance between the embeddings approximates
+    the Sliced Wasserstein distance.  The gaussian of the distance is then
+    approximated with random Fourier features, whose dot products
+    approximate the kernel of SlicedWasserstein, so that the kernel
+    never has to be calculated between pairs of diagrams.
+
+    Parameters
+    ----------
+    num_directions : int, optional, default = 10
+        The number of directions the diagrams are projected onto.
+    bandwidth : float, optional, default = 1.0
+        The bandwidth of the gaussian of the kernel.
+    resolution : int, optional, default = 50
+        The number of cells of the grid of every direction, covering the
+        projections of the fitted diagrams.
+    n_components : int, optional, default = 1000
+        The number of random Fourier features.
+    random_state : int, RandomState or None, optional, default = None
+        Used to draw the random Fourier features.
+
+    """
+
+    def __init__(self, num_directions=10, bandwidth=1.0, resolution=50, n_components=1000,
+                 random_state=None):
+        self.num_directions = num_directions
+        self.bandwidth = bandwidth
+        self.resolution = resolution
+        self.n_components = n_components
+        self.random_state = random_state
+
+    def fit(self, X, y=None):
+        """Fits the grids to the diagrams, and draws the random Fourier features.
+
+        Parameters
+        ----------
+        X : list of array-like
+            The persistence diagrams, each of shape = [n_points, 2]
+        y : ignored
+
+        Returns
+        -------
+        self
+
+        """
+        self.lines_ = directions(self.num_directions)
+
+        low = np.full(self.num_directions, np.inf)
+        high = np.full(self.num_directions, -np.inf)
+        for diagram in X:
+            projection, diagonal_projection = self._projections(diagram)
+            for p in (projection, diagonal_projection):
+                if p.shape[1] > 0:
+                    low = np.minimum(low, p.min(axis=1))
+                    high = np.maximum(high, p.max(axis=1))
+
+        low[~np.isfinite(low)] = 0
+        high[~np.isfinite(high)] = 0
+        # Leave a margin for diagrams that are projected a bit outside the fitted ones.
+        margin = 0.1 * (high - low) + 1e-6
+        self.grid_ = (low - margin)[:, np.newaxis] + \
+            (high - low + 2 * margin)[:, np.newaxis] * np.linspace(0, 1, self.resolution + 1)
+
+        #  The Fourier transform of exp(-|x| / (2 * bandwidth^2)) is a Cauchy
+        # distribution, independently in every dimension of the L1 distance.
+        random_state = check_random_state(self.random_state)
+        scale = 1 / (2 * self.bandwidth * self.bandwidth)
+        self.random_weights_ = scale * random_state.standard_cauchy(
+            size=(self.num_directions * self.resolution, self.n_components))
+        self.random_offset_ = random_state.uniform(0, 2 * np.pi, size=self.n_components)
+
+        return self
+
+    def transform(self, X):
+        """Embeds the diagrams in the random Fourier features.
+
+        Parameters
+        ----------
+        X : list of array-like
+            The persistence diagrams, each of shape = [n_points, 2]
+
+        Returns
+        -------
+        features : array-like
+            shape = [n_diagrams, n_components]
+
+        """
+        embeddings = np.array([self._embedding(diagram) for diagram in X]).reshape(
+            len(X), self.num_directions * self.resolution)
+
+        features = np.dot(embeddings, self.random_weights_)
+        features += self.random_offset_
+        np.cos(features, features)
+        features *= np.sqrt(2 / self.n_components)
+
+        return features
+
+    def _projections(self, diagram):
+        diagram = np.asarray(diagram, dtype=np.float64).reshape(-1, 2)
+        diagonal = np.matmul(diagram, 0.5 * np.ones((2, 2)))
+
+        return np.matmul(diagram, self.lines_).T, np.matmul(diagonal, self.lines_).T
+
+    def _embedding(self, diagram):
+        projection, diagonal_projection = self._projections(diagram)
+
+        #  The integral of g up to x is the sum of max(0, x - p) over the
+        # projected points, minus the same over the projected diagonal points,
+        # so the integral over every cell is the difference at its edges.
+        edges = self.grid_[:, :, np.newaxis]
+        integral = np.maximum(0, edges - projection[:, np.newaxis]).sum(axis=2) - \
+            np.maximum(0, edges - diagonal_projection[:, np.newaxis]).sum(axis=2)
+
+        # The mean over the directions of the integrals over every cell.
+        return np.diff(integral, axis=1) / self.num_directions
@@ -1,2 +1,2 @@
 from .coco_keypoints import COCOKeypoints, coco_connections
-from .load import load_data
+from .load import load_data, load_tracks
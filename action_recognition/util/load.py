@@ -1,4 +1,5 @@
 import numpy as np
+import os
 
 
 def load_data(file_name):
@@ -10,3 +11,49 @@ def load_data(file_name):
     videos = dataset_npz['videos']
 
     return chunks, frames, labels, videos
+
+
+def load_tracks(file_name):
+    """Loads the tracks saved by tracker.Tracker.
+
+    The tracks that the tracker spilled to part files are loaded from the
+    parts listed in the file, which are next to it, and every track is
+    given in the order of its index.
+
+    Parameters
+    ----------
+    file_name : str
+        Path to the -tracks.npz file.
+
+    Returns
+    -------
+    tracks : array-like, dtype=object
+        shape = [n_tracks], each of shape = [n_frames, n_keypoints, 3]
+    frames : array-like, dtype=object
+        shape = [n_tracks], each of shape = [n_frames]
+
+    """
+    tracks_npz = np.load(file_name, allow_pickle=True)
+    if 'part_files' not in tracks_npz:
+        return tracks_npz['tracks'], tracks_npz['frames']
+
+    track_indicies = list(tracks_npz['track_indicies'])
+    tracks = list(tracks_npz['tracks'])
+    frames = list(tracks_npz['frames'])
+    for part_file in tracks_npz['part_files']:
+        part = np.load(os.path.join(os.path.dirname(file_name), part_file), allow_pickle=True)
+        track_indicies.extend(part['track_indicies'])
+        tracks.extend(part['tracks'])
+        frames.extend(part['frames'])
+
+    order = np.argsort(track_indicies, kind='mergesort')
+    return _object_array([tracks[i] for i in order]), _object_array([frames[i] for i in order])
+
+
+def _object_array(arrays):
+    # np.array would create a multidimensional array if the lengths are equal.
+    object_array = np.empty(len(arrays), dtype=object)
+    for i, array in enumerate(arrays):
+        object_array[i] = array
+
+    return object_array
@@ -8,6 +8,7 @@ from sklearn.model_selection import train_test_split
 
 from action_recognition.analysis import PostProcessor, Labelling
 from action_recognition.tracker import TrackVisualiser
+from action_recognition.util import load_tracks
 
 
 def main(args):
@@ -96,9 +97,7 @@ def split_data(chunks, frames, labels, videos):
 
 
 def process_tracks(tracks_file, video, target_frames_per_chunk, overlap_percentage, seconds_per_chunk):
-    tracks_npz = np.load(tracks_file)
-    np_tracks = tracks_npz['tracks']
-    np_frames = tracks_npz['frames']
+    np_tracks, np_frames = load_tracks(tracks_file)
 
     logging.info("Combining, cleaning, and removing tracks.")
     processor = PostProcessor()
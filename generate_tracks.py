@@ -1,22 +1,128 @@
 import argparse
 import logging
 import os
+from functools import partial
+from multiprocessing import Pool
+from time import time
+
+import cv2
 
 from action_recognition.tracker import Tracker
-from action_recognition.detector import TFOpenpose, CaffeOpenpose
+from action_recognition.detector import TFOpenpose, CaffeOpenpose, DetectionCache, \
+    RecordingDetector, ReplayDetector
 
 
 def main(args):
-    if args.tf_openpose:
-        detector = TFOpenpose()
+    videos = parse_path(args.video, args.out_directory, args.allowed_video_formats)
+
+    start_time = time()
+    if args.workers is None:
+        detector, cache = create_detector(args)
+        summaries = []
+        for video, out_dir in videos:
+            summaries.append(track_video(video, out_dir, detector, cache, args))
+            log_summary(*summaries[-1])
+
+        if cache is not None:
+            cache.close()
     else:
-        detector = CaffeOpenpose(model_path=args.model_path)
+        summaries = track_videos_in_workers(videos, args)
+
+    total_frames = sum(number_of_frames for _, number_of_frames, _ in summaries)
+    log_summary("{} videos".format(len(summaries)), total_frames, time() - start_time)
+
+
+def create_detector(args):
+    cache = None
+    detector = None
+    if args.replay_detections:
+        cache = DetectionCache(args.replay_detections)
+    else:
+        if args.tf_openpose:
+            detector = TFOpenpose()
+        else:
+            detector = CaffeOpenpose(model_path=args.model_path)
+
+        if args.record_detections:
+            cache = DetectionCache(args.record_detections)
+
+    return detector, cache
+
+
+def track_video(video, out_dir, detector, cache, args):
+    start_time = time()
+
+    tracker = Tracker(detector=video_detector(detector, cache, video, args), out_dir=out_dir,
+                      gated_assignment=args.gated_assignment,
+                      retire_after=args.retire_after,
+                      spill_after=args.spill_after,
+                      pipelined=args.pipelined,
+                      batch_size=args.batch_size)
+    tracker.video(video, args.draw_frames)
+
+    capture = cv2.VideoCapture(video)
+    number_of_frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    capture.release()
+
+    return video, number_of_frames, time() - start_time
+
+
+def video_detector(detector, cache, video, args):
+    if args.replay_detections:
+        return ReplayDetector(cache, video)
+    elif args.record_detections:
+        return RecordingDetector(detector, cache, video)
+    else:
+        return detector
+
+
+def track_videos_in_workers(videos, args):
+    #  Skip the videos that were tracked in a previous run,
+    # so that an interrupted run can be resumed.
+    remaining_videos = [(video, out_dir) for video, out_dir in videos
+                        if not is_tracked(video, out_dir)]
+    logging.info("Skipping {} already tracked videos".format(
+        len(videos) - len(remaining_videos)))
+
+    # Every worker process creates its own detector once, and then tracks videos.
+    with Pool(args.workers, initializer=init_worker, initargs=(args,)) as pool:
+        summaries = []
+        for summary in pool.imap_unordered(partial(track_video_in_worker, args=args),
+                                           remaining_videos):
+            log_summary(*summary)
+            summaries.append(summary)
+
+    return summaries
+
+
+def is_tracked(video, out_dir):
+    basename = os.path.basename(video)
+    filename, _ = os.path.splitext(basename)
+    out_files = [os.path.join(out_dir, filename + '-tracks.npz'),
+                 os.path.join(out_dir, filename + '.avi')]
+
+    return all(os.path.isfile(out_file) and
+               os.path.getmtime(out_file) >= os.path.getmtime(video)
+               for out_file in out_files)
+
+
+worker_detector = None
+worker_cache = None
+
+
+def init_worker(args):
+    global worker_detector, worker_cache
+    worker_detector, worker_cache = create_detector(args)
+
+
+def track_video_in_worker(video_and_out_dir, args):
+    video, out_dir = video_and_out_dir
+    return track_video(video, out_dir, worker_detector, worker_cache, args)
 
-    videos = parse_path(args.video, args.out_directory, args.allowed_video_formats)
 
-    for video, out_dir in videos:
-        tracker = Tracker(detector=detector, out_dir=out_dir)
-        tracker.video(video, args.draw_frames)
+def log_summary(video, number_of_frames, seconds):
+    logging.info("{}: {} frames in {:.1f} s, {:.2f} frames/s".format(
+        video, number_of_frames, seconds, number_of_frames / max(seconds, 1e-9)))
 
 
 def parse_path(video, out_directory, allowed_video_formats):
@@ -56,10 +162,38 @@ if __name__ == '__main__':
                         help='Root directory to where the annotated video is saved.')
     parser.add_argument('--draw-frames', action='store_true',
                         help='Flag for if the frames with identified frames should be drawn or not.')
+    parser.add_argument('--gated-assignment', action='store_true',
+                        help=('Solve the assignment between tracks and people once per frame, '
+                              'by checking for too large movements beforehand.'))
+    parser.add_argument('--retire-after', type=int,
+                        help=('Number of frames without updates after which a track is retired, '
+                              'to keep the per-frame work bounded for long videos.'))
+    parser.add_argument('--spill-after', type=int,
+                        help=('Number of retired tracks to keep in memory before saving them '
+                              'to a part file, which is kept next to the tracks file and is '
+                              'listed in it.'))
+    parser.add_argument('--pipelined', action='store_true',
+                        help=('Decode, detect, and draw and encode the video in separate threads. '
+                              'Logs how long each stage waits on the others.'))
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help='The number of frames to give the detector at once.')
+    parser.add_argument('--record-detections', type=str,
+                        help=('File to record the detected keypoints of every frame to, '
+                              'so that they can be replayed with --replay-detections.'))
+    parser.add_argument('--replay-detections', type=str,
+                        help=('File with keypoints recorded by --record-detections, '
+                              'used instead of running OpenPose again.'))
+    parser.add_argument('--workers', type=int,
+                        help=('Track the videos in this many processes, each with its own '
+                              'detector.  Skips videos that already have outputs newer than '
+                              'the video, so that an interrupted run can be resumed.'))
     parser.add_argument('--allowed-video-formats', type=str, nargs='+', default=['.mp4', '.avi'],
                         help='Used for filtering of videos if the parameter video is a directory.')
 
     args = parser.parse_args()
+    if args.workers is not None and args.record_detections:
+        parser.error('--record-detections can only be used without --workers, '
+                     'as the detection file can only have one writer.')
 
     logging.basicConfig(level=logging.INFO)
     main(args)
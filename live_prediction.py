@@ -1,6 +1,5 @@
 import argparse
 from sklearn.externals import joblib
-import copy
 from time import time
 import numpy as np
 import logging
@@ -9,7 +8,7 @@ from shutil import copyfile
 
 from action_recognition.tracker import Tracker, TrackVisualiser
 from action_recognition.detector import CaffeOpenpose
-from action_recognition.analysis import PostProcessor, ChunkVisualiser
+from action_recognition.analysis import LivePostProcessor, ChunkVisualiser
 from action_recognition import transforms
 
 
@@ -29,6 +28,8 @@ def main(args):
 
     logging.info("Classes: {}".format(classifier.classes_))
 
+    processor = LivePostProcessor()
+
     valid_predictions = []
     track_people_start = time()
     for tracks, img, current_frame in tracker.video_generator(args.video, args.draw_frames):
@@ -46,7 +47,8 @@ def main(args):
 
         predict_people_start = time()
 
-        valid_predictions = predict(tracks, classifier, current_frame, args.confidence_threshold)
+        valid_predictions = predict(tracks, classifier, current_frame,
+                                    args.confidence_threshold, processor)
 
         predict_people_time = time() - predict_people_start
 
@@ -58,14 +60,12 @@ def main(args):
         track_people_start = time()
 
 
-def predict(tracks, classifier, current_frame, confidence_threshold):
-    #  Extract the latest frames, as we don't want to copy
-    # too much data here, and we've already predicted for the rest
-    processor = PostProcessor()
-    processor.tracks = [copy.deepcopy(t.copy(-50)) for t in tracks]
-    processor.post_process_tracks()
+def predict(tracks, classifier, current_frame, confidence_threshold, processor):
+    #  Only the latest frames are needed, and the processor has already
+    # post processed most of them.
+    tracks, processed_tracks = processor.process_tracks(tracks)
 
-    predictions = [predict_per_track(t, classifier) for t in processor.tracks]
+    predictions = predict_tracks(processed_tracks, classifier)
 
     valid_predictions = filter_bad_predictions(
         predictions, confidence_threshold, classifier.classes_)
@@ -82,22 +82,45 @@ def predict(tracks, classifier, current_frame, confidence_threshold):
     return valid_predictions
 
 
-def predict_per_track(track, classifier):
+def predict_tracks(tracks, classifier):
+    #  The chunks of every track are predicted in a single call,
+    # as the classifier has a large overhead per call.
     all_chunks = []
     all_frames = []
+    number_of_chunks = []
+    for track in tracks:
+        chunks, chunk_frames = last_chunks(track)
+        all_chunks.extend(chunks)
+        all_frames.extend(chunk_frames)
+        number_of_chunks.append(len(chunks))
+
+    if len(all_chunks) > 0:
+        all_predictions = classifier.predict_proba(all_chunks)
+
+    predictions = []
+    start = 0
+    for n in number_of_chunks:
+        if n > 0:
+            average_prediction = np.amax(all_predictions[start:start + n], axis=0)
+            predictions.append((all_chunks[start], all_frames[start], average_prediction))
+        else:
+            predictions.append((None, None, [0] * len(classifier.classes_)))
+        start += n
+
+    return predictions
+
+
+def last_chunks(track):
+    chunks = []
+    frames = []
     divisions = [(50, 0), (30, 10), (25, 0), (20, 5)]
     for frames_per_chunk, overlap in divisions:
-        chunks, chunk_frames = track.divide_into_chunks(frames_per_chunk, overlap)
-        if len(chunks) > 0:
-            all_chunks.append(chunks[-1])
-            all_frames.append(chunk_frames[-1])
+        chunk, chunk_frames = track.last_chunk(frames_per_chunk, overlap)
+        if len(chunk) > 0:
+            chunks.append(chunk)
+            frames.append(chunk_frames)
 
-    if len(all_chunks) > 0:
-        predictions = classifier.predict_proba(all_chunks)
-        average_prediction = np.amax(predictions, axis=0)
-        return all_chunks[0], all_frames[0], average_prediction
-    else:
-        return None, None, [0] * len(classifier.classes_)
+    return chunks, frames
 
 
 def write_predictions(valid_predictions, img):
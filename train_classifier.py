@@ -31,9 +31,13 @@ def main(args):
             "Number of train dataset labels after augmentor: {}".format(Counter(train[2])))
 
     if args.tda:
-        classifier = TDAClassifier(cross_validate=args.cross_validate)
+        classifier = TDAClassifier(cross_validate=args.cross_validate, n_jobs=args.n_jobs,
+                                   cache_dir=args.persistence_cache,
+                                   approximate_kernel=args.approximate_kernel,
+                                   gram_file=args.gram_file)
     elif args.ensemble:
-        classifier = EnsembleClassifier(use_tda_vectorisations=args.use_tda_vectorisations)
+        classifier = EnsembleClassifier(use_tda_vectorisations=args.use_tda_vectorisations,
+                                        n_jobs=args.n_jobs, cache_dir=args.persistence_cache)
     elif args.feature_engineering:
         classifier = FeatureEngineeringClassifier(
             use_tda_vectorisations=args.use_tda_vectorisations)
@@ -87,6 +91,10 @@ if __name__ == '__main__':
     parser.add_argument('--title', type=str, default='classifier',
                         help=('Title and file name for confusion matrix plot '
                               'as well as the name of the .pkl classifier file.'))
+    parser.add_argument('--approximate-kernel', action='store_true',
+                        help=('Specify for if --tda should approximate the Sliced Wasserstein '
+                              'kernel with random features and a linear model, which scales '
+                              'to larger datasets than the exact kernel.'))
     parser.add_argument('--cross-validate', '-cv', action='store_true',
                         help=('Specify for cross-validation of tda pipeline. '
                               'In order to change what is cross-validated, see '
@@ -102,6 +110,21 @@ if __name__ == '__main__':
                               'Note that this will cause the model saving to file to crash '
                               'since parts of the sklearn_tda vectorisations are not pickable.'))
 
+    parser.add_argument('--n-jobs', type=int, default=1,
+                        help=('The number of processes used to calculate persistence for '
+                              '--tda and --ensemble, and the tiles of --gram-file, '
+                              'where -1 uses every core.'))
+    parser.add_argument('--persistence-cache', type=str,
+                        help=('Path to a directory where the persistence diagrams are cached '
+                              'for --tda and --ensemble, so that they are only calculated once '
+                              'for the same data and parameters.'))
+
+    parser.add_argument('--gram-file', type=str,
+                        help=('Path to a file where --tda calculates the kernel between the '
+                              'training chunks in tiles, using --n-jobs processes.  If '
+                              'training is interrupted, it resumes from the complete tiles. '
+                              'Every fold of --cross-validate starts the file over.'))
+
     parser.add_argument('--augmentation', action='store_true',
                         help=('Specify for if the training data should be augmented. '
                               'Only current augmentor is a rotation augmentor.'))
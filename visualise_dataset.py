@@ -15,7 +15,8 @@ def main(args):
     test = load_data(test_name)
 
     if args.persistence_graphs:
-        FeatureVisualiser().save_persistence_graphs(train[0], train[2], args.out_directory)
+        FeatureVisualiser().save_persistence_graphs(train[0], train[2], args.out_directory,
+                                                    args.persistence_cache)
     if args.point_clouds:
         FeatureVisualiser().visualise_point_cloud(train[0])
     if args.features:
@@ -38,6 +39,8 @@ if __name__ == '__main__':
 
     parser.add_argument('--persistence-graphs', action='store_true',
                         help='Saves the persistence graphs of the dataset to file.')
+    parser.add_argument('--persistence-cache', type=str,
+                        help='Path to a directory where the persistence diagrams are cached.')
     parser.add_argument('--point-clouds', action='store_true',
                         help='Uses matplotlib\'s 3D plotting to display the point clouds of the data.')
     parser.add_argument('--features', action='store_true',